@@ -1,12 +1,29 @@
 import discord
 from discord.ext import commands
+import heapq
+import io
 import itertools
+import math
 import random
 import asyncio
+import bisect
 import json
+import logging
 import os
 import time
 import re
+import struct
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import List, Optional
+
+from PIL import Image, ImageDraw, ImageFont
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None
 
 
 class CurrencyManager:
@@ -42,6 +59,17 @@ class CurrencyManager:
         self._save()
         return self._balances[key]
 
+    def adjust_many(self, changes):
+        results = {}
+        for user_id, amount in changes:
+            key = str(user_id)
+            balance = self.get_balance(user_id) + amount
+            self._balances[key] = max(balance, 0)
+            results[user_id] = self._balances[key]
+        if results:
+            self._save()
+        return results
+
     def is_new_user(self, user_id):
         return str(user_id) not in self._balances
 
@@ -54,6 +82,1271 @@ class CurrencyManager:
         return self._balances[key]
 
 
+CARD_RANKS = "23456789TJQKA"
+CARD_SUITS = "♠♥♦♣"
+NO_CARD = 0xFF
+
+
+def encode_card(card):
+    return CARD_RANKS.index(card[0]) * 4 + CARD_SUITS.index(card[1])
+
+
+def decode_card(code):
+    return CARD_RANKS[code // 4] + CARD_SUITS[code % 4]
+
+
+@dataclass
+class HandRecord:
+    started_at: int
+    duration_ms: int
+    user_id: int
+    opponent_id: int
+    min_bet: int
+    pot: int
+    user_total_bet: int
+    bot_total_bet: int
+    user_net: int
+    opponent_net: int
+    winner: str
+    end_stage: str
+    sb_player: str
+    user_cards: List[str]
+    bot_cards: List[str]
+    community: List[str]
+    actions: List[tuple]
+    ref: Optional[tuple] = None
+
+
+class HandHistoryLog:
+    """Append-only binary log of finished poker hands.
+
+    Records are length-prefixed and written to numbered segments that rotate
+    once they pass ``max_segment_bytes``. Each segment has a companion index
+    of fixed-size ``(user_id, started_at, segment, offset)`` entries. The
+    open segment's ``.idx`` is appended in arrival order; once a segment is
+    closed its index is rewritten as a ``.sidx`` sorted by user and time,
+    behind a header with the segment's time range. Queries skip closed
+    segments outside the range and binary-search to a user's first hand.
+    """
+
+    VERSION = 1
+    STAGES = ("preflop", "flop", "turn", "river", "showdown")
+    ACTIONS = ("small_blind", "big_blind", "check", "call", "bet", "raise", "allin", "fold")
+    WINNERS = ("none", "user", "bot", "split")
+    HEADER = struct.Struct("<BBIIQQIIIIiiBBH9s")
+    ACTION = struct.Struct("<IBBI")
+    FRAME = struct.Struct("<H")
+    INDEX = struct.Struct("<QIHI")
+    SORTED_HEADER = struct.Struct("<II")
+    INDEX_CHUNK = 4096
+
+    def __init__(self, directory, max_segment_bytes=8 * 1024 * 1024):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.segment = self._latest_segment()
+
+    def _segment_path(self, segment, ext):
+        return os.path.join(self.directory, f"hands-{segment:06d}.{ext}")
+
+    def _segments(self):
+        if not os.path.isdir(self.directory):
+            return []
+        segments = []
+        for name in os.listdir(self.directory):
+            match = re.fullmatch(r"hands-(\d{6})\.log", name)
+            if match:
+                segments.append(int(match.group(1)))
+        segments.sort()
+        return segments
+
+    def _latest_segment(self):
+        segments = self._segments()
+        return segments[-1] if segments else 1
+
+    def _encode_cards(self, cards, size):
+        codes = [encode_card(card) for card in cards[:size]]
+        codes.extend([NO_CARD] * (size - len(codes)))
+        return bytes(codes)
+
+    def _decode_cards(self, raw):
+        return [decode_card(code) for code in raw if code != NO_CARD]
+
+    def encode(self, record):
+        flags = 0
+        if record.opponent_id:
+            flags |= 0x01
+        if record.sb_player == "bot":
+            flags |= 0x02
+        cards = (
+            self._encode_cards(record.user_cards, 2)
+            + self._encode_cards(record.bot_cards, 2)
+            + self._encode_cards(record.community, 5)
+        )
+        parts = [
+            self.HEADER.pack(
+                self.VERSION,
+                flags,
+                record.started_at,
+                record.duration_ms,
+                record.user_id,
+                record.opponent_id or 0,
+                record.min_bet,
+                record.pot,
+                record.user_total_bet,
+                record.bot_total_bet,
+                record.user_net,
+                record.opponent_net,
+                self.WINNERS.index(record.winner),
+                self.STAGES.index(record.end_stage),
+                len(record.actions),
+                cards,
+            )
+        ]
+        for offset_ms, actor, stage, action, amount in record.actions:
+            packed_actor = (0x80 if actor == "bot" else 0) | self.STAGES.index(stage)
+            parts.append(self.ACTION.pack(offset_ms, packed_actor, self.ACTIONS.index(action), amount))
+        return b"".join(parts)
+
+    def decode(self, payload, ref=None):
+        (
+            _version,
+            flags,
+            started_at,
+            duration_ms,
+            user_id,
+            opponent_id,
+            min_bet,
+            pot,
+            user_total_bet,
+            bot_total_bet,
+            user_net,
+            opponent_net,
+            winner,
+            end_stage,
+            action_count,
+            cards,
+        ) = self.HEADER.unpack_from(payload, 0)
+        actions = []
+        offset = self.HEADER.size
+        for _ in range(action_count):
+            offset_ms, packed_actor, action, amount = self.ACTION.unpack_from(payload, offset)
+            offset += self.ACTION.size
+            actor = "bot" if packed_actor & 0x80 else "user"
+            actions.append((offset_ms, actor, self.STAGES[packed_actor & 0x07], self.ACTIONS[action], amount))
+        return HandRecord(
+            started_at=started_at,
+            duration_ms=duration_ms,
+            user_id=user_id,
+            opponent_id=opponent_id if flags & 0x01 else 0,
+            min_bet=min_bet,
+            pot=pot,
+            user_total_bet=user_total_bet,
+            bot_total_bet=bot_total_bet,
+            user_net=user_net,
+            opponent_net=opponent_net,
+            winner=self.WINNERS[winner],
+            end_stage=self.STAGES[end_stage],
+            sb_player="bot" if flags & 0x02 else "user",
+            user_cards=self._decode_cards(cards[0:2]),
+            bot_cards=self._decode_cards(cards[2:4]),
+            community=self._decode_cards(cards[4:9]),
+            actions=actions,
+            ref=ref,
+        )
+
+    def append(self, record):
+        """Write ``record``; returns its ``(segment, offset)``, or None if it could not be stored."""
+        try:
+            # Fields past their packed width raise struct.error; unknown stages or actions, ValueError.
+            payload = self.encode(record)
+        except (struct.error, ValueError):
+            return None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            log_path = self._segment_path(self.segment, "log")
+            if os.path.exists(log_path) and os.path.getsize(log_path) >= self.max_segment_bytes:
+                self.segment += 1
+                log_path = self._segment_path(self.segment, "log")
+            with open(log_path, "ab") as fh:
+                offset = fh.tell()
+                fh.write(self.FRAME.pack(len(payload)) + payload)
+            index_entries = [self.INDEX.pack(record.user_id, record.started_at, self.segment, offset)]
+            if record.opponent_id:
+                index_entries.append(self.INDEX.pack(record.opponent_id, record.started_at, self.segment, offset))
+            with open(self._segment_path(self.segment, "idx"), "ab") as fh:
+                fh.write(b"".join(index_entries))
+        except OSError:
+            return None
+        return (self.segment, offset)
+
+    def seal(self, segment):
+        """Rewrite a closed segment's index sorted by ``(user_id, started_at)``."""
+        sorted_path = self._segment_path(segment, "sidx")
+        index_path = self._segment_path(segment, "idx")
+        if os.path.exists(sorted_path):
+            return
+        try:
+            with open(index_path, "rb") as fh:
+                raw = fh.read()
+        except OSError:
+            return
+        usable = len(raw) - len(raw) % self.INDEX.size
+        entries = sorted(self.INDEX.iter_unpack(raw[:usable]), key=lambda entry: (entry[0], entry[1], entry[3]))
+        times = [entry[1] for entry in entries]
+        header = self.SORTED_HEADER.pack(min(times, default=0), max(times, default=0))
+        tmp_path = f"{sorted_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as fh:
+                fh.write(header + b"".join(self.INDEX.pack(*entry) for entry in entries))
+            os.replace(tmp_path, sorted_path)
+            os.remove(index_path)
+        except OSError:
+            pass
+
+    def _scan(self, fh, user_id, since, until, sorted_by_user=False):
+        chunk_size = self.INDEX.size * self.INDEX_CHUNK
+        while True:
+            chunk = fh.read(chunk_size)
+            if not chunk:
+                return
+            usable = len(chunk) - len(chunk) % self.INDEX.size
+            for entry in self.INDEX.iter_unpack(chunk[:usable]):
+                entry_user, started_at = entry[0], entry[1]
+                if user_id is not None and entry_user != user_id:
+                    if sorted_by_user:
+                        return
+                    continue
+                if since is not None and started_at < since:
+                    continue
+                if until is not None and started_at > until:
+                    if sorted_by_user and user_id is not None:
+                        return
+                    continue
+                yield entry
+
+    def _seek_user(self, fh, base, count, user_id, since):
+        """Position ``fh`` at the first sorted entry at or after ``(user_id, since)``."""
+        target = (user_id, since or 0)
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            fh.seek(base + middle * self.INDEX.size)
+            entry_user, started_at, _, _ = self.INDEX.unpack(fh.read(self.INDEX.size))
+            if (entry_user, started_at) < target:
+                low = middle + 1
+            else:
+                high = middle
+        fh.seek(base + low * self.INDEX.size)
+
+    def _segment_index(self, segment, user_id=None, since=None, until=None):
+        if segment < self.segment:
+            self.seal(segment)
+        try:
+            fh = open(self._segment_path(segment, "sidx"), "rb")
+        except OSError:
+            fh = None
+        if fh is None:
+            try:
+                fh = open(self._segment_path(segment, "idx"), "rb")
+            except OSError:
+                return
+            with fh:
+                yield from self._scan(fh, user_id, since, until)
+            return
+        with fh:
+            header = fh.read(self.SORTED_HEADER.size)
+            if len(header) < self.SORTED_HEADER.size:
+                return
+            first, last = self.SORTED_HEADER.unpack(header)
+            if (since is not None and last < since) or (until is not None and first > until):
+                return
+            if user_id is not None:
+                size = os.fstat(fh.fileno()).st_size - self.SORTED_HEADER.size
+                self._seek_user(fh, self.SORTED_HEADER.size, size // self.INDEX.size, user_id, since)
+            yield from self._scan(fh, user_id, since, until, sorted_by_user=True)
+
+    def iter_index(self, user_id=None, since=None, until=None):
+        for segment in self._segments():
+            yield from self._segment_index(segment, user_id=user_id, since=since, until=until)
+
+    def read(self, segment, offset):
+        try:
+            with open(self._segment_path(segment, "log"), "rb") as fh:
+                return self._read_at(fh, segment, offset)
+        except OSError:
+            return None
+
+    def _read_at(self, fh, segment, offset):
+        fh.seek(offset)
+        header = fh.read(self.FRAME.size)
+        if len(header) < self.FRAME.size:
+            return None
+        (length,) = self.FRAME.unpack(header)
+        payload = fh.read(length)
+        if len(payload) < length:
+            return None
+        return self.decode(payload, ref=(segment, offset))
+
+    def iter_hands(self, user_id=None, since=None, until=None):
+        """Matching hands in log order; a PvP hand indexed under both players is read once."""
+        for segment in self._segments():
+            offsets = sorted({
+                entry[3] for entry in self._segment_index(segment, user_id=user_id, since=since, until=until)
+            })
+            if not offsets:
+                continue
+            try:
+                handle = open(self._segment_path(segment, "log"), "rb")
+            except OSError:
+                continue
+            with handle:
+                for offset in offsets:
+                    record = self._read_at(handle, segment, offset)
+                    if record is not None:
+                        yield record
+
+    def user_stats(self, user_id, since=None, until=None):
+        stats = {
+            "hands": 0,
+            "won": 0,
+            "lost": 0,
+            "split": 0,
+            "refunded": 0,
+            "net": 0,
+            "wagered": 0,
+            "biggest_pot": 0,
+            "showdowns": 0,
+            "folds": 0,
+            "allins": 0,
+            "vs_bot": 0,
+            "vs_players": 0,
+        }
+        for record in self.iter_hands(user_id=user_id, since=since, until=until):
+            seat = "user" if record.user_id == user_id else "bot"
+            stats["hands"] += 1
+            if record.opponent_id:
+                stats["vs_players"] += 1
+            else:
+                stats["vs_bot"] += 1
+            if record.winner == "none":
+                stats["refunded"] += 1
+            elif record.winner == "split":
+                stats["split"] += 1
+            elif record.winner == seat:
+                stats["won"] += 1
+            else:
+                stats["lost"] += 1
+            stats["net"] += record.user_net if seat == "user" else record.opponent_net
+            stats["wagered"] += record.user_total_bet if seat == "user" else record.bot_total_bet
+            stats["biggest_pot"] = max(stats["biggest_pot"], record.pot)
+            if record.end_stage == "showdown":
+                stats["showdowns"] += 1
+            for _, actor, _, action, _ in record.actions:
+                if actor != seat:
+                    continue
+                if action == "fold":
+                    stats["folds"] += 1
+                elif action == "allin":
+                    stats["allins"] += 1
+        return stats
+
+    def replay(self, record):
+        """Yield the table state before the first action and after each one."""
+        visible = {"preflop": 0, "flop": 3, "turn": 4, "river": 5, "showdown": 5}
+        state = {
+            "step": 0,
+            "stage": "preflop",
+            "actor": None,
+            "action": None,
+            "amount": 0,
+            "community": [],
+            "pot": 0,
+            "user_total_bet": 0,
+            "bot_total_bet": 0,
+            "user_cards": list(record.user_cards),
+            "bot_cards": list(record.bot_cards),
+        }
+        yield dict(state)
+        for step, (offset_ms, actor, stage, action, amount) in enumerate(record.actions, start=1):
+            state["step"] = step
+            state["elapsed_ms"] = offset_ms
+            state["stage"] = stage
+            state["actor"] = actor
+            state["action"] = action
+            state["amount"] = amount
+            state["community"] = record.community[: visible[stage]]
+            state["pot"] += amount
+            state[f"{actor}_total_bet"] += amount
+            yield dict(state)
+        state["step"] = len(record.actions) + 1
+        state["stage"] = record.end_stage
+        state["actor"] = None
+        state["action"] = None
+        state["amount"] = 0
+        state["community"] = record.community[: visible[record.end_stage]]
+        state["winner"] = record.winner
+        yield dict(state)
+
+
+@dataclass
+class QueueTicket:
+    user_id: int
+    channel_id: int
+    stake: int
+    band: int
+    enqueued_at: float
+    ctx: object = None
+    timer: object = None
+
+
+class PokerMatchmaker:
+    """Players waiting for a PvP hand, pooled by channel and stake.
+
+    Within a pool, waiting players are grouped into balance bands (powers of
+    two of balance over stake), and the bands that have anyone waiting are
+    kept in a sorted list. A match is the nearest band within
+    ``max_band_gap`` found by bisection, and the longest waiter in that band.
+    """
+
+    def __init__(self, max_band_gap=1, history=1000):
+        self.max_band_gap = max_band_gap
+        self._pools = {}
+        self._tickets = {}
+        self.match_waits = deque(maxlen=history)
+        self.timeout_waits = deque(maxlen=history)
+        self.matches = 0
+        self.timeouts = 0
+
+    def __len__(self):
+        return len(self._tickets)
+
+    def __contains__(self, user_id):
+        return user_id in self._tickets
+
+    def get(self, user_id):
+        return self._tickets.get(user_id)
+
+    def tickets(self):
+        return list(self._tickets.values())
+
+    @staticmethod
+    def band(balance, stake):
+        return int(math.log2(max(balance, stake) / stake))
+
+    def find_match(self, ticket):
+        """Remove and return the best waiting partner for ``ticket``, if any."""
+        pool = self._pools.get((ticket.channel_id, ticket.stake))
+        if not pool:
+            return None
+        bands, waiting = pool
+        index = bisect.bisect_left(bands, ticket.band)
+        best = None
+        for candidate in bands[max(0, index - 1):index + 1]:
+            gap = abs(candidate - ticket.band)
+            if gap > self.max_band_gap:
+                continue
+            head = next(iter(waiting[candidate].values()))
+            if best is None or (gap, head.enqueued_at) < best[0]:
+                best = ((gap, head.enqueued_at), head)
+        if best is None:
+            return None
+        partner = best[1]
+        self.remove(partner.user_id)
+        return partner
+
+    def add(self, ticket):
+        bands, waiting = self._pools.setdefault((ticket.channel_id, ticket.stake), ([], {}))
+        if ticket.band not in waiting:
+            bisect.insort(bands, ticket.band)
+            waiting[ticket.band] = {}
+        waiting[ticket.band][ticket.user_id] = ticket
+        self._tickets[ticket.user_id] = ticket
+
+    def remove(self, user_id):
+        ticket = self._tickets.pop(user_id, None)
+        if ticket is None:
+            return None
+        key = (ticket.channel_id, ticket.stake)
+        bands, waiting = self._pools[key]
+        members = waiting[ticket.band]
+        members.pop(user_id, None)
+        if not members:
+            del waiting[ticket.band]
+            del bands[bisect.bisect_left(bands, ticket.band)]
+            if not bands:
+                del self._pools[key]
+        return ticket
+
+    def record_wait(self, ticket, now, matched):
+        wait = max(0.0, now - ticket.enqueued_at)
+        if matched:
+            self.matches += 1
+            self.match_waits.append(wait)
+        else:
+            self.timeouts += 1
+            self.timeout_waits.append(wait)
+
+    @staticmethod
+    def percentiles(samples, points=(50, 90, 99)):
+        ordered = sorted(samples)
+        if not ordered:
+            return {}
+        return {point: ordered[min(len(ordered) - 1, len(ordered) * point // 100)] for point in points}
+
+
+class PokerTableRegistry:
+    """Active poker hands indexed by player, channel and message id.
+
+    A single deadline heap tracks when each table was last touched. Touching
+    pushes a fresh entry and leaves the old one behind; stale entries are
+    skipped when popped and the heap is rebuilt once they outnumber live
+    tables, so memory stays proportional to the tables that are open.
+    """
+
+    def __init__(self, timeout=120, max_tables_per_channel=0):
+        self.timeout = timeout
+        self.max_tables_per_channel = max_tables_per_channel
+        self._tables = {}
+        self._by_player = {}
+        self._by_channel = {}
+        self._by_message = {}
+        self._deadlines = []
+        self._ids = itertools.count(1)
+
+    def __len__(self):
+        return len(self._tables)
+
+    def __contains__(self, user_id):
+        return user_id in self._by_player
+
+    def get(self, user_id):
+        table_id = self._by_player.get(user_id)
+        return self._tables.get(table_id) if table_id is not None else None
+
+    def get_by_message(self, message_id):
+        table_id = self._by_message.get(message_id)
+        return self._tables.get(table_id) if table_id is not None else None
+
+    def tables(self):
+        return list(self._tables.values())
+
+    def channel_count(self, channel_id):
+        return len(self._by_channel.get(channel_id, ()))
+
+    def channel_full(self, channel_id):
+        if self.max_tables_per_channel <= 0:
+            return False
+        return self.channel_count(channel_id) >= self.max_tables_per_channel
+
+    def add(self, game, channel_id=None):
+        table_id = next(self._ids)
+        game["table_id"] = table_id
+        game["channel_id"] = channel_id
+        self._tables[table_id] = game
+        for user_id in (game.get("user_id"), game.get("opponent_id")):
+            if user_id:
+                self._by_player[user_id] = table_id
+        if channel_id is not None:
+            self._by_channel.setdefault(channel_id, set()).add(table_id)
+        self.touch(game)
+        return table_id
+
+    def attach_message(self, game, message_id):
+        table_id = game.get("table_id")
+        if table_id not in self._tables:
+            return
+        previous = game.get("message_id")
+        if previous is not None:
+            self._by_message.pop(previous, None)
+        game["message_id"] = message_id
+        self._by_message[message_id] = table_id
+
+    def touch(self, game, timeout=None):
+        table_id = game.get("table_id")
+        if table_id not in self._tables:
+            return
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        game["deadline"] = deadline
+        heapq.heappush(self._deadlines, (deadline, table_id))
+        if len(self._deadlines) > 2 * len(self._tables) + 64:
+            self._compact()
+
+    def remove(self, game):
+        table_id = game.get("table_id")
+        if self._tables.pop(table_id, None) is None:
+            return False
+        for user_id in (game.get("user_id"), game.get("opponent_id")):
+            if user_id and self._by_player.get(user_id) == table_id:
+                del self._by_player[user_id]
+        channel_tables = self._by_channel.get(game.get("channel_id"))
+        if channel_tables is not None:
+            channel_tables.discard(table_id)
+            if not channel_tables:
+                del self._by_channel[game.get("channel_id")]
+        message_id = game.get("message_id")
+        if message_id is not None and self._by_message.get(message_id) == table_id:
+            del self._by_message[message_id]
+        if not self._tables:
+            self._deadlines.clear()
+        return True
+
+    def is_active(self, game):
+        return self._tables.get(game.get("table_id")) is game
+
+    def expired(self, now=None):
+        """Pop and return every live table whose deadline has passed."""
+        now = time.monotonic() if now is None else now
+        due = []
+        while self._deadlines and self._deadlines[0][0] <= now:
+            deadline, table_id = heapq.heappop(self._deadlines)
+            game = self._tables.get(table_id)
+            if game is not None and game.get("deadline") == deadline:
+                due.append(game)
+        return due
+
+    def _compact(self):
+        self._deadlines = [
+            (game["deadline"], table_id)
+            for table_id, game in self._tables.items()
+            if "deadline" in game
+        ]
+        heapq.heapify(self._deadlines)
+
+
+class PokerCheckpointStore:
+    """One small JSON file per active hand, replaced atomically on every write.
+
+    Files are keyed by the hand's starting player, who can only have one hand
+    open at a time. Discord objects and anything derivable from the rest of
+    the state (views, messages, the range model, the hand-strength cache) are
+    left out.
+    """
+
+    VERSION = 1
+    SKIP_FIELDS = frozenset({"ctx", "view", "message", "opponent_range", "hand_strength", "deadline", "table_id", "locked", "locked_at"})
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._seq = itertools.count(1)
+        self._written = {}
+        # Striped by player so a write from the loop never waits behind a whole batch on a worker thread.
+        self._locks = [threading.Lock() for _ in range(64)]
+
+    def _path(self, user_id):
+        return os.path.join(self.directory, f"{user_id}.json")
+
+    def stamp(self):
+        """Sequence number for a payload taken now; see ``write_many``."""
+        return next(self._seq)
+
+    def encode(self, game):
+        """The checkpoint for ``game`` as JSON text, or None if it can't be serialised."""
+        state = {key: value for key, value in game.items() if key not in self.SKIP_FIELDS}
+        state["version"] = self.VERSION
+        try:
+            return json.dumps(state, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+
+    def write(self, user_id, payload):
+        """Blocking; replaces ``user_id``'s checkpoint with ``payload``."""
+        path = self._path(user_id)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                handle.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def write_many(self, writes):
+        """Blocking; ``writes`` holds ``(user_id, payload, seq)``, a payload of None discards.
+
+        Writes come from the event loop and from worker threads, so a write
+        stamped before one already made for the same player is skipped rather
+        than put back an older state.
+        """
+        for user_id, payload, seq in writes:
+            with self._locks[hash(user_id) % len(self._locks)]:
+                if seq < self._written.get(user_id, 0):
+                    continue
+                self._written[user_id] = seq
+                if payload is None:
+                    self.discard(user_id)
+                else:
+                    self.write(user_id, payload)
+
+    def save(self, game):
+        payload = self.encode(game)
+        if payload is not None:
+            self.write(game["user_id"], payload)
+
+    def discard(self, user_id):
+        try:
+            os.remove(self._path(user_id))
+        except OSError:
+            pass
+
+    def load_all(self):
+        states = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return states
+        for name in names:
+            path = os.path.join(self.directory, name)
+            if not name.endswith(".json"):
+                if name.endswith(".tmp"):
+                    self._remove(path)
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    state = json.load(handle)
+            except (OSError, ValueError):
+                self._remove(path)
+                continue
+            if isinstance(state, dict) and state.get("version") == self.VERSION and state.get("user_id"):
+                states.append(state)
+            else:
+                self._remove(path)
+        return states
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class RestoredPokerContext:
+    """Stand-in for the command context of a hand resumed after a restart."""
+
+    def __init__(self, bot, channel, author):
+        self.bot = bot
+        self.channel = channel
+        self.guild = getattr(channel, "guild", None)
+        self.author = author
+
+    async def send(self, *args, **kwargs):
+        return await self.channel.send(*args, **kwargs)
+
+
+_SCORE_BASE = 14
+
+
+def _top_ranks(mask, count):
+    """Highest ``count`` rank indices where ``mask`` is set, per row; -1 pads."""
+    ranks = np.where(mask, np.arange(13), -1)
+    ranks.sort(axis=1)
+    return ranks[:, : -count - 1 : -1]
+
+
+def _straight_high(presence):
+    bits = (presence.astype(np.int64) << np.arange(13)).sum(axis=1)
+    extended = (bits << 1) | ((bits >> 12) & 1)
+    high = np.full(presence.shape[0], -1, dtype=np.int64)
+    for top in range(12, 2, -1):
+        window = 0b11111 << (top - 3)
+        hit = (high < 0) & ((extended & window) == window)
+        high[hit] = top
+    return high
+
+
+def score_hands(cards):
+    """Vectorised best-hand scores for an ``(N, k)`` array of card codes.
+
+    ``k`` is 5 to 7. Scores order hands the same way ``Games._best_hand`` and
+    ``Games._compare_hands`` do, so higher is better and equal means a tie.
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    rows = cards.shape[0]
+    ranks = cards // 4
+    suits = cards % 4
+    rank_onehot = ranks[:, :, None] == np.arange(13)
+    counts = rank_onehot.sum(axis=1)
+    suit_counts = (suits[:, :, None] == np.arange(4)).sum(axis=1)
+    presence = counts > 0
+
+    flush_suit = suit_counts.argmax(axis=1)
+    has_flush = suit_counts.max(axis=1) >= 5
+    in_flush = suits == flush_suit[:, None]
+    flush_presence = (rank_onehot & in_flush[:, :, None]).any(axis=1) & has_flush[:, None]
+
+    straight_flush = _straight_high(flush_presence)
+    straight = _straight_high(presence)
+    quads = _top_ranks(counts == 4, 1)[:, 0]
+    trips = _top_ranks(counts == 3, 2)
+    pairs = _top_ranks(counts == 2, 3)
+    full_pair = np.maximum(trips[:, 1], pairs[:, 0])
+
+    category = np.zeros(rows, dtype=np.int64)
+    breakers = np.full((rows, 5), -1, dtype=np.int64)
+
+    def assign(mask, cat, values):
+        take = mask & ~assigned
+        category[take] = cat
+        values = np.asarray(values)
+        breakers[take, : values.shape[1]] = values[take]
+        assigned[take] = True
+
+    def kickers(exclude, count):
+        mask = presence.copy()
+        for column in exclude:
+            valid = column >= 0
+            mask[valid, column[valid]] = False
+        return _top_ranks(mask, count)
+
+    assigned = np.zeros(rows, dtype=bool)
+    assign(straight_flush >= 0, 8, straight_flush[:, None])
+    assign(quads >= 0, 7, np.column_stack([quads, kickers([quads], 1)]))
+    assign((trips[:, 0] >= 0) & (full_pair >= 0), 6, np.column_stack([trips[:, 0], full_pair]))
+    assign(has_flush, 5, _top_ranks(flush_presence, 5))
+    assign(straight >= 0, 4, straight[:, None])
+    assign(trips[:, 0] >= 0, 3, np.column_stack([trips[:, 0], kickers([trips[:, 0]], 2)]))
+    assign(
+        pairs[:, 1] >= 0,
+        2,
+        np.column_stack([pairs[:, 0], pairs[:, 1], kickers([pairs[:, 0], pairs[:, 1]], 1)]),
+    )
+    assign(pairs[:, 0] >= 0, 1, np.column_stack([pairs[:, 0], kickers([pairs[:, 0]], 3)]))
+    assign(~assigned, 0, _top_ranks(presence, 5))
+
+    weights = _SCORE_BASE ** np.arange(4, -1, -1, dtype=np.int64)
+    return category * _SCORE_BASE ** 5 + ((breakers + 1) * weights).sum(axis=1)
+
+
+class OpponentRangeModel:
+    """Weighted range over the opponent's 1326 possible hole-card combos.
+
+    Each observed action multiplies every combo's weight by how likely that
+    action is for a hand of that strength, so the range narrows as the hand
+    goes on. Equity is then estimated against the weighted range. Combo
+    strengths are scored once per board and reused by every later action on
+    the same street.
+    """
+
+    _combos = None
+    _card_combos = None
+    _preflop_strength = None
+
+    def __init__(self, dead_cards=(), bluff_rate=0.15):
+        self._ensure_tables()
+        self.weights = np.ones(len(self._combos))
+        self.bluff_rate = bluff_rate
+        self._board_strength = None
+        self.remove_cards(dead_cards)
+
+    @classmethod
+    def _ensure_tables(cls):
+        if cls._combos is not None:
+            return
+        combos = np.array(list(itertools.combinations(range(52), 2)), dtype=np.int64)
+        card_combos = [[] for _ in range(52)]
+        for index, (first, second) in enumerate(combos):
+            card_combos[first].append(index)
+            card_combos[second].append(index)
+        high = np.maximum(combos[:, 0], combos[:, 1]) // 4
+        low = np.minimum(combos[:, 0], combos[:, 1]) // 4
+        suited = combos[:, 0] % 4 == combos[:, 1] % 4
+        gap = high - low
+        strength = high * 2.0 + low * 0.5
+        strength += np.where(gap == 0, 14 + high * 1.5, 0)
+        strength += np.where(suited, 2.5, 0)
+        strength -= np.where(gap > 1, np.minimum(gap - 1, 4) * 1.2, 0)
+        cls._combos = combos
+        cls._card_combos = np.array(card_combos, dtype=np.int64)
+        cls._preflop_strength = strength
+
+    def remove_cards(self, cards):
+        for code in cards:
+            self.weights[self._card_combos[code]] = 0.0
+
+    def _combo_strength(self, board):
+        """Every combo's score with ``board`` (the preflop heuristic with no board), kept for the last board seen."""
+        if not board:
+            return self._preflop_strength
+        key = tuple(board)
+        cached = self._board_strength
+        if cached is None or cached[0] != key:
+            board_codes = np.broadcast_to(np.array(board, dtype=np.int64), (len(self._combos), len(board)))
+            cached = self._board_strength = (key, score_hands(np.hstack([self._combos, board_codes])))
+        return cached[1]
+
+    def _strength_percentile(self, board):
+        live = self.weights > 0
+        strength = self._combo_strength(board)
+        percentile = np.zeros(len(self._combos))
+        live_count = int(live.sum())
+        if live_count > 1:
+            order = np.argsort(strength[live], kind="stable")
+            ranks = np.empty(live_count)
+            ranks[order] = np.arange(live_count)
+            percentile[live] = ranks / (live_count - 1)
+        return percentile
+
+    def observe(self, action, board=()):
+        if action not in ("check", "call", "bet", "raise", "allin", "all-in"):
+            return
+        self.remove_cards(board)
+        strength = self._strength_percentile(list(board))
+        floor = self.bluff_rate
+        if action in ("bet", "raise"):
+            likelihood = floor + (1 - floor) * strength ** 2
+        elif action in ("allin", "all-in"):
+            likelihood = floor * 0.7 + (1 - floor * 0.7) * strength ** 3
+        elif action == "call":
+            likelihood = 0.3 + 0.7 * np.exp(-(((strength - 0.6) / 0.3) ** 2))
+        else:
+            likelihood = 1.0 - 0.7 * strength ** 2
+        updated = self.weights * likelihood
+        total = updated.sum()
+        if total > 0:
+            self.weights = updated / total * np.count_nonzero(updated)
+
+    def equity(self, hero, board=(), samples=512, rng=None, weights=None):
+        """Hero's equity (wins plus half of ties) against the weighted range.
+
+        On the river every live combo is compared exactly. Before it,
+        ``samples`` combos are drawn from the range, each with its own runout,
+        so the cost does not grow with the size of the range. ``weights``
+        defaults to a copy of the range; callers on a worker thread pass a
+        copy taken on the event loop. The model itself is not changed.
+        """
+        rng = rng or np.random.default_rng()
+        hero = list(hero)
+        board = list(board)
+        dead = hero + board
+        weights = np.array(self.weights if weights is None else weights, dtype=float)
+        weights[self._card_combos[dead].ravel()] = 0.0
+        total = weights.sum()
+        if total <= 0:
+            return 0.5
+        missing = 5 - len(board)
+        if not missing:
+            hero_score = score_hands(np.array([dead], dtype=np.int64))[0]
+            villain_scores = self._combo_strength(board)
+            outcome = (hero_score > villain_scores) + 0.5 * (hero_score == villain_scores)
+            return float((outcome * weights).sum() / total)
+        villains = self._combos[rng.choice(len(self._combos), size=samples, p=weights / total)]
+        # Deal each sample's runout from the cards left after hero, board and that villain hand.
+        keys = rng.random((samples, 52))
+        keys[:, dead] = 2.0
+        keys[np.arange(samples)[:, None], villains] = 2.0
+        drawn = np.argpartition(keys, missing - 1, axis=1)[:, :missing]
+        runouts = np.hstack([np.broadcast_to(np.array(board, dtype=np.int64), (samples, len(board))), drawn])
+        hero_scores = score_hands(np.hstack([np.broadcast_to(np.array(hero, dtype=np.int64), (samples, 2)), runouts]))
+        villain_scores = score_hands(np.hstack([villains, runouts]))
+        outcome = (hero_scores > villain_scores) + 0.5 * (hero_scores == villain_scores)
+        return float(outcome.mean())
+
+
+def combo_index(first, second):
+    """Index of a hole-card pair in ``itertools.combinations(range(52), 2)`` order."""
+    low, high = min(first, second), max(first, second)
+    return low * (103 - low) // 2 + high - low - 1
+
+
+def strength_buckets(board, buckets):
+    """Strength bucket (0 is weakest) for each of the 1326 hole-card combos.
+
+    Combos are ranked against every other combo that avoids ``board``; combos
+    that use a board card get -1. Preflop ranking uses the same heuristic as
+    ``OpponentRangeModel``.
+    """
+    OpponentRangeModel._ensure_tables()
+    combos = OpponentRangeModel._combos
+    board = list(board)
+    live = ~np.isin(combos, board).any(axis=1)
+    if board:
+        board_codes = np.broadcast_to(np.array(board, dtype=np.int64), (int(live.sum()), len(board)))
+        strength = score_hands(np.hstack([combos[live], board_codes])).astype(float)
+    else:
+        strength = OpponentRangeModel._preflop_strength[live]
+    ordered = np.sort(strength)
+    ranks = (np.searchsorted(ordered, strength, "left") + np.searchsorted(ordered, strength, "right")) / 2
+    result = np.full(len(combos), -1, dtype=np.int64)
+    result[live] = np.minimum(buckets - 1, (ranks / len(ordered) * buckets).astype(np.int64))
+    return result
+
+
+class BettingAbstraction:
+    """Heads-up betting tree, in big blinds, shared by the CFR solver and bot.
+
+    Every street allows fold (only when facing a bet), check/call, a raise of
+    one big blind and a shove to the per-street ``max_bet``, with at most
+    ``raise_cap`` raises per street. Histories spell the actions with
+    ``f``/``c``/``r``/``a`` and separate streets with ``/``; seat 0 is the
+    small blind, who acts first preflop and second afterwards.
+    """
+
+    ACTIONS = ("fold", "call", "raise", "allin")
+    TOKENS = "fcra"
+
+    def __init__(self, raise_cap=3, max_bet=10):
+        self.raise_cap = raise_cap
+        self.max_bet = max_bet
+        self.players = []
+        self.streets = []
+        self.histories = []
+        # Per node, one child per action: a node id, ~terminal id, or None if illegal.
+        self.children = []
+        # Per terminal: (folding seat or -1 for showdown, seat 0 chips, seat 1 chips).
+        self.terminals = []
+        self.index = {}
+        self._start_street(0, "", (0.0, 0.0))
+
+    def __len__(self):
+        return len(self.players)
+
+    def _start_street(self, street, history, totals):
+        if street == 0:
+            return self._add_node(street, history, totals, (0.5, 1.0), 0, 0, frozenset())
+        return self._add_node(street, history, totals, (0.0, 0.0), 1, 0, frozenset())
+
+    def _terminal(self, folder, totals, bets):
+        self.terminals.append((folder, totals[0] + bets[0], totals[1] + bets[1]))
+        return ~(len(self.terminals) - 1)
+
+    def _add_node(self, street, history, totals, bets, actor, raises, acted):
+        node = len(self.players)
+        self.players.append(actor)
+        self.streets.append(street)
+        self.histories.append(history)
+        self.children.append(None)
+        self.index[history] = node
+        current = max(bets)
+        children = [None, None, None, None]
+        if bets[actor] < current:
+            children[0] = self._terminal(actor, totals, bets)
+        called = list(bets)
+        called[actor] = current
+        if acted | {actor} == {0, 1}:
+            if street == 3:
+                children[1] = self._terminal(-1, totals, called)
+            else:
+                street_totals = (totals[0] + called[0], totals[1] + called[1])
+                children[1] = self._start_street(street + 1, history + "c/", street_totals)
+        else:
+            children[1] = self._add_node(street, history + "c", totals, called, 1 - actor, raises, acted | {actor})
+        if raises < self.raise_cap and current < self.max_bet:
+            for slot, target in ((2, current + 1), (3, self.max_bet)):
+                if slot == 2 and target >= self.max_bet:
+                    continue
+                raised = list(bets)
+                raised[actor] = target
+                history_key = history + self.TOKENS[slot]
+                children[slot] = self._add_node(street, history_key, totals, raised, 1 - actor, raises + 1, frozenset({actor}))
+        self.children[node] = tuple(children)
+        return node
+
+    def legal(self, node):
+        return [slot for slot, child in enumerate(self.children[node]) if child is not None]
+
+
+class PokerStrategyTable:
+    """Quantised average strategy for every node and strength bucket.
+
+    The file holds a small header followed by one byte per action for each
+    ``(node, bucket)`` pair, in ``BettingAbstraction`` node order.
+    """
+
+    MAGIC = b"PKCF"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHHHHQ")
+
+    def __init__(self, abstraction, buckets, probabilities, iterations=0):
+        self.abstraction = abstraction
+        self.buckets = buckets
+        self.probabilities = bytes(probabilities)
+        self.iterations = iterations
+        if len(self.probabilities) != len(abstraction) * buckets * 4:
+            raise ValueError("strategy table size does not match its abstraction")
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "rb") as handle:
+                header = handle.read(cls.HEADER.size)
+                body = handle.read()
+        except OSError:
+            return None
+        if len(header) != cls.HEADER.size:
+            return None
+        magic, version, buckets, raise_cap, max_bet, iterations = cls.HEADER.unpack(header)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            return None
+        try:
+            return cls(BettingAbstraction(raise_cap, max_bet), buckets, body, iterations)
+        except ValueError:
+            return None
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        header = self.HEADER.pack(
+            self.MAGIC,
+            self.VERSION,
+            self.buckets,
+            self.abstraction.raise_cap,
+            self.abstraction.max_bet,
+            self.iterations,
+        )
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(header)
+            handle.write(self.probabilities)
+        os.replace(tmp_path, path)
+
+    def lookup(self, node, bucket):
+        start = (node * self.buckets + bucket) * 4
+        return tuple(self.probabilities[start:start + 4])
+
+    def sample(self, history, bucket, seat):
+        """Action name for ``seat`` at ``history``, or None outside the abstraction."""
+        node = self.abstraction.index.get(history)
+        if node is None or self.abstraction.players[node] != seat:
+            return None
+        weights = self.lookup(node, min(max(bucket, 0), self.buckets - 1))
+        if not any(weights):
+            return None
+        return random.choices(BettingAbstraction.ACTIONS, weights=weights, k=1)[0]
+
+
+class PokerTableRenderer:
+    """Draws a poker table image from a hashable snapshot of a hand.
+
+    Card faces, a card back and the felt are drawn once into an atlas on first
+    use; each frame then copies the felt, blits the visible cards from the
+    atlas and adds the text. Finished frames are cached by snapshot.
+    """
+
+    WIDTH = 640
+    HEIGHT = 360
+    CARD_WIDTH = 64
+    CARD_HEIGHT = 90
+    CARD_GAP = 10
+    FONT_CANDIDATES = ("DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf", "DejaVuSans.ttf")
+
+    def __init__(self, cache_size=256):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._atlas_lock = threading.Lock()
+        self._atlas = None
+        self._boxes = {}
+        self._felt = None
+        self._fonts = {}
+
+    def _font(self, size):
+        font = self._fonts.get(size)
+        if font is None:
+            for name in self.FONT_CANDIDATES:
+                try:
+                    font = ImageFont.truetype(name, size)
+                    break
+                except OSError:
+                    continue
+            else:
+                font = ImageFont.load_default()
+            self._fonts[size] = font
+        return font
+
+    def _draw_face(self, draw, x, y, card):
+        width, height = self.CARD_WIDTH, self.CARD_HEIGHT
+        draw.rounded_rectangle((x, y, x + width - 1, y + height - 1), radius=7, fill=(250, 250, 247, 255), outline=(40, 40, 40, 255))
+        color = (200, 30, 45, 255) if card[1] in "♥♦" else (20, 20, 20, 255)
+        rank = "10" if card[0] == "T" else card[0]
+        draw.text((x + 6, y + 4), rank, fill=color, font=self._font(18))
+        draw.text((x + width / 2, y + height / 2 + 8), card[1], fill=color, font=self._font(34), anchor="mm")
+
+    def _draw_back(self, draw, x, y):
+        width, height = self.CARD_WIDTH, self.CARD_HEIGHT
+        draw.rounded_rectangle((x, y, x + width - 1, y + height - 1), radius=7, fill=(35, 60, 140, 255), outline=(240, 240, 240, 255), width=3)
+        draw.rounded_rectangle((x + 8, y + 8, x + width - 9, y + height - 9), radius=4, outline=(120, 150, 220, 255), width=2)
+
+    def _build_atlas(self):
+        width, height = self.CARD_WIDTH, self.CARD_HEIGHT
+        atlas = Image.new("RGBA", (width * len(CARD_RANKS), height * (len(CARD_SUITS) + 1)), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(atlas)
+        for row, suit in enumerate(CARD_SUITS):
+            for column, rank in enumerate(CARD_RANKS):
+                x, y = column * width, row * height
+                self._draw_face(draw, x, y, rank + suit)
+                self._boxes[rank + suit] = (x, y, x + width, y + height)
+        back_y = len(CARD_SUITS) * height
+        self._draw_back(draw, 0, back_y)
+        self._boxes[None] = (0, back_y, width, back_y + height)
+
+        felt = Image.new("RGBA", (self.WIDTH, self.HEIGHT), (24, 26, 32, 255))
+        felt_draw = ImageDraw.Draw(felt)
+        felt_draw.ellipse((20, 20, self.WIDTH - 20, self.HEIGHT - 20), fill=(92, 60, 38, 255))
+        felt_draw.ellipse((34, 34, self.WIDTH - 34, self.HEIGHT - 34), fill=(22, 110, 62, 255))
+        for index in range(5):
+            x, y = self._community_origin(index)
+            felt_draw.rounded_rectangle(
+                (x, y, x + width - 1, y + height - 1),
+                radius=7,
+                outline=(60, 150, 95, 255),
+                width=2,
+            )
+        self._atlas = atlas
+        self._felt = felt
+
+    def _community_origin(self, index):
+        total = 5 * self.CARD_WIDTH + 4 * self.CARD_GAP
+        left = (self.WIDTH - total) // 2
+        return left + index * (self.CARD_WIDTH + self.CARD_GAP), (self.HEIGHT - self.CARD_HEIGHT) // 2 - 10
+
+    def _blit(self, image, card, x, y):
+        image.alpha_composite(self._atlas, dest=(x, y), source=self._boxes.get(card, self._boxes[None]))
+
+    def _blit_hand(self, image, cards, y):
+        total = 2 * self.CARD_WIDTH + self.CARD_GAP
+        left = (self.WIDTH - total) // 2
+        for index in range(2):
+            card = cards[index] if cards else None
+            self._blit(image, card, left + index * (self.CARD_WIDTH + self.CARD_GAP), y)
+
+    def _render(self, snapshot):
+        with self._atlas_lock:
+            if self._atlas is None:
+                self._build_atlas()
+        stage, community, user_cards, opponent_cards, pot, user_bet, opponent_bet, user_name, opponent_name = snapshot
+        image = self._felt.copy()
+        for index, card in enumerate(community):
+            self._blit(image, card, *self._community_origin(index))
+        self._blit_hand(image, opponent_cards, 8)
+        self._blit_hand(image, user_cards, self.HEIGHT - self.CARD_HEIGHT - 8)
+        draw = ImageDraw.Draw(image)
+        label_font = self._font(16)
+        text_color = (240, 240, 240, 255)
+        _, community_y = self._community_origin(0)
+        draw.text((self.WIDTH / 2, community_y + self.CARD_HEIGHT + 16), f"Pot RM {pot}", fill=(255, 215, 90, 255), font=self._font(20), anchor="mm")
+        draw.text((self.WIDTH / 2, community_y - 14), stage, fill=text_color, font=label_font, anchor="mm")
+        seat_x = self.WIDTH / 2 + self.CARD_WIDTH + self.CARD_GAP + 16
+        draw.text((seat_x, 30), opponent_name, fill=text_color, font=label_font)
+        draw.text((seat_x, 52), f"Bet RM {opponent_bet}", fill=text_color, font=label_font)
+        draw.text((seat_x, self.HEIGHT - 76), user_name, fill=text_color, font=label_font)
+        draw.text((seat_x, self.HEIGHT - 54), f"Bet RM {user_bet}", fill=text_color, font=label_font)
+        output = io.BytesIO()
+        image.convert("RGB").save(output, format="PNG")
+        return output.getvalue()
+
+    async def render(self, snapshot):
+        """PNG bytes for ``snapshot``, drawn in a worker thread unless cached."""
+        cached = self._cache.get(snapshot)
+        if cached is not None:
+            self._cache.move_to_end(snapshot)
+            return cached
+        png = await asyncio.to_thread(self._render, snapshot)
+        self._cache[snapshot] = png
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return png
+
+
 class PokerBetModal(discord.ui.Modal):
     def __init__(self, cog, ctx, user_id, action="bet"):
         title = "Poker Bet" if action == "bet" else "Poker Raise"
@@ -81,7 +1374,7 @@ class PokerBetModal(discord.ui.Modal):
 
 
 class PokerView(discord.ui.View):
-    def __init__(self, cog, ctx, user_id, opponent_id=None, timeout=120):
+    def __init__(self, cog, ctx, user_id, opponent_id=None, timeout=None):
         super().__init__(timeout=timeout)
         self.cog = cog
         self.ctx = ctx
@@ -92,8 +1385,10 @@ class PokerView(discord.ui.View):
         if interaction.user.id not in {self.user_id, self.opponent_id}:
             await interaction.response.send_message("This isn't your hand.", ephemeral=True)
             return False
-        game = self.cog.poker_games.get(interaction.user.id)
-        if not game:
+        game = None
+        if interaction.message is not None:
+            game = self.cog.poker_games.get_by_message(interaction.message.id)
+        if not game or game is not self.cog.poker_games.get(interaction.user.id):
             await interaction.response.send_message("That hand is no longer active.", ephemeral=True)
             return False
         actor = self.cog._player_key(game, interaction.user.id)
@@ -105,31 +1400,11 @@ class PokerView(discord.ui.View):
             return False
         return True
 
-    async def on_timeout(self):
-        game = self.cog.poker_games.get(self.user_id)
-        if not game or not game.get("message"):
-            return
-        for item in self.children:
-            item.disabled = True
-        refund_note = "Hand timed out."
-        user_refund = game.get("user_total_bet", 0)
-        if user_refund:
-            self.cog.currency.adjust(game["user_id"], user_refund)
-        opponent_id = game.get("opponent_id")
-        opponent_refund = game.get("bot_total_bet", 0) if opponent_id else 0
-        if opponent_id and opponent_refund:
-            self.cog.currency.adjust(opponent_id, opponent_refund)
-        if user_refund or opponent_refund:
-            refund_note = "Hand timed out. Bets refunded."
-        embed = self.cog._poker_status_embed(self.ctx, game, footer_text=refund_note)
-        await game["message"].edit(embed=embed, view=self)
-        self.cog.poker_games.pop(self.user_id, None)
-
-    @discord.ui.button(label="Check", style=discord.ButtonStyle.secondary)
+    @discord.ui.button(label="Check", style=discord.ButtonStyle.secondary, custom_id="poker:check")
     async def check(self, interaction: discord.Interaction, button: discord.ui.Button):
         await self.cog._handle_poker_action(interaction, "check")
 
-    @discord.ui.button(label="Bet", style=discord.ButtonStyle.primary)
+    @discord.ui.button(label="Bet", style=discord.ButtonStyle.primary, custom_id="poker:bet")
     async def bet(self, interaction: discord.Interaction, button: discord.ui.Button):
         game = self.cog.poker_games.get(interaction.user.id)
         action = "bet"
@@ -139,15 +1414,15 @@ class PokerView(discord.ui.View):
                 action = "raise"
         await interaction.response.send_modal(PokerBetModal(self.cog, self.ctx, self.user_id, action=action))
 
-    @discord.ui.button(label="All-in", style=discord.ButtonStyle.danger)
+    @discord.ui.button(label="All-in", style=discord.ButtonStyle.danger, custom_id="poker:allin")
     async def allin(self, interaction: discord.Interaction, button: discord.ui.Button):
         await self.cog._handle_poker_action(interaction, "allin")
 
-    @discord.ui.button(label="Fold", style=discord.ButtonStyle.secondary)
+    @discord.ui.button(label="Fold", style=discord.ButtonStyle.secondary, custom_id="poker:fold")
     async def fold(self, interaction: discord.Interaction, button: discord.ui.Button):
         await self.cog._handle_poker_action(interaction, "fold")
 
-    @discord.ui.button(label="Show Cards", style=discord.ButtonStyle.secondary)
+    @discord.ui.button(label="Show Cards", style=discord.ButtonStyle.secondary, custom_id="poker:show")
     async def show_cards(self, interaction: discord.Interaction, button: discord.ui.Button):
         game = self.cog.poker_games.get(interaction.user.id)
         if not game:
@@ -158,36 +1433,64 @@ class PokerView(discord.ui.View):
             await interaction.response.send_message("This isn't your hand.", ephemeral=True)
             return
         cards = game["user_cards"] if actor == "user" else game["bot_cards"]
-        community = game.get("community", [])
-        all_cards = cards + community
-        if len(all_cards) >= 5:
-            rank, _ = self.cog._best_hand(all_cards)
-            hand_label = self.cog.CATEGORY_NAMES[rank]
-        else:
-            counts = {}
-            for card in all_cards:
-                counts[card[0]] = counts.get(card[0], 0) + 1
-            count_values = sorted(counts.values(), reverse=True)
-            if count_values and count_values[0] >= 4:
-                hand_label = "Four of a Kind"
-            elif count_values and count_values[0] == 3:
-                hand_label = "Three of a Kind"
-            elif count_values.count(2) >= 2:
-                hand_label = "Two Pair"
-            elif count_values.count(2) == 1:
-                hand_label = "Pair"
-            else:
-                hand_label = "High Card"
-        await interaction.response.send_message(
-            f"Your cards: {self.cog._format_cards(cards)}\nHand: {hand_label}",
-            ephemeral=True,
-        )
+        strength = self.cog._hand_strength(game, actor)
+        draws, outs = self.cog._seat_draws(game, actor)
+        message = f"Your cards: {self.cog._format_cards(cards)}\nHand: {self.cog.CATEGORY_NAMES[strength['category']]}"
+        if draws:
+            message += f"\nDraws: {', '.join(draws)}"
+        if outs:
+            message += f"\nOuts to improve: {outs}"
+        await interaction.response.send_message(message, ephemeral=True)
+
+    @discord.ui.button(label="Table", style=discord.ButtonStyle.secondary, custom_id="poker:table")
+    async def table(self, interaction: discord.Interaction, button: discord.ui.Button):
+        game = self.cog.poker_games.get(interaction.user.id)
+        if not game:
+            await interaction.response.send_message("That hand is no longer active.", ephemeral=True)
+            return
+        actor = self.cog._player_key(game, interaction.user.id)
+        if not actor:
+            await interaction.response.send_message("This isn't your hand.", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        image = await self.cog._render_table(game, viewer=actor)
+        await interaction.followup.send(file=image, ephemeral=True)
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_flag(name, default=False):
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
 
 
 class Games(commands.Cog):
     RANK_ORDER = "23456789TJQKA"
     DAILY_REWARD = 1000
     DAILY_COOLDOWN = 60 * 60 * 24
+    PROFILE_FLUSH_UPDATES = 50
+    PROFILE_FLUSH_INTERVAL = 60
+    POKER_REAP_INTERVAL = 5
+    # How long an expired hand may stay locked by a handler before it is expired anyway.
+    POKER_LOCK_GRACE = 60
+    PLAYER_STAT_FIELDS = (
+        "hands",
+        "vpip",
+        "pfr",
+        "aggressive",
+        "calls",
+        "faced_bets",
+        "folds_to_bet",
+        "showdowns",
+        "showdown_wins",
+    )
     CATEGORY_NAMES = [
         "High Card",
         "Pair",
@@ -203,6 +1506,7 @@ class Games(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
+        self.logger = logging.getLogger('discord.games')
         data_file = os.getenv("GAMES_DATAFILE", "games_currency.json")
         self.currency = CurrencyManager(data_file, start_balance=100)
         self.daily_path = os.getenv("GAMES_DAILY_DATAFILE", "games_daily.json")
@@ -213,7 +1517,29 @@ class Games(commands.Cog):
         self.persona_lines = self._load_persona_lines()
         self.poker_profile_path = os.getenv("POKER_PROFILE_PATH", "data/poker_profiles.json")
         self.poker_profiles = self._load_poker_profiles()
-        self.poker_games = {}
+        self._profile_updates = 0
+        self._profiles_flushed_at = time.monotonic()
+        self.hand_history = HandHistoryLog(os.getenv("POKER_HISTORY_DIR", "data/hand_history"))
+        self.poker_games = PokerTableRegistry(
+            timeout=_env_int("POKER_TABLE_TIMEOUT", 120),
+            max_tables_per_channel=_env_int("POKER_MAX_TABLES_PER_CHANNEL", 0),
+        )
+        self._poker_reaper_task = None
+        self.table_renderer = PokerTableRenderer()
+        self.showdown_images = _env_flag("POKER_SHOWDOWN_IMAGES", False)
+        self.poker_checkpoints = PokerCheckpointStore(os.getenv("POKER_CHECKPOINT_DIR", "data/poker_checkpoints"))
+        self.poker_checkpoint_delay = max(0, _env_int("POKER_CHECKPOINT_DELAY", 1))
+        self._checkpoint_dirty = {}
+        self._checkpoint_task = None
+        self._checkpoint_lock = asyncio.Lock()
+        self._poker_restored = False
+        self.poker_queue = PokerMatchmaker(max_band_gap=_env_int("POKER_QUEUE_BAND_GAP", 1))
+        self.poker_queue_timeout = _env_int("POKER_QUEUE_TIMEOUT", 60)
+        self.range_bot_enabled = np is not None and _env_flag("POKER_RANGE_BOT", True)
+        self._equity_slots = asyncio.Semaphore(max(1, _env_int("POKER_EQUITY_CONCURRENCY", 2)))
+        self.poker_strategy = None
+        if np is not None:
+            self.poker_strategy = PokerStrategyTable.load(os.getenv("POKER_STRATEGY_PATH", "data/poker_strategy.bin"))
 
     def _load_persona_lines(self):
         if not os.path.exists(self.persona_path):
@@ -255,20 +1581,158 @@ class Games(commands.Cog):
             return {}
 
     def _save_poker_profiles(self):
+        self._profile_updates = 0
+        self._profiles_flushed_at = time.monotonic()
         try:
             with open(self.poker_profile_path, "w", encoding="utf-8") as fh:
                 json.dump(self.poker_profiles, fh)
         except OSError:
             pass
 
-    def _record_player_action(self, user_id, action):
+    def _flush_stale_poker_profiles(self):
+        """Save profile updates older than the flush interval that no later update has flushed."""
+        if self._profile_updates and time.monotonic() - self._profiles_flushed_at >= self.PROFILE_FLUSH_INTERVAL:
+            self._save_poker_profiles()
+
+    def _mark_poker_profiles_dirty(self):
+        self._profile_updates += 1
+        elapsed = time.monotonic() - self._profiles_flushed_at
+        if self._profile_updates >= self.PROFILE_FLUSH_UPDATES or elapsed >= self.PROFILE_FLUSH_INTERVAL:
+            self._save_poker_profiles()
+
+    def _player_stats(self, user_id):
+        profile = self.poker_profiles.setdefault(str(user_id), {"actions": 0, "allin": 0})
+        stats = profile.get("stats")
+        if not isinstance(stats, dict):
+            stats = {}
+            profile["stats"] = stats
+        for field in self.PLAYER_STAT_FIELDS:
+            stats.setdefault(field, 0)
+        return stats
+
+    def _record_player_action(self, user_id, action, game=None, to_call=0):
         profile = self.poker_profiles.get(str(user_id), {"actions": 0, "allin": 0})
         profile["actions"] = profile.get("actions", 0) + 1
         if action in ("allin", "all-in"):
             profile["allin"] = profile.get("allin", 0) + 1
         profile["last_action_ts"] = int(time.time())
         self.poker_profiles[str(user_id)] = profile
-        self._save_poker_profiles()
+        if game is not None:
+            stats = self._player_stats(user_id)
+            flags = game.setdefault("player_flags", {}).setdefault(str(user_id), {})
+            aggressive = action in ("bet", "raise", "allin", "all-in")
+            if game.get("stage") == "preflop" and (aggressive or action == "call"):
+                if not flags.get("vpip"):
+                    flags["vpip"] = True
+                    stats["vpip"] += 1
+                if aggressive and not flags.get("pfr"):
+                    flags["pfr"] = True
+                    stats["pfr"] += 1
+            if aggressive:
+                stats["aggressive"] += 1
+            elif action == "call":
+                stats["calls"] += 1
+            if to_call > 0:
+                stats["faced_bets"] += 1
+                if action == "fold":
+                    stats["folds_to_bet"] += 1
+            if not self._is_pvp(game) and user_id == game.get("user_id"):
+                self._update_opponent_range(game, action)
+        self._mark_poker_profiles_dirty()
+
+    def _new_opponent_range(self, game):
+        if not self.range_bot_enabled:
+            return None
+        tendencies = self._player_tendencies(game.get("user_id"))
+        bluff_rate = 0.15
+        if tendencies["hands"] >= 10:
+            bluff_rate = 0.05 + 0.25 * min(tendencies["aggression"], 4.0) / 4.0
+        dead_cards = [encode_card(card) for card in game.get("bot_cards", [])]
+        return OpponentRangeModel(dead_cards=dead_cards, bluff_rate=bluff_rate)
+
+    def _update_opponent_range(self, game, action):
+        model = game.get("opponent_range")
+        if model is None:
+            return
+        model.observe(action, [encode_card(card) for card in game.get("community", [])])
+
+    def _record_hand_stats(self, game, winner):
+        seats = [("user", game.get("user_id"))]
+        if self._is_pvp(game):
+            seats.append(("bot", game.get("opponent_id")))
+        showdown = game.get("stage") == "showdown"
+        for seat, user_id in seats:
+            if not user_id:
+                continue
+            stats = self._player_stats(user_id)
+            stats["hands"] += 1
+            if showdown:
+                stats["showdowns"] += 1
+                if winner == seat:
+                    stats["showdown_wins"] += 1
+        self._mark_poker_profiles_dirty()
+
+    def _player_tendencies(self, user_id):
+        profile = self.poker_profiles.get(str(user_id)) or {}
+        stats = profile.get("stats") or {}
+        hands = stats.get("hands", 0)
+        calls = stats.get("calls", 0)
+        aggressive = stats.get("aggressive", 0)
+        faced_bets = stats.get("faced_bets", 0)
+        showdowns = stats.get("showdowns", 0)
+        return {
+            "hands": hands,
+            "vpip": stats.get("vpip", 0) / hands if hands else 0.0,
+            "pfr": stats.get("pfr", 0) / hands if hands else 0.0,
+            "aggression": aggressive / calls if calls else float(aggressive),
+            "fold_to_bet": stats.get("folds_to_bet", 0) / faced_bets if faced_bets else 0.0,
+            "showdown_win_rate": stats.get("showdown_wins", 0) / showdowns if showdowns else 0.0,
+        }
+
+    def _log_hand_action(self, game, actor, action, amount=0):
+        started = game.get("hand_started") or time.time()
+        offset_ms = max(0, int((time.time() - started) * 1000))
+        entry = (offset_ms, actor, game.get("stage", "preflop"), action, max(0, int(amount)))
+        game.setdefault("actions", []).append(entry)
+
+    def _record_hand_history(self, game, winner):
+        pot = game.get("pot", 0)
+        user_total = game.get("user_total_bet", 0)
+        bot_total = game.get("bot_total_bet", 0)
+        user_net = 0
+        opponent_net = 0
+        if self._is_pvp(game):
+            if winner == "user":
+                user_net, opponent_net = pot - user_total, -bot_total
+            elif winner == "bot":
+                user_net, opponent_net = -user_total, pot - bot_total
+            elif winner == "split":
+                user_net, opponent_net = pot // 2 - user_total, pot - pot // 2 - bot_total
+        elif winner == "user":
+            user_net = user_total
+        elif winner == "bot":
+            user_net = -user_total
+        started = game.get("hand_started") or time.time()
+        record = HandRecord(
+            started_at=int(started),
+            duration_ms=max(0, int((time.time() - started) * 1000)),
+            user_id=game["user_id"],
+            opponent_id=game.get("opponent_id") or 0,
+            min_bet=game.get("min_bet", 0),
+            pot=pot,
+            user_total_bet=user_total,
+            bot_total_bet=bot_total,
+            user_net=user_net,
+            opponent_net=opponent_net,
+            winner=winner or "none",
+            end_stage=game.get("stage", "preflop"),
+            sb_player=game.get("sb_player", "user"),
+            user_cards=game.get("user_cards", []),
+            bot_cards=game.get("bot_cards", []),
+            community=game.get("community", []),
+            actions=game.get("actions", []),
+        )
+        return self.hand_history.append(record)
 
     def _adjust_fold_chance(self, game, fold_chance):
         user_id = game.get("user_id")
@@ -280,10 +1744,98 @@ class Games(commands.Cog):
             return fold_chance
         allin_rate = profile.get("allin", 0) / max(actions, 1)
         reduction = min(0.4, allin_rate * 0.5)
+        tendencies = self._player_tendencies(user_id)
+        read = 1.0
+        if tendencies["hands"] >= 10:
+            # Loose, aggressive players bet light and get called down more;
+            # tight, passive players usually have it when they bet.
+            looseness = tendencies["vpip"] - 0.35
+            aggression = min(tendencies["aggression"], 4.0) / 4.0 - 0.4
+            read = max(0.5, min(1.5, 1 - 0.5 * (looseness + aggression)))
         jitter = random.uniform(0.85, 1.15)
-        adjusted = fold_chance * (1 - reduction) * jitter
+        adjusted = fold_chance * (1 - reduction) * read * jitter
         return max(0.01, min(0.95, adjusted))
 
+    def _bot_bet_chance(self, game):
+        tendencies = self._player_tendencies(game.get("user_id"))
+        chance = 0.35
+        if tendencies["hands"] >= 10:
+            # Bet more often into players who give up to bets.
+            chance = max(0.2, min(0.6, 0.35 * (0.6 + tendencies["fold_to_bet"])))
+        equity = game.get("bot_equity")
+        if equity is not None:
+            chance *= 0.5 + equity
+        return max(0.05, min(0.8, chance))
+
+    def _strategy_history(self, game):
+        """The hand's betting so far as a ``BettingAbstraction`` history string.
+
+        None outside the four betting streets (e.g. at showdown).
+        """
+        stages = {"preflop": 0, "flop": 1, "turn": 2, "river": 3}
+        current = stages.get(game.get("stage", "preflop"))
+        if current is None:
+            return None
+        streets = [""] * (current + 1)
+        max_bet = game.get("max_bet", 0)
+        stage = None
+        round_bets = {}
+        for _, actor, entry_stage, action, amount in game.get("actions", []):
+            if entry_stage != stage:
+                stage = entry_stage
+                round_bets = {}
+            round_bets[actor] = round_bets.get(actor, 0) + amount
+            street = stages.get(entry_stage)
+            if street is None or street > current or action in ("small_blind", "big_blind"):
+                continue
+            if action in ("check", "call"):
+                token = "c"
+            elif action == "fold":
+                token = "f"
+            elif action == "allin" or (max_bet and round_bets[actor] >= max_bet):
+                token = "a"
+            else:
+                token = "r"
+            streets[street] += token
+        return "/".join(streets)
+
+    def _strategy_bucket(self, game, buckets):
+        stage = game.get("stage")
+        cached = game.get("strategy_bucket")
+        if cached and cached[0] == stage:
+            return cached[1]
+        board = [encode_card(card) for card in game.get("community", [])]
+        hole = [encode_card(card) for card in game.get("bot_cards", [])]
+        bucket = int(strength_buckets(board, buckets)[combo_index(*hole)])
+        game["strategy_bucket"] = (stage, bucket)
+        return bucket
+
+    def _bot_strategy_action(self, game):
+        """Solver action for the bot's spot, or None to fall back to the heuristics."""
+        table = self.poker_strategy
+        if table is None:
+            return None
+        history = self._strategy_history(game)
+        if history is None:
+            return None
+        seat = 0 if game.get("sb_player") == "bot" else 1
+        bucket = self._strategy_bucket(game, table.buckets)
+        return table.sample(history, bucket, seat)
+
+    def _bot_chooses(self, plan, action, chance):
+        if plan is not None:
+            return plan == action
+        return random.random() < chance
+
+    def _equity_fold_chance(self, game, to_call):
+        # Fold when equity against the player's modelled range is short of
+        # the pot odds; the logistic keeps close spots mixed.
+        equity = game["bot_equity"]
+        pot_odds = to_call / max(1, game.get("pot", 0) + to_call)
+        fold_chance = 1 / (1 + math.exp(12 * (equity - pot_odds)))
+        fold_chance *= random.uniform(0.85, 1.15)
+        return max(0.01, min(0.95, fold_chance))
+
     def _pick_persona_line(self, category, *, game=None):
         lines = self.persona_lines.get(category, [])
         personality = None
@@ -337,7 +1889,7 @@ class Games(commands.Cog):
         except (discord.Forbidden, discord.HTTPException):
             for text, delay in segments:
                 if delay:
-                    await asyncio.sleep(delay)
+                    await self._sleep(delay)
                 embed = discord.Embed(description=text, color=discord.Color.blurple())
                 if name:
                     embed.set_author(name=name, icon_url=avatar_url)
@@ -346,12 +1898,12 @@ class Games(commands.Cog):
         try:
             for text, delay in segments:
                 if delay:
-                    await asyncio.sleep(delay)
+                    await self._sleep(delay)
                 await webhook.send(content=text, username=name or "Poker", avatar_url=avatar_url)
         except discord.HTTPException:
             for text, delay in segments:
                 if delay:
-                    await asyncio.sleep(delay)
+                    await self._sleep(delay)
                 embed = discord.Embed(description=text, color=discord.Color.blurple())
                 if name:
                     embed.set_author(name=name, icon_url=avatar_url)
@@ -526,6 +2078,154 @@ class Games(commands.Cog):
                 best = hand
         return best
 
+    @staticmethod
+    def _straight_high_bits(mask):
+        extended = (mask << 1) | ((mask >> 12) & 1)
+        for high in range(12, 2, -1):
+            window = 0b11111 << (high - 3)
+            if extended & window == window:
+                return high
+        return None
+
+    def _category_from_counts(self, rank_counts, suit_masks):
+        """Hand category for any number of cards, from rank counts and per-suit rank masks."""
+        for mask in suit_masks:
+            if bin(mask).count("1") >= 5:
+                high = self._straight_high_bits(mask)
+                if high is not None:
+                    return 9 if high == 12 else 8
+        counts = sorted(rank_counts, reverse=True)
+        if counts[0] >= 4:
+            return 7
+        if counts[0] == 3 and counts[1] >= 2:
+            return 6
+        if any(bin(mask).count("1") >= 5 for mask in suit_masks):
+            return 5
+        rank_mask = sum(1 << rank for rank, count in enumerate(rank_counts) if count)
+        if self._straight_high_bits(rank_mask) is not None:
+            return 4
+        if counts[0] == 3:
+            return 3
+        if counts[0] == 2 and counts[1] == 2:
+            return 2
+        if counts[0] == 2:
+            return 1
+        return 0
+
+    def _hand_draws(self, state, board):
+        # An out improves the seat's category beyond what the card does for
+        # the board alone, so cards that just pair the board don't count.
+        ranks = state["ranks"]
+        suits = state["suits"]
+        category = state["category"]
+        known = set(state["cards"])
+        outs = 0
+        for rank, rank_char in enumerate(self.RANK_ORDER):
+            for suit, suit_char in enumerate(CARD_SUITS):
+                if rank_char + suit_char in known:
+                    continue
+                improved = self._category_with(ranks, suits, rank, suit)
+                if improved > category and improved > self._category_with(board["ranks"], board["suits"], rank, suit):
+                    outs += 1
+        draws = []
+        if category < 5 and any(bin(mask).count("1") == 4 for mask in suits):
+            draws.append("flush draw")
+        if category < 4:
+            rank_mask = sum(1 << rank for rank, count in enumerate(ranks) if count)
+            completing = sum(
+                1
+                for rank in range(13)
+                if not rank_mask & (1 << rank) and self._straight_high_bits(rank_mask | (1 << rank)) is not None
+            )
+            if completing >= 2:
+                draws.append("open-ended straight draw")
+            elif completing == 1:
+                draws.append("gutshot")
+        return draws, outs
+
+    def _category_with(self, ranks, suits, rank, suit):
+        previous_mask = suits[suit]
+        ranks[rank] += 1
+        suits[suit] = previous_mask | (1 << rank)
+        category = self._category_from_counts(ranks, suits)
+        ranks[rank] -= 1
+        suits[suit] = previous_mask
+        return category
+
+    def _update_hand_strength(self, game, new_cards=()):
+        """Fold newly dealt community cards into each seat's cached hand strength.
+
+        Each seat keeps rank counts and per-suit rank masks, so a deal only
+        adds the new cards and re-reads the category. The best five-card hand
+        and the draws/outs are worked out when first asked for on a street.
+        """
+        strength = game.setdefault("hand_strength", {})
+        board_complete = len(game.get("community", [])) >= 5
+        for seat in ("board", "user", "bot"):
+            state = strength.get(seat)
+            if state is None:
+                state = {"ranks": [0] * 13, "suits": [0] * 4, "cards": [], "best": None}
+                strength[seat] = state
+                hole = [] if seat == "board" else game[f"{seat}_cards"]
+                added = hole + game.get("community", [])
+            else:
+                added = list(new_cards)
+            for card in added:
+                rank = self.RANK_ORDER.index(card[0])
+                state["ranks"][rank] += 1
+                state["suits"][CARD_SUITS.index(card[1])] |= 1 << rank
+            state["cards"] = state["cards"] + added
+            if seat == "board":
+                continue
+            state["best"] = None
+            state["category"] = self._category_from_counts(state["ranks"], state["suits"])
+            if board_complete:
+                state["draws"], state["outs"] = [], 0
+            else:
+                state["draws"] = state["outs"] = None
+
+    def _hand_strength(self, game, seat):
+        state = game.get("hand_strength", {}).get(seat)
+        expected = len(game[f"{seat}_cards"]) + len(game.get("community", []))
+        if state is None or len(state["cards"]) != expected:
+            game.pop("hand_strength", None)
+            self._update_hand_strength(game)
+            state = game["hand_strength"][seat]
+        return state
+
+    def _seat_draws(self, game, seat):
+        """``(draws, outs)`` for ``seat`` on the current street, computed once per street."""
+        state = self._hand_strength(game, seat)
+        if state["draws"] is None:
+            state["draws"], state["outs"] = self._hand_draws(state, game["hand_strength"]["board"])
+        return state["draws"], state["outs"]
+
+    def _seat_best_hand(self, game, seat):
+        state = self._hand_strength(game, seat)
+        if state["best"] is None:
+            state["best"] = self._best_hand(game[f"{seat}_cards"] + game.get("community", []))
+        return state["best"]
+
+    def _table_snapshot(self, game, viewer=None):
+        showdown = game.get("stage") == "showdown"
+        user_cards = tuple(game["user_cards"]) if showdown or viewer == "user" else None
+        opponent_cards = tuple(game["bot_cards"]) if showdown or viewer == "bot" else None
+        return (
+            self._poker_stage_label(game.get("stage")),
+            tuple(game.get("community", [])),
+            user_cards,
+            opponent_cards,
+            game.get("pot", 0),
+            game.get("user_total_bet", 0),
+            game.get("bot_total_bet", 0),
+            self._player_display_name(game, "user") or "Player",
+            self._player_display_name(game, "bot") or "Bot",
+        )
+
+    async def _render_table(self, game, viewer=None):
+        png = await self.table_renderer.render(self._table_snapshot(game, viewer))
+        return discord.File(io.BytesIO(png), filename="poker-table.png")
+
     def _poker_stage_label(self, stage):
         return {
             "preflop": "Pre-Flop",
@@ -620,18 +2320,26 @@ class Games(commands.Cog):
 
     def _bot_allin_chance(self, game):
         personality = game.get("bot_personality", "passive")
-        return {
+        chance = {
             "aggressive": 0.35,
             "passive": 0.15,
             "coward": 0.05,
         }.get(personality, 0.15)
+        equity = game.get("bot_equity")
+        if equity is not None:
+            chance *= max(0.2, min(2.0, 1 + (equity - 0.6) * 5))
+        return min(0.9, chance)
 
     def _amount_to_call(self, game, player):
         if player == "user":
             return max(0, game.get("current_bet", 0) - game.get("user_round_bet", 0))
         return max(0, game.get("current_bet", 0) - game.get("bot_round_bet", 0))
 
-    def _sync_poker_view(self, game):
+    def _sync_poker_view(self, game, *, checkpoint=True):
+        # Every state transition passes through here, so it doubles as the
+        # checkpoint hook for crash recovery.
+        if checkpoint and self.poker_games.is_active(game):
+            self._checkpoint_poker_game(game)
         view = game.get("view")
         if not view:
             return
@@ -649,6 +2357,65 @@ class Games(commands.Cog):
         if not turn_locked:
             view.bet.disabled = game.get("raise_count", 0) >= game.get("max_raises", 10)
 
+    def _checkpoint_poker_game(self, game, *, now=False):
+        """Checkpoint ``game`` on the next debounced write, or on the spot with ``now``.
+
+        Handlers that move chips pass ``now`` right next to the currency
+        change, so a checkpoint is never older than the currency file; only
+        cosmetic changes wait for the debounce.
+        """
+        if now:
+            self._write_poker_checkpoint_now(game["user_id"], game)
+            return
+        self._checkpoint_dirty[game["user_id"]] = game
+        self._schedule_checkpoint_flush()
+
+    def _discard_poker_checkpoint(self, user_id, *, now=False):
+        # Queued behind any pending write for the same player, so a late write can't resurrect the hand.
+        if now:
+            self._write_poker_checkpoint_now(user_id, None)
+            return
+        self._checkpoint_dirty[user_id] = None
+        self._schedule_checkpoint_flush()
+
+    def _write_poker_checkpoint_now(self, user_id, game):
+        # One small file, written on the loop like the currency file it has to keep up with.
+        self._checkpoint_dirty.pop(user_id, None)
+        payload = None
+        if game is not None:
+            payload = self.poker_checkpoints.encode(game)
+            if payload is None:
+                return
+        self.poker_checkpoints.write_many([(user_id, payload, self.poker_checkpoints.stamp())])
+
+    def _schedule_checkpoint_flush(self):
+        if self._checkpoint_task is None or self._checkpoint_task.done():
+            self._checkpoint_task = asyncio.create_task(self._flush_poker_checkpoints_later())
+
+    async def _flush_poker_checkpoints_later(self):
+        while self._checkpoint_dirty:
+            await asyncio.sleep(self.poker_checkpoint_delay)
+            await self._write_poker_checkpoints()
+
+    def _take_poker_checkpoints(self):
+        dirty, self._checkpoint_dirty = self._checkpoint_dirty, {}
+        writes = []
+        for user_id, game in dirty.items():
+            if game is None:
+                writes.append((user_id, None, self.poker_checkpoints.stamp()))
+                continue
+            payload = self.poker_checkpoints.encode(game)
+            if payload is not None:
+                writes.append((user_id, payload, self.poker_checkpoints.stamp()))
+        return writes
+
+    async def _write_poker_checkpoints(self):
+        """Write every queued checkpoint now; batches are written in order, off the event loop."""
+        async with self._checkpoint_lock:
+            writes = self._take_poker_checkpoints()
+            if writes:
+                await asyncio.to_thread(self.poker_checkpoints.write_many, writes)
+
     def _record_bot_call_round(self, game, allow_partial=False):
         amount_to_call = self._amount_to_call(game, "bot")
         if amount_to_call <= 0:
@@ -695,6 +2462,10 @@ class Games(commands.Cog):
         else:
             game["turn"] = game.get("bb_player", "bot")
 
+    async def _sleep(self, delay):
+        # Single pause point so scripts/poker_load.py can swap in a virtual clock.
+        await asyncio.sleep(delay)
+
     async def _bot_think(self, game):
         multipliers = {
             "aggressive": 0.8,
@@ -703,7 +2474,29 @@ class Games(commands.Cog):
         }
         multiplier = multipliers.get(game.get("bot_personality", "passive"), 1.0)
         delay = random.uniform(1.2, 2.6) * multiplier
-        await asyncio.sleep(delay)
+        model = game.get("opponent_range")
+        job = None
+        if model is not None:
+            if self._equity_slots.locked():
+                # Every slot is busy; decide on the heuristics this turn.
+                game["bot_equity"] = None
+            else:
+                # Sample runouts off the event loop while the bot "thinks". The
+                # worker gets its own copy of the range, since the player's next
+                # action updates it on the loop.
+                await self._equity_slots.acquire()
+                hero = [encode_card(card) for card in game.get("bot_cards", [])]
+                board = [encode_card(card) for card in game.get("community", [])]
+                job = asyncio.create_task(self._bot_equity(model, hero, board, model.weights.copy()))
+        await self._sleep(delay)
+        if job is not None:
+            game["bot_equity"] = await job
+
+    async def _bot_equity(self, model, hero, board, weights):
+        try:
+            return await asyncio.to_thread(model.equity, hero, board, weights=weights)
+        finally:
+            self._equity_slots.release()
 
     async def _update_interaction(self, interaction, embed, view=None):
         if interaction.response.is_done():
@@ -730,8 +2523,8 @@ class Games(commands.Cog):
 
     async def _resolve_showdown(self, interaction, game):
         game["stage"] = "showdown"
-        user_best = self._best_hand(game["user_cards"] + game["community"])
-        bot_best = self._best_hand(game["bot_cards"] + game["community"])
+        user_best = self._seat_best_hand(game, "user")
+        bot_best = self._seat_best_hand(game, "bot")
         user_wins = self._compare_hands(user_best, bot_best)
         user_id = interaction.user.id if interaction else game["ctx"].author.id
         persona_name = game.get("bot_shadow_name", "Bot")
@@ -779,6 +2572,12 @@ class Games(commands.Cog):
             value=self.CATEGORY_NAMES[bot_best[0]],
             inline=True,
         )
+        if user_wins:
+            winner = "user"
+        elif user_best == bot_best:
+            winner = "split"
+        else:
+            winner = "bot"
         persona_line = None
         if not self._is_pvp(game):
             category = None
@@ -789,7 +2588,9 @@ class Games(commands.Cog):
             else:
                 category = "tie"
             persona_line = self._pick_persona_line(category, game=game) if category else None
-        await self._finish_poker(interaction, game, embed)
+        await self._finish_poker(interaction, game, embed, winner=winner)
+        if self.showdown_images:
+            await game["ctx"].send(file=await self._render_table(game))
         if persona_line:
             await self._send_persona_message(game["ctx"], persona_name, persona_avatar, persona_line, game=game)
 
@@ -820,7 +2621,7 @@ class Games(commands.Cog):
             await self._resolve_showdown(interaction, game)
             return True
         if delay_on_advance:
-            await asyncio.sleep(delay_on_advance)
+            await self._sleep(delay_on_advance)
         footer = await self._advance_stage(game)
         if game.get("turn") == "bot" and not self._is_pvp(game):
             game["bot_status"] = "Bot is deciding..."
@@ -836,16 +2637,16 @@ class Games(commands.Cog):
             await self._bot_take_turn(interaction, game)
         return True
 
-    async def _finish_poker(self, interaction, game, embed, message_text=None):
+    async def _finish_poker(self, interaction, game, embed, message_text=None, *, winner=None):
+        self._record_hand_history(game, winner)
+        self._record_hand_stats(game, winner)
         view = game.get("view")
         if view:
             for item in view.children:
                 item.disabled = True
-        user_id = interaction.user.id if interaction else game["ctx"].author.id
-        self.poker_games.pop(user_id, None)
-        opponent_id = game.get("opponent_id")
-        if opponent_id:
-            self.poker_games.pop(opponent_id, None)
+            view.stop()
+        self.poker_games.remove(game)
+        self._discard_poker_checkpoint(game["user_id"], now=True)
         if interaction:
             await self._update_interaction(interaction, embed, view=view)
             if message_text:
@@ -856,16 +2657,22 @@ class Games(commands.Cog):
                 await game["ctx"].send(message_text)
 
     def _deal_flop(self, game):
-        game["community"].extend([game["deck"].pop() for _ in range(3)])
+        flop = [game["deck"].pop() for _ in range(3)]
+        game["community"].extend(flop)
         game["stage"] = "flop"
+        self._update_hand_strength(game, flop)
 
     def _deal_turn(self, game):
-        game["community"].append(game["deck"].pop())
+        card = game["deck"].pop()
+        game["community"].append(card)
         game["stage"] = "turn"
+        self._update_hand_strength(game, [card])
 
     def _deal_river(self, game):
-        game["community"].append(game["deck"].pop())
+        card = game["deck"].pop()
+        game["community"].append(card)
         game["stage"] = "river"
+        self._update_hand_strength(game, [card])
 
     def _deal_to_river(self, game):
         while game["stage"] != "river":
@@ -885,7 +2692,16 @@ class Games(commands.Cog):
         }
         base = base_odds.get(game.get("stage"), 0.15)
         variance = random.uniform(0.5, 1.5)
-        adjusted = max(0.0, min(1.0, base * variance))
+        strength = self._hand_strength(game, "bot")
+        if strength["category"] >= 2:
+            hand_factor = 0.4
+        elif strength["category"] == 1:
+            hand_factor = 0.8
+        elif self._seat_draws(game, "bot")[1] >= 8:
+            hand_factor = 0.7
+        else:
+            hand_factor = 1.3
+        adjusted = max(0.0, min(1.0, base * variance * hand_factor))
         game["fold_chance"] = adjusted
         return adjusted
 
@@ -907,6 +2723,25 @@ class Games(commands.Cog):
             return "River dealt. Your move."
         return None
 
+    def _bot_min_raise(self, game):
+        min_bet = game.get("min_bet", 0)
+        current_bet = game.get("current_bet", 0)
+        target_bet = current_bet + min_bet if current_bet > 0 else min_bet
+        max_bet = game.get("max_bet", 0)
+        if max_bet and target_bet > max_bet:
+            target_bet = max_bet
+        contribution = max(0, target_bet - game.get("bot_round_bet", 0))
+        amount = min(contribution, game.get("bot_bankroll", 0))
+        contributed = self._record_bot_raise(game, amount) if amount > 0 else 0
+        if contributed > 0:
+            game["current_bet"] = game.get("bot_round_bet", game.get("current_bet", 0))
+            game["raise_count"] = game.get("raise_count", 0) + 1
+            game["awaiting_call"] = "user"
+            action = "raises" if current_bet > 0 else "bets"
+            game["bot_status"] = f"Bot {action} {contributed}."
+            self._log_hand_action(game, "bot", "raise" if current_bet > 0 else "bet", contributed)
+        return contributed
+
     async def _bot_take_turn(self, interaction, game):
         if self._is_pvp(game):
             game["locked"] = False
@@ -916,6 +2751,7 @@ class Games(commands.Cog):
             await self._maybe_finish_round(interaction, game, delay_on_advance=1.0)
             return
         game["locked"] = True
+        game["locked_at"] = time.monotonic()
         game["bot_status"] = "Bot is deciding..."
         thinking_embed = self._poker_status_embed(game["ctx"], game, footer_text=self._turn_prompt(game, "bot"))
         self._sync_poker_view(game)
@@ -925,6 +2761,7 @@ class Games(commands.Cog):
             await self._update_game_message(game, thinking_embed)
         await self._bot_think(game)
         to_call = self._amount_to_call(game, "bot")
+        plan = self._bot_strategy_action(game)
 
         if game.get("bot_all_in"):
             game["bot_acted"] = True
@@ -934,20 +2771,26 @@ class Games(commands.Cog):
             max_bet = game.get("max_bet", 0)
             cap_call = max_bet and game.get("current_bet", 0) >= max_bet
             if not cap_call:
-                fold_chance = game.get("fold_chance")
-                if fold_chance is None:
-                    fold_chance = self._refresh_fold_chance(game)
-                fold_chance = self._adjust_fold_chance(game, fold_chance)
-                if random.random() < fold_chance:
+                if plan is not None:
+                    fold_chance = 0.0
+                elif game.get("bot_equity") is not None:
+                    fold_chance = self._equity_fold_chance(game, to_call)
+                else:
+                    fold_chance = game.get("fold_chance")
+                    if fold_chance is None:
+                        fold_chance = self._refresh_fold_chance(game)
+                    fold_chance = self._adjust_fold_chance(game, fold_chance)
+                if self._bot_chooses(plan, "fold", fold_chance):
                     user_id = interaction.user.id if interaction else game["ctx"].author.id
                     payout = game["user_total_bet"] * 2
                     self.currency.adjust(user_id, payout)
                     game["bot_status"] = "Bot folds."
+                    self._log_hand_action(game, "bot", "fold")
                     line = self._pick_persona_line("fold", game=game)
                     persona_name = game.get("bot_shadow_name")
                     persona_avatar = game.get("bot_shadow_avatar")
                     embed = self._poker_status_embed(game["ctx"], game, footer_text=f"You win RM {game['user_total_bet']}!")
-                    await self._finish_poker(interaction, game, embed)
+                    await self._finish_poker(interaction, game, embed, winner="user")
                     await self._send_persona_message(game["ctx"], persona_name, persona_avatar, line, game=game)
                     return
             if cap_call and game.get("bot_bankroll", 0) > 0:
@@ -962,6 +2805,7 @@ class Games(commands.Cog):
                     game["bot_allin_capped"] = True
                     game["bot_status"] = "Bot goes all-in."
                     game["bot_acted"] = True
+                    self._log_hand_action(game, "bot", "allin", contributed)
                     bot_shoved = True
             allow_partial = cap_call
             if to_call > game.get("bot_bankroll", 0):
@@ -971,16 +2815,17 @@ class Games(commands.Cog):
                     payout = game["user_total_bet"] * 2
                     self.currency.adjust(user_id, payout)
                     game["bot_status"] = "Bot folds."
+                    self._log_hand_action(game, "bot", "fold")
                     line = self._pick_persona_line("fold", game=game)
                     persona_name = game.get("bot_shadow_name")
                     persona_avatar = game.get("bot_shadow_avatar")
                     embed = self._poker_status_embed(game["ctx"], game, footer_text=f"You win RM {game['user_total_bet']}!")
-                    await self._finish_poker(interaction, game, embed)
+                    await self._finish_poker(interaction, game, embed, winner="user")
                     await self._send_persona_message(game["ctx"], persona_name, persona_avatar, line, game=game)
                     return
             bet_allowed = game.get("raise_count", 0) < game.get("max_raises", 10)
             max_bet = game.get("max_bet", 0)
-            if bet_allowed and max_bet and random.random() < self._bot_allin_chance(game):
+            if bet_allowed and max_bet and self._bot_chooses(plan, "allin", self._bot_allin_chance(game)):
                 target_total = max_bet
                 contribution = max(0, target_total - game.get("bot_round_bet", 0))
                 amount = min(contribution, game.get("bot_bankroll", 0))
@@ -992,32 +2837,40 @@ class Games(commands.Cog):
                     if max_bet and game.get("bot_round_bet", 0) >= max_bet and game.get("bot_bankroll", 0) > 0:
                         game["bot_allin_capped"] = True
                     game["bot_status"] = "Bot goes all-in."
+                    game["bot_acted"] = True
+                    self._log_hand_action(game, "bot", "allin", contributed)
+                    bot_shoved = True
+            if not bot_shoved and plan == "raise" and bet_allowed and game.get("bot_bankroll", 0) > to_call:
+                if self._bot_min_raise(game):
                     game["bot_acted"] = True
                     bot_shoved = True
             if bot_shoved:
                 pass
             else:
+                total_before = game.get("bot_total_bet", 0)
                 success, all_in = self._record_bot_call_round(game, allow_partial=allow_partial)
                 if not success:
                     user_id = interaction.user.id if interaction else game["ctx"].author.id
                     payout = game["user_total_bet"] * 2
                     self.currency.adjust(user_id, payout)
                     game["bot_status"] = "Bot folds."
+                    self._log_hand_action(game, "bot", "fold")
                     line = self._pick_persona_line("fold", game=game)
                     persona_name = game.get("bot_shadow_name")
                     persona_avatar = game.get("bot_shadow_avatar")
                     embed = self._poker_status_embed(game["ctx"], game, footer_text=f"You win RM {game['user_total_bet']}!")
-                    await self._finish_poker(interaction, game, embed)
+                    await self._finish_poker(interaction, game, embed, winner="user")
                     await self._send_persona_message(game["ctx"], persona_name, persona_avatar, line, game=game)
                     return
                 game["bot_status"] = "Bot is all-in." if all_in else "Bot calls."
+                self._log_hand_action(game, "bot", "call", game.get("bot_total_bet", 0) - total_before)
                 game["bot_acted"] = True
                 game["awaiting_call"] = None
         else:
             bot_shoved = False
             bet_allowed = game.get("raise_count", 0) < game.get("max_raises", 10)
             max_bet = game.get("max_bet", 0)
-            if bet_allowed and max_bet and random.random() < self._bot_allin_chance(game):
+            if bet_allowed and max_bet and self._bot_chooses(plan, "allin", self._bot_allin_chance(game)):
                 target_total = max_bet
                 contribution = max(0, target_total - game.get("bot_round_bet", 0))
                 amount = min(contribution, game.get("bot_bankroll", 0))
@@ -1029,29 +2882,21 @@ class Games(commands.Cog):
                     if max_bet and game.get("bot_round_bet", 0) >= max_bet and game.get("bot_bankroll", 0) > 0:
                         game["bot_allin_capped"] = True
                     game["bot_status"] = "Bot goes all-in."
+                    self._log_hand_action(game, "bot", "allin", contributed)
                     bot_shoved = True
             if bot_shoved:
                 game["bot_acted"] = True
-            elif bet_allowed and game.get("bot_bankroll", 0) > 0 and random.random() < 0.35:
-                min_bet = game.get("min_bet", 0)
-                current_bet = game.get("current_bet", 0)
-                target_bet = current_bet + min_bet if current_bet > 0 else min_bet
-                max_bet = game.get("max_bet", 0)
-                if max_bet and target_bet > max_bet:
-                    target_bet = max_bet
-                contribution = max(0, target_bet - game.get("bot_round_bet", 0))
-                amount = min(contribution, game.get("bot_bankroll", 0))
-                contributed = self._record_bot_raise(game, amount) if amount > 0 else 0
-                if contributed > 0:
-                    game["current_bet"] = game.get("bot_round_bet", game.get("current_bet", 0))
-                    game["raise_count"] = game.get("raise_count", 0) + 1
-                    game["awaiting_call"] = "user"
-                    action = "raises" if current_bet > 0 else "bets"
-                    game["bot_status"] = f"Bot {action} {contributed}."
-                else:
+            elif (
+                bet_allowed
+                and game.get("bot_bankroll", 0) > 0
+                and self._bot_chooses(plan, "raise", self._bot_bet_chance(game))
+            ):
+                if not self._bot_min_raise(game):
                     game["bot_status"] = "Bot checks."
+                    self._log_hand_action(game, "bot", "check")
             else:
                 game["bot_status"] = "Bot checks."
+                self._log_hand_action(game, "bot", "check")
             game["bot_acted"] = True
 
         game["turn"] = "user"
@@ -1081,6 +2926,8 @@ class Games(commands.Cog):
             await interaction.response.send_message("It's not your turn yet.", ephemeral=True)
             return
         game["locked"] = True
+        game["locked_at"] = time.monotonic()
+        self.poker_games.touch(game)
         view = game.get("view")
         to_call = self._amount_to_call(game, actor)
         effective_action = action
@@ -1100,16 +2947,18 @@ class Games(commands.Cog):
                     self.currency.adjust(winner_id, pot)
                 game["bot_status"] = f"{self._player_display_name(game, actor)} folded."
                 embed = self._poker_status_embed(game["ctx"], game, footer_text=f"{self._player_display_name(game, opponent)} wins RM {pot}!")
-                self._record_player_action(user_id, effective_action)
-                await self._finish_poker(interaction, game, embed)
+                self._record_player_action(user_id, effective_action, game=game, to_call=to_call)
+                self._log_hand_action(game, actor, "fold")
+                await self._finish_poker(interaction, game, embed, winner=opponent)
                 return
             game["bot_status"] = "You folded."
             embed = self._poker_status_embed(game["ctx"], game, footer_text="Hand over.")
             line = self._pick_persona_line("fold", game=game)
             persona_name = game.get("bot_shadow_name")
             persona_avatar = game.get("bot_shadow_avatar")
-            self._record_player_action(user_id, effective_action)
-            await self._finish_poker(interaction, game, embed)
+            self._record_player_action(user_id, effective_action, game=game, to_call=to_call)
+            self._log_hand_action(game, actor, "fold")
+            await self._finish_poker(interaction, game, embed, winner="bot")
             await self._send_persona_message(game["ctx"], persona_name, persona_avatar, line, game=game)
             return
 
@@ -1165,6 +3014,7 @@ class Games(commands.Cog):
             game["raise_count"] = game.get("raise_count", 0) + 1
             game["awaiting_call"] = self._other_player(actor)
             game[f"{actor}_acted"] = True
+            self._log_hand_action(game, actor, effective_action, amount)
             game["turn"] = self._other_player(actor)
             if self._is_pvp(game):
                 action_word = "raises" if effective_action == "raise" else "bets"
@@ -1173,9 +3023,10 @@ class Games(commands.Cog):
                 game["bot_status"] = "Waiting..."
             footer_text = self._turn_prompt(game, game["turn"])
             embed = self._poker_status_embed(game["ctx"], game, footer_text=footer_text)
-            self._sync_poker_view(game)
+            self._sync_poker_view(game, checkpoint=False)
+            self._checkpoint_poker_game(game, now=True)
             await self._update_interaction(interaction, embed, view=view)
-            self._record_player_action(user_id, effective_action)
+            self._record_player_action(user_id, effective_action, game=game, to_call=to_call)
             if not self._is_pvp(game):
                 await self._bot_take_turn(interaction, game)
             else:
@@ -1213,6 +3064,7 @@ class Games(commands.Cog):
             game[round_key] = current_round_bet + amount_to_allin
             game["pot"] = game.get("pot", 0) + amount_to_allin
             game[f"{actor}_all_in"] = amount_to_allin >= current_balance
+            self._log_hand_action(game, actor, "allin", amount_to_allin)
             if game[round_key] > game.get("current_bet", 0):
                 game["current_bet"] = game[round_key]
                 game["raise_count"] = game.get("raise_count", 0) + 1
@@ -1228,9 +3080,10 @@ class Games(commands.Cog):
                 game["bot_status"] = "Waiting..."
             footer_text = self._turn_prompt(game, game["turn"])
             embed = self._poker_status_embed(game["ctx"], game, footer_text=footer_text)
-            self._sync_poker_view(game)
+            self._sync_poker_view(game, checkpoint=False)
+            self._checkpoint_poker_game(game, now=True)
             await self._update_interaction(interaction, embed, view=view)
-            self._record_player_action(user_id, effective_action)
+            self._record_player_action(user_id, effective_action, game=game, to_call=to_call)
             if not self._is_pvp(game):
                 await self._bot_take_turn(interaction, game)
             else:
@@ -1254,10 +3107,13 @@ class Games(commands.Cog):
                 game[total_key] = game.get(total_key, 0) + amount_to_call
                 game[round_key] = game.get(round_key, 0) + amount_to_call
                 game["pot"] = game.get("pot", 0) + amount_to_call
+                self._checkpoint_poker_game(game, now=True)
             game[f"{actor}_acted"] = True
             game["awaiting_call"] = None
+            self._log_hand_action(game, actor, "call", amount_to_call)
         elif effective_action == "check":
             game[f"{actor}_acted"] = True
+            self._log_hand_action(game, actor, "check")
         else:
             await interaction.response.send_message("Invalid action.", ephemeral=True)
             game["locked"] = False
@@ -1269,7 +3125,7 @@ class Games(commands.Cog):
             else:
                 game["bot_status"] = f"Last action: {player_name} checked."
 
-        self._record_player_action(user_id, effective_action)
+        self._record_player_action(user_id, effective_action, game=game, to_call=to_call)
         if game.get("bot_acted") and game.get("user_acted") and not game.get("awaiting_call"):
             finished = await self._maybe_finish_round(interaction, game)
             if finished:
@@ -1288,6 +3144,168 @@ class Games(commands.Cog):
         else:
             game["locked"] = False
 
+    async def _expire_poker_games_loop(self):
+        try:
+            while True:
+                await asyncio.sleep(self.POKER_REAP_INTERVAL)
+                try:
+                    await self._expire_poker_games()
+                except Exception:
+                    # One bad hand must not stop expiry for every other table.
+                    self.logger.exception("Expiring poker hands failed.")
+                self._flush_stale_poker_profiles()
+        except asyncio.CancelledError:
+            pass
+
+    async def _expire_poker_games(self, now=None):
+        now = time.monotonic() if now is None else now
+        expired = []
+        for game in self.poker_games.expired(now):
+            if game.get("locked"):
+                locked_for = now - game.setdefault("locked_at", now)
+                if locked_for < self.POKER_LOCK_GRACE:
+                    # A handler is mid-action (e.g. the bot is thinking); check again later.
+                    self.poker_games.touch(game, timeout=max(self.POKER_REAP_INTERVAL, self.POKER_LOCK_GRACE - locked_for))
+                    continue
+                # A handler that raised can leave the lock set; don't let it pin the hand forever.
+                self.logger.warning(
+                    "Expiring poker hand for %s that stayed locked for %.0f s.",
+                    game.get("user_id"),
+                    locked_for,
+                )
+            self.poker_games.remove(game)
+            self._discard_poker_checkpoint(game["user_id"])
+            expired.append(game)
+        if not expired:
+            return 0
+        refunds = []
+        for game in expired:
+            game_refunds = self._poker_refunds(game)
+            refunds.extend(game_refunds)
+            game["refunded"] = bool(game_refunds)
+            self._record_hand_history(game, None)
+            self._record_hand_stats(game, None)
+        self.currency.adjust_many(refunds)
+        await self._write_poker_checkpoints()
+        await asyncio.gather(
+            *(self._announce_expired_game(game) for game in expired),
+            return_exceptions=True,
+        )
+        return len(expired)
+
+    def _poker_refunds(self, game):
+        refunds = []
+        user_refund = game.get("user_total_bet", 0)
+        if user_refund:
+            refunds.append((game["user_id"], user_refund))
+        opponent_id = game.get("opponent_id")
+        opponent_refund = game.get("bot_total_bet", 0) if opponent_id else 0
+        if opponent_refund:
+            refunds.append((opponent_id, opponent_refund))
+        return refunds
+
+    def _rebuild_opponent_range(self, game):
+        model = self._new_opponent_range(game)
+        if model is None:
+            return None
+        board_sizes = {"preflop": 0, "flop": 3, "turn": 4, "river": 5}
+        community = [encode_card(card) for card in game.get("community", [])]
+        for _, actor, stage, action, _ in game.get("actions", []):
+            if actor == "user":
+                model.observe(action, community[:board_sizes.get(stage, 0)])
+        return model
+
+    def _rehydrate_poker_game(self, state):
+        """Rebuild a checkpointed hand around its existing message, or None if it can't be."""
+        channel = self.bot.get_channel(state.get("channel_id") or 0)
+        message_id = state.get("message_id")
+        if channel is None or not message_id or not hasattr(channel, "get_partial_message"):
+            return None
+        user_id = state["user_id"]
+        guild = getattr(channel, "guild", None)
+        author = (guild.get_member(user_id) if guild else None) or self.bot.get_user(user_id)
+        if author is None or user_id in self.poker_games:
+            return None
+        game = dict(state)
+        game.pop("version", None)
+        game["actions"] = [tuple(entry) for entry in game.get("actions", [])]
+        ctx = RestoredPokerContext(self.bot, channel, author)
+        game["ctx"] = ctx
+        game["message"] = channel.get_partial_message(message_id)
+        game["locked"] = False
+        if not self._is_pvp(game):
+            game["opponent_range"] = self._rebuild_opponent_range(game)
+        view = PokerView(self, ctx, user_id, opponent_id=game.get("opponent_id"))
+        game["view"] = view
+        self.poker_games.add(game, channel_id=channel.id)
+        self.poker_games.attach_message(game, message_id)
+        self._sync_poker_view(game, checkpoint=False)
+        self.bot.add_view(view, message_id=message_id)
+        return game
+
+    async def _restore_poker_games(self):
+        states = await asyncio.to_thread(self.poker_checkpoints.load_all)
+        refunds = []
+        resumed = []
+        for state in states:
+            game = self._rehydrate_poker_game(state)
+            if game is None:
+                # The table can't be shown again; give back what was bet.
+                refunds.extend(self._poker_refunds(state))
+                state["refunded"] = True
+                self._record_hand_history(state, None)
+                self._record_hand_stats(state, None)
+                self._discard_poker_checkpoint(state["user_id"])
+                continue
+            resumed.append(game)
+        if refunds:
+            self.currency.adjust_many(refunds)
+            await self._write_poker_checkpoints()
+        for game in resumed:
+            if game.get("turn") == "bot" and not self._is_pvp(game):
+                asyncio.create_task(self._bot_take_turn(None, game))
+        if states:
+            self.logger.info("Resumed %s poker hand(s), refunded %s.", len(resumed), len(states) - len(resumed))
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        if self._poker_restored:
+            return
+        self._poker_restored = True
+        await self._restore_poker_games()
+
+    async def _announce_expired_game(self, game):
+        view = game.get("view")
+        if view:
+            for item in view.children:
+                item.disabled = True
+            view.stop()
+        message = game.get("message")
+        if not message:
+            return
+        refund_note = "Hand timed out. Bets refunded." if game.get("refunded") else "Hand timed out."
+        embed = self._poker_status_embed(game["ctx"], game, footer_text=refund_note)
+        try:
+            await message.edit(embed=embed, view=view)
+        except discord.HTTPException:
+            pass
+
+    async def cog_load(self):
+        self._poker_reaper_task = asyncio.create_task(self._expire_poker_games_loop())
+
+    def cog_unload(self):
+        if self._poker_reaper_task and not self._poker_reaper_task.done():
+            self._poker_reaper_task.cancel()
+        if self._checkpoint_task and not self._checkpoint_task.done():
+            self._checkpoint_task.cancel()
+        # Final synchronous flush so a reload keeps the latest state of every hand.
+        self.poker_checkpoints.write_many(self._take_poker_checkpoints())
+        for ticket in self.poker_queue.tickets():
+            if ticket.timer:
+                ticket.timer.cancel()
+        if self._profile_updates:
+            self._save_poker_profiles()
+
     @commands.command(aliases=["bal"])
     async def balance(self, ctx):
         bal = self.currency.get_balance(ctx.author.id)
@@ -1417,6 +3435,281 @@ class Games(commands.Cog):
         new_balance = self.currency.adjust(target.id, amount)
         await ctx.send(f"Cheat applied to {target.mention}. New balance: RM {new_balance}.")
 
+    async def _start_poker_hand(self, ctx, min_bet, opponent=None):
+        user_id = ctx.author.id
+        current = self.currency.get_balance(user_id)
+        opponent_balance = self.currency.get_balance(opponent.id) if opponent else None
+        deck = self._build_deck()
+        random.shuffle(deck)
+        user_cards = [deck.pop() for _ in range(2)]
+        bot_cards = [deck.pop() for _ in range(2)]
+        community = []
+        player_balance = current
+        max_bankroll = int(player_balance * 1.5)
+        calculated_bankroll = int(player_balance * random.uniform(0.5, 1.5))
+        if opponent:
+            bot_bankroll = opponent_balance
+            bot_shadow_name = opponent.display_name
+            bot_shadow_avatar = opponent.display_avatar.url
+            bot_personality = None
+        else:
+            bot_bankroll = max(min_bet, min(calculated_bankroll, max_bankroll))
+            bot_shadow_name, bot_shadow_avatar = self._select_bot_shadow(ctx)
+            bot_personality = self._choose_bot_personality()
+            line = self._pick_persona_line("pre_game", game={"bot_personality": bot_personality})
+            await self._send_persona_message(
+                ctx,
+                bot_shadow_name,
+                bot_shadow_avatar,
+                line,
+                game={"bot_personality": bot_personality},
+            )
+            await self._sleep(2)
+        player_avatar = ctx.author.display_avatar.url
+        sb_amount = max(1, min_bet // 2)
+        bb_amount = min_bet
+        sb_player = random.choice(["user", "bot"])
+        bb_player = "bot" if sb_player == "user" else "user"
+        user_total_bet = 0
+        bot_total_bet = 0
+        user_round_bet = 0
+        bot_round_bet = 0
+        pot = 0
+
+        blinds = []
+        if sb_player == "user":
+            blinds.append((user_id, -sb_amount))
+            user_total_bet += sb_amount
+            user_round_bet += sb_amount
+            pot += sb_amount
+        else:
+            sb_contrib = min(sb_amount, bot_bankroll)
+            if opponent:
+                blinds.append((opponent.id, -sb_contrib))
+            bot_bankroll -= sb_contrib
+            bot_total_bet += sb_contrib
+            bot_round_bet += sb_contrib
+            pot += sb_contrib
+
+        if bb_player == "user":
+            blinds.append((user_id, -bb_amount))
+            user_total_bet += bb_amount
+            user_round_bet += bb_amount
+            pot += bb_amount
+        else:
+            bb_contrib = min(bb_amount, bot_bankroll)
+            if opponent:
+                blinds.append((opponent.id, -bb_contrib))
+            bot_bankroll -= bb_contrib
+            bot_total_bet += bb_contrib
+            bot_round_bet += bb_contrib
+            pot += bb_contrib
+
+        game = {
+            "deck": deck,
+            "user_cards": user_cards,
+            "bot_cards": bot_cards,
+            "community": community,
+            "stage": "preflop",
+            "min_bet": min_bet,
+            "max_bet": min_bet * 10,
+            "small_blind": sb_amount,
+            "big_blind": bb_amount,
+            "sb_player": sb_player,
+            "bb_player": bb_player,
+            "user_total_bet": user_total_bet,
+            "bot_total_bet": bot_total_bet,
+            "user_round_bet": user_round_bet,
+            "bot_round_bet": bot_round_bet,
+            "current_bet": bb_amount,
+            "raise_count": 0,
+            "max_raises": 10,
+            "awaiting_call": None,
+            "user_acted": False,
+            "bot_acted": False,
+            "turn": sb_player,
+            "pot": pot,
+            "user_id": user_id,
+            "opponent_id": opponent.id if opponent else None,
+            "player_name": ctx.author.display_name,
+            "opponent_name": opponent.display_name if opponent else None,
+            "opponent_avatar": opponent.display_avatar.url if opponent else None,
+            "bot_bankroll": bot_bankroll,
+            "bot_personality": bot_personality,
+            "bot_all_in": bot_bankroll == 0,
+            "user_all_in": False,
+            "bot_allin_capped": False,
+            "user_allin_capped": False,
+            "bot_status": "Waiting...",
+            "bot_shadow_name": bot_shadow_name,
+            "bot_shadow_avatar": bot_shadow_avatar,
+            "player_avatar": player_avatar,
+            "fold_chance": None,
+            "locked": False,
+            "hand_started": time.time(),
+            "actions": [],
+            "ctx": ctx,
+        }
+        # Re-checked here and registered straight away: the command's own check
+        # runs before several awaits, so concurrent starts could all pass it.
+        if self.poker_games.channel_full(ctx.channel.id):
+            await ctx.send(
+                f"This channel already has {self.poker_games.max_tables_per_channel} poker tables running. "
+                "Wait for one to finish or use another channel."
+            )
+            return
+        self.poker_games.add(game, channel_id=ctx.channel.id)
+        # Checkpoint before the blinds are taken: a crash from here on refunds
+        # them on restart instead of losing them.
+        self._checkpoint_poker_game(game, now=True)
+        self.currency.adjust_many(blinds)
+        game["user_all_in"] = self.currency.get_balance(user_id) == 0
+
+        shadow_name = bot_shadow_name
+        if not opponent and not shadow_name.endswith(" [BOT]"):
+            shadow_name = f"{shadow_name} [BOT]"
+        if opponent:
+            opponent_mention = opponent.mention
+            sb_name = ctx.author.mention if sb_player == "user" else opponent_mention
+            bb_name = ctx.author.mention if bb_player == "user" else opponent_mention
+        else:
+            sb_name = ctx.author.mention if sb_player == "user" else shadow_name
+            bb_name = ctx.author.mention if bb_player == "user" else shadow_name
+        await ctx.send(
+            f"{sb_name} posts a small blind of RM {sb_amount}.\n"
+            f"{bb_name} posts a big blind of RM {bb_amount}. Now dealing cards..."
+        )
+
+        self._log_hand_action(game, sb_player, "small_blind", game[f"{sb_player}_round_bet"])
+        self._log_hand_action(game, bb_player, "big_blind", game[f"{bb_player}_round_bet"])
+        self._update_hand_strength(game)
+        self._refresh_fold_chance(game)
+        if not opponent:
+            game["opponent_range"] = self._new_opponent_range(game)
+        footer = self._turn_prompt(game, game["turn"])
+        embed = self._poker_status_embed(ctx, game, footer_text=footer)
+        view = PokerView(self, ctx, user_id, opponent_id=opponent.id if opponent else None)
+        game["view"] = view
+        self._sync_poker_view(game)
+        message = await ctx.send(embed=embed, view=view)
+        game["message"] = message
+        self.poker_games.attach_message(game, message.id)
+        self._checkpoint_poker_game(game)
+        if game["turn"] == "bot" and not opponent:
+            await self._bot_take_turn(None, game)
+
+    def _queue_ticket_ready(self, ticket):
+        return (
+            ticket.user_id not in self.poker_games
+            and self.currency.get_balance(ticket.user_id) >= ticket.stake
+        )
+
+    def _expire_queue_ticket(self, ticket):
+        if self.poker_queue.get(ticket.user_id) is not ticket:
+            return
+        self.poker_queue.remove(ticket.user_id)
+        self.poker_queue.record_wait(ticket, time.monotonic(), matched=False)
+        asyncio.create_task(self._queue_fallback(ticket))
+
+    async def _queue_fallback(self, ticket):
+        ctx = ticket.ctx
+        if not self._queue_ticket_ready(ticket) or self.poker_games.channel_full(ticket.channel_id):
+            await ctx.send(f"{ctx.author.mention}, no opponent turned up and a bot hand couldn't start. You've left the queue.")
+            return
+        await ctx.send(f"{ctx.author.mention}, no opponent turned up for RM {ticket.stake}. Dealing you in against the bot.")
+        await self._start_poker_hand(ctx, ticket.stake)
+
+    def _queue_wait_text(self, samples):
+        percentiles = self.poker_queue.percentiles(samples)
+        if not percentiles:
+            return "No data yet."
+        return ", ".join(f"p{point} {value:.1f}s" for point, value in percentiles.items())
+
+    async def _poker_queue(self, ctx, args):
+        user_id = ctx.author.id
+        usage = self._build_usage_embed(
+            "?poker queue <bet> | leave | stats",
+            "?poker queue 10\n?poker queue leave\n?poker queue stats",
+        )
+        if not args:
+            await ctx.send(embed=usage)
+            return
+        option = args[0].lower()
+        if option == "leave":
+            ticket = self.poker_queue.remove(user_id)
+            if ticket is None:
+                await ctx.send("You're not in the poker queue.")
+                return
+            if ticket.timer:
+                ticket.timer.cancel()
+            await ctx.send(f"You left the RM {ticket.stake} poker queue.")
+            return
+        if option == "stats":
+            embed = discord.Embed(title="Poker Queue", color=discord.Color.blurple())
+            embed.add_field(name="Waiting", value=str(len(self.poker_queue)), inline=True)
+            embed.add_field(name="Matched", value=str(self.poker_queue.matches), inline=True)
+            embed.add_field(name="Sent to bot", value=str(self.poker_queue.timeouts), inline=True)
+            embed.add_field(
+                name="Wait before a match",
+                value=self._queue_wait_text(self.poker_queue.match_waits),
+                inline=False,
+            )
+            embed.add_field(
+                name="Wait before the bot",
+                value=self._queue_wait_text(self.poker_queue.timeout_waits),
+                inline=False,
+            )
+            await ctx.send(embed=embed)
+            return
+        if not option.isdigit():
+            await ctx.send(embed=usage)
+            return
+        stake = int(option)
+        if stake <= 0:
+            await ctx.send("You need to bet a positive amount.")
+            return
+        if user_id in self.poker_games:
+            await ctx.send("You already have a poker hand in progress. Use the buttons on the last poker message.")
+            return
+        queued = self.poker_queue.get(user_id)
+        if queued:
+            await ctx.send(f"You're already queued for RM {queued.stake}. Use `?poker queue leave` to leave.")
+            return
+        if self.poker_games.channel_full(ctx.channel.id):
+            await ctx.send(
+                f"This channel already has {self.poker_games.max_tables_per_channel} poker tables running. "
+                "Wait for one to finish or use another channel."
+            )
+            return
+        balance = self.currency.get_balance(user_id)
+        if balance < stake:
+            await ctx.send(f"You need at least RM {stake} to cover the big blind.")
+            return
+        now = time.monotonic()
+        ticket = QueueTicket(user_id, ctx.channel.id, stake, self.poker_queue.band(balance, stake), now, ctx=ctx)
+        partner = self.poker_queue.find_match(ticket)
+        # Partners who started another hand or spent their bankroll while
+        # waiting are dropped and the search continues.
+        while partner is not None and not self._queue_ticket_ready(partner):
+            if partner.timer:
+                partner.timer.cancel()
+            partner = self.poker_queue.find_match(ticket)
+        if partner is None:
+            self.poker_queue.add(ticket)
+            ticket.timer = asyncio.get_running_loop().call_later(
+                self.poker_queue_timeout, self._expire_queue_ticket, ticket
+            )
+            await ctx.send(
+                f"{ctx.author.mention}, you're queued for a RM {stake} hand. "
+                f"If nobody joins within {self.poker_queue_timeout}s you'll play the bot."
+            )
+            return
+        if partner.timer:
+            partner.timer.cancel()
+        self.poker_queue.record_wait(partner, now, matched=True)
+        await ctx.send(f"Matched {partner.ctx.author.mention} with {ctx.author.mention} for RM {stake}.")
+        await self._start_poker_hand(partner.ctx, stake, opponent=ctx.author)
+
     @commands.command()
     async def poker(self, ctx, *args):
         user_id = ctx.author.id
@@ -1439,6 +3732,7 @@ class Games(commands.Cog):
                     name="Commands",
                     value=(
                         "• `?poker <bet> [@user]` to start a hand\n"
+                        "• `?poker queue <bet>` to find an opponent\n"
                         "• `?balance` or `?bal` to check RM\n"
                         "• `?daily` for a daily reward"
                     ),
@@ -1448,15 +3742,28 @@ class Games(commands.Cog):
             self.poker_starters[user_key] = int(time.time())
             self._save_poker_starters()
         if not args:
-            example = "?poker 10\n?poker 10 @user"
+            example = "?poker 10\n?poker 10 @user\n?poker queue 10"
             embed = self._build_usage_embed("?poker <bet> [@user]", example)
             await ctx.send(embed=embed)
             return
 
+        if args[0].lower() == "queue":
+            await self._poker_queue(ctx, args[1:])
+            return
+
         if args[0].isdigit():
             if user_id in self.poker_games:
                 await ctx.send("You already have a poker hand in progress. Use the buttons on the last poker message.")
                 return
+            if user_id in self.poker_queue:
+                await ctx.send("You're waiting in the poker queue. Use `?poker queue leave` first.")
+                return
+            if self.poker_games.channel_full(ctx.channel.id):
+                await ctx.send(
+                    f"This channel already has {self.poker_games.max_tables_per_channel} poker tables running. "
+                    "Wait for one to finish or use another channel."
+                )
+                return
             opponent = None
             if len(args) > 1:
                 if ctx.message.mentions:
@@ -1477,6 +3784,9 @@ class Games(commands.Cog):
                 if opponent.id in self.poker_games:
                     await ctx.send("That user already has a poker hand in progress.")
                     return
+                if opponent.id in self.poker_queue:
+                    await ctx.send("That user is waiting in the poker queue.")
+                    return
             min_bet = int(args[0])
             if min_bet <= 0:
                 await ctx.send("You need to bet a positive amount.")
@@ -1491,143 +3801,7 @@ class Games(commands.Cog):
                 if opponent_balance < min_bet:
                     await ctx.send(f"{opponent.display_name} needs at least RM {min_bet} to cover the big blind.")
                     return
-
-            deck = self._build_deck()
-            random.shuffle(deck)
-            user_cards = [deck.pop() for _ in range(2)]
-            bot_cards = [deck.pop() for _ in range(2)]
-            community = []
-            player_balance = current
-            max_bankroll = int(player_balance * 1.5)
-            calculated_bankroll = int(player_balance * random.uniform(0.5, 1.5))
-            if opponent:
-                bot_bankroll = opponent_balance
-                bot_shadow_name = opponent.display_name
-                bot_shadow_avatar = opponent.display_avatar.url
-                bot_personality = None
-            else:
-                bot_bankroll = max(min_bet, min(calculated_bankroll, max_bankroll))
-                bot_shadow_name, bot_shadow_avatar = self._select_bot_shadow(ctx)
-                bot_personality = self._choose_bot_personality()
-                line = self._pick_persona_line("pre_game", game={"bot_personality": bot_personality})
-                await self._send_persona_message(
-                    ctx,
-                    bot_shadow_name,
-                    bot_shadow_avatar,
-                    line,
-                    game={"bot_personality": bot_personality},
-                )
-                await asyncio.sleep(2)
-            player_avatar = ctx.author.display_avatar.url
-            sb_amount = max(1, min_bet // 2)
-            bb_amount = min_bet
-            sb_player = random.choice(["user", "bot"])
-            bb_player = "bot" if sb_player == "user" else "user"
-            user_total_bet = 0
-            bot_total_bet = 0
-            user_round_bet = 0
-            bot_round_bet = 0
-            pot = 0
-
-            if sb_player == "user":
-                self.currency.adjust(user_id, -sb_amount)
-                user_total_bet += sb_amount
-                user_round_bet += sb_amount
-                pot += sb_amount
-            else:
-                sb_contrib = min(sb_amount, bot_bankroll)
-                if opponent:
-                    self.currency.adjust(opponent.id, -sb_contrib)
-                bot_bankroll -= sb_contrib
-                bot_total_bet += sb_contrib
-                bot_round_bet += sb_contrib
-                pot += sb_contrib
-
-            if bb_player == "user":
-                self.currency.adjust(user_id, -bb_amount)
-                user_total_bet += bb_amount
-                user_round_bet += bb_amount
-                pot += bb_amount
-            else:
-                bb_contrib = min(bb_amount, bot_bankroll)
-                if opponent:
-                    self.currency.adjust(opponent.id, -bb_contrib)
-                bot_bankroll -= bb_contrib
-                bot_total_bet += bb_contrib
-                bot_round_bet += bb_contrib
-                pot += bb_contrib
-
-            shadow_name = bot_shadow_name
-            if not opponent and not shadow_name.endswith(" [BOT]"):
-                shadow_name = f"{shadow_name} [BOT]"
-            if opponent:
-                opponent_mention = opponent.mention
-                sb_name = ctx.author.mention if sb_player == "user" else opponent_mention
-                bb_name = ctx.author.mention if bb_player == "user" else opponent_mention
-            else:
-                sb_name = ctx.author.mention if sb_player == "user" else shadow_name
-                bb_name = ctx.author.mention if bb_player == "user" else shadow_name
-            await ctx.send(
-                f"{sb_name} posts a small blind of RM {sb_amount}.\n"
-                f"{bb_name} posts a big blind of RM {bb_amount}. Now dealing cards..."
-            )
-
-            game = {
-                "deck": deck,
-                "user_cards": user_cards,
-                "bot_cards": bot_cards,
-                "community": community,
-                "stage": "preflop",
-                "min_bet": min_bet,
-                "max_bet": min_bet * 10,
-                "small_blind": sb_amount,
-                "big_blind": bb_amount,
-                "sb_player": sb_player,
-                "bb_player": bb_player,
-                "user_total_bet": user_total_bet,
-                "bot_total_bet": bot_total_bet,
-                "user_round_bet": user_round_bet,
-                "bot_round_bet": bot_round_bet,
-                "current_bet": bb_amount,
-                "raise_count": 0,
-                "max_raises": 10,
-                "awaiting_call": None,
-                "user_acted": False,
-                "bot_acted": False,
-                "turn": sb_player,
-                "pot": pot,
-                "user_id": user_id,
-                "opponent_id": opponent.id if opponent else None,
-                "player_name": ctx.author.display_name,
-                "opponent_name": opponent.display_name if opponent else None,
-                "opponent_avatar": opponent.display_avatar.url if opponent else None,
-                "bot_bankroll": bot_bankroll,
-                "bot_personality": bot_personality,
-                "bot_all_in": bot_bankroll == 0,
-                "user_all_in": self.currency.get_balance(user_id) == 0,
-                "bot_allin_capped": False,
-                "user_allin_capped": False,
-                "bot_status": "Waiting...",
-                "bot_shadow_name": bot_shadow_name,
-                "bot_shadow_avatar": bot_shadow_avatar,
-                "player_avatar": player_avatar,
-                "fold_chance": None,
-                "locked": False,
-                "ctx": ctx,
-            }
-            self._refresh_fold_chance(game)
-            self.poker_games[user_id] = game
-            if opponent:
-                self.poker_games[opponent.id] = game
-            footer = self._turn_prompt(game, game["turn"])
-            embed = self._poker_status_embed(ctx, game, footer_text=footer)
-            view = PokerView(self, ctx, user_id, opponent_id=opponent.id if opponent else None)
-            game["view"] = view
-            self._sync_poker_view(game)
-            message = await ctx.send(embed=embed, view=view)
-            game["message"] = message
-            if game["turn"] == "bot" and not opponent:
-                await self._bot_take_turn(None, game)
+            await self._start_poker_hand(ctx, min_bet, opponent)
             return
 
         await ctx.send("Use the buttons on the last poker message to act.")
@@ -1,24 +1,72 @@
 import asyncio
+import bisect
+import heapq
+import itertools
+import json
 import logging
+import math
 import os
 import random
+import sqlite3
+import threading
 import time
 
 import discord
 from discord.ext import commands
-from collections import deque
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
 
 try:
     import pomice
+    from websockets import exceptions as ws_exceptions
 except ModuleNotFoundError:  # pragma: no cover - optional dependency
     pomice = None
 
 from cogs.games import CurrencyManager
 
 
+if pomice:
+    class MeteredNode(pomice.Node):
+        """A pomice node that keeps the frame stats pomice drops and, when its
+        websocket closes, hands its players to ``failover`` instead of
+        destroying them.
+
+        This overrides pomice internals (``_listen``, ``_handle_ws_msg``), as
+        ``Music._migrate_player`` uses private ``Player`` methods, so pomice
+        is pinned in requirements.txt to the release they were written against.
+        """
+
+        def __init__(self, *, region=None, failover=None, **kwargs):
+            super().__init__(**kwargs)
+            self._websocket = None
+            self.region = region
+            self.failover = failover
+            self.frame_stats = None
+
+        async def _handle_ws_msg(self, data):
+            if data.get("op") == "stats":
+                self.frame_stats = data.get("frameStats")
+            await super()._handle_ws_msg(data)
+
+        async def _listen(self):
+            # Reconnecting is left to Music's health monitor; this just waits for it.
+            while True:
+                try:
+                    message = await self._websocket.recv()
+                except ws_exceptions.ConnectionClosed:
+                    if self._available:
+                        self._available = False
+                        if self.failover and self.player_count:
+                            await self.failover(self)
+                    await asyncio.sleep(1)
+                    continue
+                self._loop.create_task(self._handle_ws_msg(data=json.loads(message)))
+else:
+    MeteredNode = None
+
+
 @dataclass
 class PomiceNodeSpec:
     identifier: str
@@ -28,6 +76,16 @@ class PomiceNodeSpec:
     secure: bool = False
     region: Optional[str] = None
 
+@dataclass
+class NodeHealth:
+    healthy: bool = False
+    failures: int = 0
+    next_attempt: float = 0.0
+    connected_once: bool = False
+    last_error: Optional[str] = None
+    # (unix time, REST round trip ms, websocket ping ms)
+    latency: deque = field(default_factory=lambda: deque(maxlen=120))
+
 class TransportControls(discord.ui.View):
     LOOP_ORDER = ["off", "single", "all"]
     LOOP_LABELS = {
@@ -97,6 +155,22 @@ class TransportControls(discord.ui.View):
         except discord.errors.InteractionResponded:
             pass
 
+    async def _ask(self, interaction, handler, *args):
+        """Run ``handler`` on the guild's actor, deferring first if it is busy."""
+        if self.state.actor.busy and not interaction.response.is_done():
+            # Acknowledge within Discord's 3 s window; the answer follows up.
+            try:
+                await interaction.response.defer(ephemeral=True, thinking=True)
+            except discord.HTTPException:
+                pass
+        return await self.state.actor.ask(handler, *args)
+
+    async def _answer(self, interaction, message):
+        if interaction.response.is_done():
+            await self._followup(interaction, message)
+        else:
+            await self._reply(interaction, message)
+
     async def _followup(self, interaction, message):
         try:
             await interaction.followup.send(message, ephemeral=True)
@@ -139,53 +213,65 @@ class TransportControls(discord.ui.View):
             await self._reply(interaction, "Nothing is playing to skip.")
             return
         state = self.state
-        entry = state.current_entry if state else None
-        if not entry:
+        if not state or not state.current_entry:
             await self._reply(interaction, "Nothing is playing to skip.")
             return
-        requester = entry.get('requester')
+        outcome, votes, required = await self._ask(interaction, self._vote_skip, interaction.user.id, vc)
+        if outcome == "idle":
+            await self._answer(interaction, "Nothing is playing to skip.")
+        elif outcome == "skipped":
+            await self._answer(interaction, "Skipped to the next track.")
+        elif outcome == "duplicate":
+            await self._answer(interaction, "You already voted to skip.")
+        elif outcome == "passed":
+            embed = self.music_cog._build_skip_vote_embed(votes, required, status="passed")
+            await self.music_cog._set_skip_vote_message(state, interaction, embed)
+            state.skip_message = None
+            await self._answer(interaction, "Skip vote passed. Skipping...")
+        else:
+            embed = self.music_cog._build_skip_vote_embed(votes, required)
+            await self.music_cog._set_skip_vote_message(state, interaction, embed)
+            await self._answer(interaction, f"Skip vote started: {votes}/{required}.")
+
+    async def _vote_skip(self, user_id, vc):
+        """Actor handler: count a skip vote and queue the stop once it passes.
+
+        Returns ``(outcome, votes, required)``.
+        """
+        state = self.state
+        entry = state.current_entry
+        if not entry or not (self._is_playing(vc) or self._is_paused(vc)):
+            return "idle", 0, 0
+        requester_id = entry.requester_id
         listener_count = self.music_cog._voice_listener_count(vc)
         if listener_count <= 1:
-            if requester and interaction.user.id != requester.id:
-                entry['force_reward'] = True
-            try:
-                await self._stop_voice_client(vc)
-            except Exception:
-                pass
-            if state:
-                async with state.lock:
-                    state.skip_votes.clear()
-                    state.skip_message = None
-            await self._reply(interaction, "Skipped to the next track.")
-            return
-
-        async with state.lock:
-            if interaction.user.id in state.skip_votes:
-                await self._reply(interaction, "You already voted to skip.")
-                return
-            state.skip_votes.add(interaction.user.id)
-            votes = len(state.skip_votes)
-            required = self.music_cog._skip_votes_required(listener_count)
-
-        embed = self.music_cog._build_skip_vote_embed(votes, required)
-        await self.music_cog._set_skip_vote_message(state, interaction, embed)
-
-        if votes >= required:
-            if requester and any(voter_id != requester.id for voter_id in state.skip_votes):
-                entry['force_reward'] = True
-            outcome = self.music_cog._build_skip_vote_embed(votes, required, status="passed")
-            await self.music_cog._set_skip_vote_message(state, interaction, outcome)
-            try:
-                await self._stop_voice_client(vc)
-            except Exception:
-                pass
-            if state:
-                async with state.lock:
-                    state.skip_votes.clear()
-                    state.skip_message = None
-            await self._reply(interaction, "Skip vote passed. Skipping...")
+            if user_id != requester_id:
+                entry.force_reward = True
+            self.music_cog._post_voice_io(state, self._skip_entry, entry, vc)
+            state.skip_votes.clear()
+            state.skip_message = None
+            return "skipped", 0, 0
+        if user_id in state.skip_votes:
+            return "duplicate", len(state.skip_votes), self.music_cog._skip_votes_required(listener_count)
+        state.skip_votes.add(user_id)
+        votes = len(state.skip_votes)
+        required = self.music_cog._skip_votes_required(listener_count)
+        if votes < required:
+            return "voting", votes, required
+        if any(voter_id != requester_id for voter_id in state.skip_votes):
+            entry.force_reward = True
+        self.music_cog._post_voice_io(state, self._skip_entry, entry, vc)
+        state.skip_votes.clear()
+        return "passed", votes, required
+
+    async def _skip_entry(self, entry, vc):
+        """Voice I/O: stop ``entry`` unless it already ended on its own."""
+        if self.state.current_entry is not entry:
             return
-        await self._reply(interaction, f"Skip vote started: {votes}/{required}.")
+        try:
+            await self._stop_voice_client(vc)
+        except Exception:
+            pass
 
     @discord.ui.button(label="Loop: Off", style=discord.ButtonStyle.primary)
     async def loop_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -196,6 +282,7 @@ class TransportControls(discord.ui.View):
         idx = self.LOOP_ORDER.index(current)
         next_mode = self.LOOP_ORDER[(idx + 1) % len(self.LOOP_ORDER)]
         self.state.loop_mode = next_mode
+        self.music_cog._queue_changed(self.state, queue=False)
         button.label = self.LOOP_LABELS[next_mode]
         embed_kwargs = {"view": self}
         entry = self.state.current_entry
@@ -215,7 +302,7 @@ class TransportControls(discord.ui.View):
                 except discord.HTTPException:
                     pass
         if edit_success and entry:
-            entry['last_embed_edit'] = now
+            entry.last_embed_edit = now
         await self._reply(interaction, f"Loop mode set to {next_mode}.")
 
     @discord.ui.button(label="🔀 Shuffle", style=discord.ButtonStyle.secondary)
@@ -223,20 +310,687 @@ class TransportControls(discord.ui.View):
         if not self.state:
             await self._reply(interaction, "Shuffle state unavailable.")
             return
-        async with self.state.lock:
-            if not self.state.queue:
-                await self._reply(interaction, "Queue is empty, nothing to shuffle.")
-                return
-            queue_items = list(self.state.queue)
-            random.shuffle(queue_items)
-            self.state.queue = deque(queue_items)
-        await self._reply(interaction, "Queue shuffled.")
+        if await self._ask(interaction, self._shuffle):
+            await self._answer(interaction, "Queue shuffled.")
+        else:
+            await self._answer(interaction, "Queue is empty, nothing to shuffle.")
+
+    async def _shuffle(self):
+        """Actor handler: shuffle the queue; False when it is empty."""
+        if not self.state.queue:
+            return False
+        self.state.queue.shuffle()
+        self.music_cog._queue_changed(self.state)
+        self.music_cog._prefetch_upcoming(self.state)
+        return True
+
+
+# Lavalink track info fields kept for a queued track, in ``QueueEntry.track_info``
+# order; the tuple ends with the track type.
+TRACK_INFO_KEYS = ("title", "author", "uri", "identifier", "isrc", "thumbnail", "length", "isStream", "isSeekable")
+_TRACK_INFO_INDEX = {key: index for index, key in enumerate(TRACK_INFO_KEYS)}
+
+
+def _entry_duration(entry):
+    """Known duration of a queue entry in seconds, or 0."""
+    return entry.duration or 0
+
+
+class _QueueNode:
+    __slots__ = ("item", "priority", "size", "left", "right", "parent", "weight", "total")
+
+    def __init__(self, item, priority, weight):
+        self.item = item
+        self.priority = priority
+        self.size = 1
+        self.left = None
+        self.right = None
+        self.parent = None
+        self.weight = weight
+        self.total = weight
+
+
+class IndexedQueue:
+    """Sequence of queue entries backed by an implicit treap.
+
+    Positional access, insert, removal and move are O(log n); slicing costs
+    O(log n + k) and ``index`` of a queued entry is O(log n) through parent
+    links. Supports the ``deque`` methods the music cog used before, so it
+    can stand in for ``GuildPlaybackState.queue`` directly.
+
+    Each node also carries ``weight(item)`` and its subtree's weight total,
+    which makes ``prefix_weight`` (the summed durations ahead of a position)
+    O(log n) as well.
+    """
+
+    def __init__(self, items=(), *, weight=None, rng=None):
+        self._rng = rng or random.Random()
+        self._weight = weight or (lambda item: 0)
+        self._root = None
+        self._nodes = {}
+        self._root = self._build([self._new_node(item) for item in items])
+
+    def _new_node(self, item):
+        node = _QueueNode(item, self._rng.random(), self._weight(item))
+        self._nodes[id(item)] = node
+        return node
+
+    @staticmethod
+    def _size(node):
+        return node.size if node else 0
+
+    @staticmethod
+    def _update(node):
+        size = 1
+        total = node.weight
+        left = node.left
+        if left:
+            left.parent = node
+            size += left.size
+            total += left.total
+        right = node.right
+        if right:
+            right.parent = node
+            size += right.size
+            total += right.total
+        node.size = size
+        node.total = total
+
+    def _split(self, node, count):
+        """Split into (first ``count`` nodes, the rest)."""
+        if node is None:
+            return None, None
+        left_size = node.left.size if node.left else 0
+        if count <= left_size:
+            first, node.left = self._split(node.left, count)
+            self._update(node)
+            return first, node
+        node.right, rest = self._split(node.right, count - left_size - 1)
+        self._update(node)
+        return node, rest
+
+    def _merge(self, first, second):
+        if first is None:
+            return second
+        if second is None:
+            return first
+        if first.priority > second.priority:
+            first.right = self._merge(first.right, second)
+            self._update(first)
+            return first
+        second.left = self._merge(first, second.left)
+        self._update(second)
+        return second
+
+    def _set_root(self, node):
+        if node is not None:
+            node.parent = None
+        self._root = node
+
+    def _build(self, nodes):
+        """Link ``nodes`` (in order) into a treap in O(n) by their priorities."""
+        stack = []
+        for node in nodes:
+            node.right = node.parent = None
+            priority = node.priority
+            last = None
+            while stack and stack[-1].priority < priority:
+                last = stack.pop()
+            node.left = last
+            if stack:
+                stack[-1].right = node
+            stack.append(node)
+        if not stack:
+            return None
+        self._update_all(stack[0])
+        stack[0].parent = None
+        return stack[0]
+
+    def _update_all(self, root):
+        order = [root]
+        append = order.append
+        for node in order:
+            if node.left:
+                append(node.left)
+            if node.right:
+                append(node.right)
+        update = self._update
+        for node in reversed(order):
+            update(node)
+
+    def _node_at(self, index):
+        node = self._root
+        while node:
+            left_size = self._size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node
+            else:
+                index -= left_size + 1
+                node = node.right
+        raise IndexError("queue index out of range")
+
+    def _normalize(self, index):
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("queue index out of range")
+        return index
+
+    def _iter_from(self, index):
+        stack = []
+        node = self._root
+        while node:
+            left_size = self._size(node.left)
+            if index <= left_size:
+                stack.append(node)
+                node = node.left
+            else:
+                index -= left_size + 1
+                node = node.right
+        while stack:
+            node = stack.pop()
+            yield node.item
+            node = node.right
+            while node:
+                stack.append(node)
+                node = node.left
+
+    def __len__(self):
+        return self._size(self._root)
+
+    def __bool__(self):
+        return self._root is not None
+
+    def __iter__(self):
+        return self._iter_from(0)
+
+    def __contains__(self, item):
+        node = self._nodes.get(id(item))
+        return node is not None and node.item is item
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            return list(itertools.islice(self._iter_from(start), max(0, stop - start)))
+        return self._node_at(self._normalize(index)).item
+
+    def index(self, item):
+        node = self._nodes.get(id(item))
+        if node is None or node.item is not item:
+            raise ValueError("entry is not queued")
+        position = self._size(node.left)
+        while node.parent:
+            if node is node.parent.right:
+                position += self._size(node.parent.left) + 1
+            node = node.parent
+        return position
+
+    def insert(self, index, item):
+        length = len(self)
+        if index < 0:
+            index = max(0, index + length)
+        index = min(index, length)
+        first, rest = self._split(self._root, index)
+        self._set_root(self._merge(self._merge(first, self._new_node(item)), rest))
+
+    def append(self, item):
+        self.insert(len(self), item)
+
+    def appendleft(self, item):
+        self.insert(0, item)
+
+    def pop(self, index=-1):
+        index = self._normalize(index)
+        first, rest = self._split(self._root, index)
+        node, rest = self._split(rest, 1)
+        self._set_root(self._merge(first, rest))
+        del self._nodes[id(node.item)]
+        return node.item
+
+    def popleft(self):
+        if self._root is None:
+            raise IndexError("pop from an empty queue")
+        return self.pop(0)
+
+    def remove(self, item):
+        return self.pop(self.index(item))
+
+    def move(self, source, destination):
+        """Move the entry at ``source`` so it ends up at ``destination``."""
+        item = self.pop(source)
+        self.insert(destination, item)
+        return item
+
+    def clear(self):
+        self._root = None
+        self._nodes.clear()
+
+    def shuffle(self, rng=None):
+        """Shuffle in place: the tree keeps its shape and only the items move."""
+        nodes = []
+        stack = []
+        node = self._root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            nodes.append(node)
+            node = node.right
+        items = [(node.item, node.weight) for node in nodes]
+        (rng or self._rng).shuffle(items)
+        lookup = self._nodes
+        for node, (item, weight) in zip(nodes, items):
+            node.item = item
+            node.weight = weight
+            lookup[id(item)] = node
+        if self._root is not None:
+            self._update_all(self._root)
+
+    def reweigh(self, item):
+        """Recompute ``item``'s weight after it changed; no-op if it is not queued."""
+        node = self._nodes.get(id(item))
+        if node is None or node.item is not item:
+            return
+        node.weight = self._weight(item)
+        while node:
+            total = node.weight
+            if node.left:
+                total += node.left.total
+            if node.right:
+                total += node.right.total
+            node.total = total
+            node = node.parent
+
+    def prefix_weight(self, index):
+        """Total weight of the first ``index`` items."""
+        total = 0
+        node = self._root
+        while node and index > 0:
+            left_size = node.left.size if node.left else 0
+            if index <= left_size:
+                node = node.left
+                continue
+            total += node.weight + (node.left.total if node.left else 0)
+            index -= left_size + 1
+            node = node.right
+        return total
+
+    def total_weight(self):
+        return self._root.total if self._root else 0
+
+
+class GuildQueueStore:
+    """Per-guild queue snapshots, split so the two halves change independently.
+
+    ``<guild_id>.json`` holds the small, frequently rewritten part: channels,
+    loop mode, the current track and its position. ``<guild_id>.queue.json``
+    holds the upcoming entries and is only rewritten when the queue changes.
+    Entries are ``[url, requester_id, text_channel_id, encoded, track_info]``,
+    with ``track_info`` laid out as in ``QueueEntry``.
+    """
+
+    VERSION = 2
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _paths(self, guild_id):
+        base = os.path.join(self.directory, str(guild_id))
+        return f"{base}.json", f"{base}.queue.json"
+
+    def _write(self, path, payload):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def save(self, guild_id, header, entries=None):
+        """Blocking; ``entries`` of None leaves the stored queue untouched."""
+        header_path, queue_path = self._paths(guild_id)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if entries is not None:
+                self._write(queue_path, {"version": self.VERSION, "entries": entries})
+            self._write(header_path, dict(header, version=self.VERSION))
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def discard(self, guild_id):
+        for path in self._paths(guild_id):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def load_all(self):
+        """Blocking; returns (header, entries) pairs, dropping unreadable snapshots."""
+        snapshots = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return snapshots
+        for name in names:
+            if name.endswith(".tmp"):
+                self._remove(os.path.join(self.directory, name))
+                continue
+            if not name.endswith(".json") or name.endswith(".queue.json"):
+                continue
+            guild_id = name[:-len(".json")]
+            header_path, queue_path = self._paths(guild_id)
+            try:
+                with open(header_path, "r", encoding="utf-8") as handle:
+                    header = json.load(handle)
+                entries = []
+                if os.path.exists(queue_path):
+                    with open(queue_path, "r", encoding="utf-8") as handle:
+                        entries = json.load(handle).get("entries") or []
+            except (OSError, ValueError, AttributeError):
+                self.discard(guild_id)
+                continue
+            if isinstance(header, dict) and header.get("version") == self.VERSION:
+                snapshots.append((header, entries))
+            else:
+                self.discard(guild_id)
+        return snapshots
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class QueueEntry:
+    """One queued track.
+
+    Discord objects are kept as ids and looked up through the client on each
+    read, so a long queue does not pin members, channels or messages the
+    cache has since let go of. Messages are stored as (channel_id, message_id)
+    and read back as ``discord.PartialMessage``.
+    """
+
+    __slots__ = (
+        "_client",
+        "url",
+        "title",
+        "state",
+        "guild_id",
+        "requester_id",
+        "voice_channel_id",
+        "text_channel_id",
+        "_loading_message",
+        "_queued_message",
+        "_now_playing_message",
+        "now_playing_view",
+        "pending",
+        "resolve_task",
+        "resolve_failures",
+        "resolved_at",
+        "encoded",
+        "track_info",
+        "pomice_track",
+        "start_time",
+        "resume_position",
+        "requested_at",
+        "np_token",
+        "np_refreshing",
+        "now_playing_signature",
+        "last_embed_edit",
+        "force_embed_refresh",
+        "force_reward",
+        "stopped_due_to_empty_vc",
+    )
+
+    def __init__(
+        self,
+        client,
+        url,
+        *,
+        guild_id,
+        requester_id,
+        voice_channel_id,
+        text_channel_id,
+        state=None,
+        title=None,
+        encoded=None,
+        track_info=None,
+        pending=False,
+    ):
+        self._client = client
+        self.url = url
+        self.title = title
+        self.state = state
+        self.guild_id = guild_id
+        self.requester_id = requester_id
+        self.voice_channel_id = voice_channel_id
+        self.text_channel_id = text_channel_id
+        self._loading_message = None
+        self._queued_message = None
+        self._now_playing_message = None
+        self.now_playing_view = None
+        self.pending = pending
+        self.resolve_task = None
+        self.resolve_failures = 0
+        self.resolved_at = None
+        self.encoded = encoded
+        self.track_info = track_info
+        self.pomice_track = None
+        self.start_time = None
+        self.resume_position = 0
+        self.requested_at = None
+        self.np_token = None
+        self.np_refreshing = False
+        self.now_playing_signature = None
+        self.last_embed_edit = 0
+        self.force_embed_refresh = False
+        self.force_reward = False
+        self.stopped_due_to_empty_vc = False
+
+    def copy_for(self, url, title=None, encoded=None, track_info=None):
+        """A new entry with this one's requester, channels and state."""
+        return QueueEntry(
+            self._client,
+            url,
+            guild_id=self.guild_id,
+            requester_id=self.requester_id,
+            voice_channel_id=self.voice_channel_id,
+            text_channel_id=self.text_channel_id,
+            state=self.state,
+            title=title,
+            encoded=encoded,
+            track_info=track_info,
+        )
+
+    @property
+    def resolved(self):
+        return self.encoded is not None or self.pomice_track is not None
+
+    def info(self, key):
+        """One ``TRACK_INFO_KEYS`` field of the resolved track, or None."""
+        track_info = self.track_info
+        return track_info[_TRACK_INFO_INDEX[key]] if track_info else None
+
+    @property
+    def duration(self):
+        length = self.info("length")
+        if isinstance(length, (int, float)) and length > 0 and not self.info("isStream"):
+            return int(length / 1000)
+        return None
+
+    @property
+    def link(self):
+        return self.info("uri") or self.url
+
+    @property
+    def guild(self):
+        return self._client.get_guild(self.guild_id)
+
+    @property
+    def requester(self):
+        guild = self.guild
+        return guild.get_member(self.requester_id) if guild else None
+
+    @property
+    def requester_name(self):
+        requester = self.requester
+        return requester.display_name if requester else "Unknown member"
+
+    @property
+    def voice_channel(self):
+        return self._client.get_channel(self.voice_channel_id)
+
+    @property
+    def text_channel(self):
+        return self._client.get_channel(self.text_channel_id)
+
+    def _message(self, ref):
+        if ref is None:
+            return None
+        channel = self._client.get_channel(ref[0])
+        return channel.get_partial_message(ref[1]) if channel else None
+
+    @staticmethod
+    def _message_ref(message):
+        return (message.channel.id, message.id) if message is not None else None
+
+    @property
+    def loading_message(self):
+        return self._message(self._loading_message)
+
+    @loading_message.setter
+    def loading_message(self, message):
+        self._loading_message = self._message_ref(message)
+
+    @property
+    def queued_message(self):
+        return self._message(self._queued_message)
+
+    @queued_message.setter
+    def queued_message(self, message):
+        self._queued_message = self._message_ref(message)
+
+    @property
+    def now_playing_message(self):
+        return self._message(self._now_playing_message)
+
+    @now_playing_message.setter
+    def now_playing_message(self, message):
+        self._now_playing_message = self._message_ref(message)
+
+
+class GuildActor:
+    """Runs one guild's playback commands one at a time, in arrival order.
+
+    ``ask`` queues a coroutine function and waits for its result; ``post``
+    queues one without waiting and logs any exception. An ``ask`` that
+    finds the actor idle runs its handler straight away in the caller's
+    task. The consumer task only exists while there is mail, so an idle
+    guild holds no task. A handler must never ``ask`` its own actor,
+    because that command would wait behind the handler forever.
+    """
+
+    __slots__ = ("_mailbox", "_task", "_inline", "_logger", "handled")
+
+    def __init__(self, logger=None):
+        self._mailbox = deque()
+        self._task = None
+        self._inline = False
+        self._logger = logger or logging.getLogger('discord.music')
+        self.handled = 0
+
+    @property
+    def busy(self):
+        return self._task is not None or self._inline
+
+    def post(self, handler, *args):
+        self._put(handler, args, None)
+
+    async def ask(self, handler, *args):
+        if not self.busy:
+            self._inline = True
+            try:
+                return await handler(*args)
+            finally:
+                self._inline = False
+                self.handled += 1
+                if self._mailbox:
+                    self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._put(handler, args, future)
+        return await future
+
+    def _put(self, handler, args, future):
+        self._mailbox.append((handler, args, future))
+        if not self.busy:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        try:
+            while self._mailbox:
+                handler, args, future = self._mailbox.popleft()
+                if future is not None and future.done():
+                    continue
+                try:
+                    result = await handler(*args)
+                except Exception as exc:
+                    if future is None:
+                        self._logger.exception("Playback command %s failed.", getattr(handler, "__name__", handler))
+                    elif not future.done():
+                        future.set_exception(exc)
+                else:
+                    if future is not None and not future.done():
+                        future.set_result(result)
+                self.handled += 1
+        finally:
+            self._task = None
+            for _, _, future in self._mailbox:
+                if future is not None and not future.done():
+                    future.cancel()
+            self._mailbox.clear()
+
+    def cancel(self):
+        if self._task is not None:
+            self._task.cancel()
 
 
 class GuildPlaybackState:
-    def __init__(self):
-        self.queue = deque()
-        self.lock = asyncio.Lock()
+    """Playback state for one guild.
+
+    Everything that changes the queue or the current entry runs as a handler
+    on ``actor``, so handlers see a consistent state across their awaits.
+    Lavalink and Discord calls run outside the actor; ``voice_io`` is the
+    last queued connect/play/stop/disconnect, which the next one waits for.
+    """
+
+    __slots__ = (
+        "guild_id",
+        "last_active",
+        "queue",
+        "actor",
+        "is_playing",
+        "current_entry",
+        "loop_mode",
+        "idle_disconnect_task",
+        "empty_voice_task",
+        "manual_disconnect",
+        "skip_votes",
+        "skip_message",
+        "track_ended_at",
+        "play_sent_at",
+        "voice_io",
+    )
+
+    def __init__(self, guild_id=None):
+        self.guild_id = guild_id
+        self.last_active = time.time()
+        self.queue = IndexedQueue(weight=_entry_duration)
+        self.actor = GuildActor()
         self.is_playing = False
         self.current_entry = None
         self.loop_mode = "off"
@@ -245,6 +999,262 @@ class GuildPlaybackState:
         self.manual_disconnect = False
         self.skip_votes = set()
         self.skip_message = None
+        self.track_ended_at = None
+        self.play_sent_at = None
+        self.voice_io = None
+
+
+class TrackResolutionCache:
+    """Query -> resolved Lavalink track, kept in memory and in SQLite.
+
+    The memory tier is an LRU with a TTL. The disk tier stores the encoded
+    track string with its info dict, so a track can be rebuilt without a
+    node round trip, and is trimmed to ``disk_entries`` rows by last use.
+    """
+
+    def __init__(self, path, *, memory_entries=1024, memory_ttl=6 * 3600, disk_entries=50000, disk_ttl=7 * 86400):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.memory_ttl = memory_ttl
+        self.disk_entries = disk_entries
+        self.disk_ttl = disk_ttl
+        self._memory = OrderedDict()
+        self._db = None
+        self._db_lock = threading.Lock()
+        # Row count of the disk tier, counted once and then kept up to date
+        # so trimming does not scan the table on every insert.
+        self._disk_rows = None
+        self.counts = {"memory": 0, "disk": 0, "miss": 0}
+        self.latency = {"memory": 0.0, "disk": 0.0, "miss": 0.0}
+
+    @staticmethod
+    def normalize(query):
+        query = (query or "").strip()
+        if query.startswith(("http://", "https://")):
+            return query.split("#", 1)[0]
+        return " ".join(query.lower().split())
+
+    def _connect(self):
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS tracks ("
+                "query TEXT PRIMARY KEY, encoded TEXT NOT NULL, info TEXT NOT NULL, "
+                "track_type TEXT NOT NULL, stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS tracks_used_at ON tracks (used_at)")
+        return self._db
+
+    def get_memory(self, key):
+        item = self._memory.get(key)
+        if item is None:
+            return None
+        if time.monotonic() - item[0] > self.memory_ttl:
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return item[1]
+
+    def put_memory(self, key, record):
+        self._memory[key] = (time.monotonic(), record)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_disk(self, key):
+        """Blocking; call from a worker thread."""
+        now = time.time()
+        with self._db_lock:
+            try:
+                db = self._connect()
+                row = db.execute(
+                    "SELECT encoded, info, track_type, stored_at FROM tracks WHERE query = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if now - row[3] > self.disk_ttl:
+                    db.execute("DELETE FROM tracks WHERE query = ?", (key,))
+                    db.commit()
+                    if self._disk_rows is not None:
+                        self._disk_rows -= 1
+                    return None
+                db.execute("UPDATE tracks SET used_at = ? WHERE query = ?", (now, key))
+                db.commit()
+                return row[0], json.loads(row[1]), row[2]
+            except (sqlite3.Error, OSError, ValueError):
+                self._disk_rows = None
+                return None
+
+    def put_disk(self, key, record):
+        """Blocking; call from a worker thread."""
+        encoded, info, track_type = record
+        now = time.time()
+        with self._db_lock:
+            try:
+                db = self._connect()
+                if self._disk_rows is None:
+                    self._disk_rows = db.execute("SELECT COUNT(*) FROM tracks").fetchone()[0]
+                exists = db.execute("SELECT 1 FROM tracks WHERE query = ?", (key,)).fetchone() is not None
+                db.execute(
+                    "INSERT OR REPLACE INTO tracks VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, encoded, json.dumps(info, separators=(",", ":")), track_type, now, now),
+                )
+                rows = self._disk_rows + (not exists)
+                excess = rows - self.disk_entries
+                if excess > 0:
+                    rows -= db.execute(
+                        "DELETE FROM tracks WHERE query IN "
+                        "(SELECT query FROM tracks ORDER BY used_at LIMIT ?)",
+                        (excess,),
+                    ).rowcount
+                db.commit()
+                self._disk_rows = rows
+            except (sqlite3.Error, OSError, TypeError, ValueError):
+                # Recount on the next insert rather than trust a count from a failed write.
+                self._disk_rows = None
+
+    def record(self, tier, elapsed):
+        self.counts[tier] += 1
+        self.latency[tier] += elapsed
+
+    def stats(self):
+        total = sum(self.counts.values())
+        hits = self.counts["memory"] + self.counts["disk"]
+        stats = {
+            "lookups": total,
+            "hit_rate": hits / total if total else 0.0,
+            "memory_entries": len(self._memory),
+        }
+        for tier, count in self.counts.items():
+            stats[f"{tier}_count"] = count
+            stats[f"{tier}_avg_ms"] = self.latency[tier] / count * 1000 if count else 0.0
+        return stats
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class LatencyHistogram:
+    """Sample counts per fixed latency bucket, so percentiles cost the same at any volume."""
+
+    BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    __slots__ = ("counts", "total", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.total = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, elapsed_ms):
+        self.counts[bisect.bisect_left(self.BOUNDS_MS, elapsed_ms)] += 1
+        self.total += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the ``fraction`` quantile, capped at the largest sample."""
+        if not self.total:
+            return None
+        rank = max(1, math.ceil(self.total * fraction))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                break
+        if index < len(self.BOUNDS_MS):
+            return min(self.BOUNDS_MS[index], self.max_ms)
+        return self.max_ms
+
+    def to_dict(self):
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "count": self.total,
+            "mean_ms": round(self.total_ms / self.total, 1) if self.total else None,
+            "p50_ms": round(p50, 1) if p50 is not None else None,
+            "p95_ms": round(p95, 1) if p95 is not None else None,
+            "max_ms": round(self.max_ms, 1),
+            "buckets": list(self.counts),
+        }
+
+
+class PlaybackMetrics:
+    """Latency histograms for each playback stage, overall, per guild and per Lavalink node.
+
+    Stages, in the order a ``?play`` goes through them:
+
+    ``ack``: the command to its reply in the text channel.
+    ``resolve``: a Lavalink lookup on a cache miss, including the wait for a lookup slot.
+    ``connect``: joining the voice channel.
+    ``play``: the ``player.play`` request.
+    ``first_audio``: ``player.play`` to Lavalink's track-start event.
+    ``command_to_audio``: the command to track start, for a track that did not wait in the queue.
+    ``gap``: the end of one track to ``player.play`` for the next.
+    """
+
+    STAGES = ("ack", "resolve", "connect", "play", "first_audio", "command_to_audio", "gap")
+
+    def __init__(self, path):
+        self.path = path
+        self.overall = {}
+        self.guilds = {}
+        self.nodes = {}
+        self.dirty = False
+
+    @staticmethod
+    def _add(histograms, stage, elapsed_ms):
+        histogram = histograms.get(stage)
+        if histogram is None:
+            histogram = histograms[stage] = LatencyHistogram()
+        histogram.add(elapsed_ms)
+
+    def record(self, stage, elapsed, *, guild_id=None, node=None):
+        elapsed_ms = max(0.0, elapsed * 1000)
+        self._add(self.overall, stage, elapsed_ms)
+        if guild_id is not None:
+            self._add(self.guilds.setdefault(guild_id, {}), stage, elapsed_ms)
+        if node is not None:
+            self._add(self.nodes.setdefault(node._identifier, {}), stage, elapsed_ms)
+        self.dirty = True
+
+    def forget_guild(self, guild_id):
+        self.guilds.pop(guild_id, None)
+
+    @staticmethod
+    def _scope(histograms):
+        return {stage: histograms[stage].to_dict() for stage in PlaybackMetrics.STAGES if stage in histograms}
+
+    def snapshot(self, **sections):
+        """The histograms as a JSON-ready dict; ``sections`` are added as extra top-level keys."""
+        self.dirty = False
+        return {
+            "updated_at": time.time(),
+            "bounds_ms": list(LatencyHistogram.BOUNDS_MS),
+            "stages": self._scope(self.overall),
+            "nodes": {node_id: self._scope(stages) for node_id, stages in self.nodes.items()},
+            "guilds": {str(guild_id): self._scope(stages) for guild_id, stages in self.guilds.items()},
+            **sections,
+        }
+
+    def write(self, snapshot):
+        """Blocking; replaces the metrics file with ``snapshot``."""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(snapshot, handle, indent=2)
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError):
+            pass
 
 
 def _env_int(name, default):
@@ -264,6 +1274,10 @@ def _env_flag(name, default=False):
 class Music(commands.Cog):
     IDLE_DISCONNECT_DELAY = 15
     EMPTY_VC_SHUTDOWN_DELAY = 30
+    PREFETCH_MAX_FAILURES = 3
+    NODE_REGION_PENALTY = 50
+    PLAYLIST_CHUNK = 100
+    QUEUE_PAGE_SIZE = 10
 
     def __init__(self, bot):
         self.bot = bot
@@ -274,6 +1288,34 @@ class Music(commands.Cog):
         self._pomice_nodes_ready = False
         self._pomice_nodes_started = False
         self.pomice_player_cls = pomice.Player if pomice else None
+        self.node_migrations = deque(maxlen=50)
+        self.node_health = {}
+        self.node_probe_interval = max(1, _env_int("MUSIC_NODE_PROBE_INTERVAL", 15))
+        self.node_probe_timeout = max(1, _env_int("MUSIC_NODE_PROBE_TIMEOUT", 5))
+        self.node_backoff_cap = max(1, _env_int("MUSIC_NODE_BACKOFF_CAP", 300))
+        self._node_monitor_task = None
+        self._restore_task = None
+        self.now_playing_interval = max(1, _env_int("MUSIC_NP_REFRESH_INTERVAL", 10))
+        self._np_schedule = []
+        self._np_sequence = itertools.count()
+        self._np_wakeup = asyncio.Event()
+        self._np_task = None
+        self._np_edit_slots = asyncio.Semaphore(max(1, _env_int("MUSIC_NP_EDIT_CONCURRENCY", 5)))
+        self._np_channel_backoff = {}
+        self._np_edit_times = deque()
+        self._np_reported_at = time.monotonic()
+        self.now_playing_counts = {"edited": 0, "unchanged": 0, "backed_off": 0, "failed": 0}
+        self.queue_store = GuildQueueStore(os.getenv("MUSIC_QUEUE_DIR", "data/music_queues"))
+        self.queue_snapshot_delay = max(1, _env_int("MUSIC_QUEUE_SNAPSHOT_DELAY", 5))
+        self.queue_position_interval = max(5, _env_int("MUSIC_QUEUE_POSITION_INTERVAL", 30))
+        self.queue_restore_max_age = _env_int("MUSIC_QUEUE_RESTORE_MAX_AGE", 3600)
+        self.queue_restore_concurrency = max(1, _env_int("MUSIC_QUEUE_RESTORE_CONCURRENCY", 4))
+        self._snapshot_dirty = {}
+        self._snapshot_task = None
+        self._position_task = None
+        self._queues_restored = False
+        self.state_idle_ttl = max(60, _env_int("MUSIC_STATE_IDLE_TTL", 1800))
+        self._state_sweep_task = None
         self.play_reward = _env_int("MUSIC_PLAY_REWARD", 10)
         self.play_reward_min_duration = _env_int("MUSIC_REWARD_MIN_SECONDS", 60)
         self.play_reward_repeat_limit = _env_int("MUSIC_REWARD_REPEAT_LIMIT", 3)
@@ -282,6 +1324,25 @@ class Music(commands.Cog):
         self.play_reward_batch_amount = _env_int("MUSIC_REWARD_BATCH_AMOUNT", 50)
         self.play_reward_counts = {}
         self.disable_loop_rewards = _env_flag("DISABLE_LOOP_REWARDS", default=False)
+        self.resolve_concurrency = max(1, _env_int("MUSIC_RESOLVE_CONCURRENCY", 4))
+        self._resolve_semaphores = {}
+        self._playlist_tasks = set()
+        self._follow_up_tasks = set()
+        self._listeners = {}
+        self.metrics = PlaybackMetrics(os.getenv("MUSIC_METRICS_PATH", "data/music_metrics.json"))
+        self.metrics_interval = max(10, _env_int("MUSIC_METRICS_INTERVAL", 60))
+        self._metrics_task = None
+        self.track_cache = TrackResolutionCache(
+            os.getenv("MUSIC_TRACK_CACHE_PATH", "data/track_cache.sqlite3"),
+            memory_entries=max(1, _env_int("MUSIC_TRACK_CACHE_MEMORY", 1024)),
+            memory_ttl=_env_int("MUSIC_TRACK_CACHE_TTL", 6 * 3600),
+            disk_entries=max(1, _env_int("MUSIC_TRACK_CACHE_DISK", 50000)),
+            disk_ttl=_env_int("MUSIC_TRACK_CACHE_DISK_TTL", 7 * 86400),
+        )
+        self.prefetch_depth = max(0, _env_int("MUSIC_PREFETCH_DEPTH", 3))
+        self.prefetch_max_age = _env_int("MUSIC_PREFETCH_MAX_AGE", 1800)
+        self.prefetch_counts = {"ready": 0, "waited": 0, "cold": 0}
+        self.playlist_limit = max(1, _env_int("MUSIC_PLAYLIST_LIMIT", 1000))
 
     def _load_pomice_node_specs(self):
         raw = os.getenv("POMICE_NODES", "").strip()
@@ -322,22 +1383,206 @@ class Music(commands.Cog):
         if not self.pomice_pool or not self.pomice_nodes:
             return
         for spec in self.pomice_nodes:
-            kwargs = {
-                "bot": self.bot,
-                "host": spec.host,
-                "port": spec.port,
-                "password": spec.password,
-                "identifier": spec.identifier,
-                "secure": spec.secure,
-            }
-            if spec.region:
-                kwargs["region"] = spec.region
-            await self.pomice_pool.create_node(**kwargs)
+            node = MeteredNode(
+                pool=pomice.NodePool,
+                bot=self.bot,
+                host=spec.host,
+                port=spec.port,
+                password=spec.password,
+                identifier=spec.identifier,
+                secure=spec.secure,
+                region=spec.region,
+                failover=self._failover_node,
+            )
+            # Registered even when down, with _available False, so the monitor can bring it back.
+            pomice.NodePool._nodes[spec.identifier] = node
+            self.node_health[spec.identifier] = NodeHealth()
+        await asyncio.gather(*(self._probe_node(node) for node in self.pomice_pool.nodes.values()))
         self._pomice_nodes_ready = True
         self._pomice_nodes_started = True
+        self._node_monitor_task = asyncio.create_task(self._node_health_loop())
+
+    async def _node_health_loop(self):
+        while True:
+            await asyncio.sleep(self.node_probe_interval)
+            nodes = list(self.pomice_pool.nodes.values())
+            await asyncio.gather(*(self._probe_node(node) for node in nodes), return_exceptions=True)
+
+    async def _probe_node(self, node):
+        """Reconnect ``node`` if its websocket is down, then check REST and the websocket.
+
+        A node that fails either check is taken out of rotation and its players
+        are moved; reconnects back off exponentially with jitter.
+        """
+        health = self.node_health.setdefault(node._identifier, NodeHealth())
+        now = time.monotonic()
+        timeout = self.node_probe_timeout
+        if not node.is_connected:
+            if now < health.next_attempt:
+                return
+            try:
+                await asyncio.wait_for(node.connect(reconnect=health.connected_once), timeout)
+            except Exception as exc:
+                self._mark_node_unhealthy(node, health, f"connect failed: {exc or type(exc).__name__}")
+                return
+            health.connected_once = True
+        try:
+            started = time.perf_counter()
+            await asyncio.wait_for(
+                node.send(method="GET", path="version", include_version=False, ignore_if_available=True),
+                timeout,
+            )
+            rest_ms = (time.perf_counter() - started) * 1000
+            # _websocket is private to pomice; without it there is nothing to ping.
+            websocket = getattr(node, "_websocket", None)
+            if websocket is None or not hasattr(websocket, "ping"):
+                raise RuntimeError("no websocket to ping")
+            started = time.perf_counter()
+            pong = await websocket.ping()
+            await asyncio.wait_for(pong, timeout)
+            ws_ms = (time.perf_counter() - started) * 1000
+        except Exception as exc:
+            self._mark_node_unhealthy(node, health, f"probe failed: {exc or type(exc).__name__}")
+            if node.player_count:
+                await self._failover_node(node)
+            return
+        health.latency.append((time.time(), round(rest_ms, 1), round(ws_ms, 1)))
+        if not health.healthy:
+            self.logger.info("Lavalink node %s is healthy (REST %.0f ms, ws %.0f ms).", node._identifier, rest_ms, ws_ms)
+        health.healthy = True
+        health.failures = 0
+        health.last_error = None
+        node._available = True
+        if not self._queues_restored and self._restore_task is None and self.bot.is_ready():
+            # No node was up at on_ready; resume saved queues now that one is.
+            self._restore_task = asyncio.create_task(self._restore_guild_queues_once())
+
+    def _mark_node_unhealthy(self, node, health, reason):
+        node._available = False
+        health.healthy = False
+        health.failures += 1
+        health.last_error = reason
+        delay = min(self.node_backoff_cap, self.node_probe_interval * 2 ** (health.failures - 1))
+        # Equal jitter: never retry sooner than half the delay, and spread nodes apart.
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        health.next_attempt = time.monotonic() + delay
+        self.logger.warning(
+            "Lavalink node %s is unhealthy (%s); next attempt in %.0f s.",
+            node._identifier,
+            reason,
+            delay,
+        )
+
+    def _voice_region(self, channel):
+        region = getattr(channel, "rtc_region", None)
+        return str(region).lower() if region else None
+
+    def _node_penalty(self, node, region=None):
+        """Lavalink-style load penalty for ``node``; lower is better."""
+        players = node.player_count
+        penalty = 0.0
+        stats = getattr(node, "stats", None)
+        if stats is not None:
+            players = max(players, stats.players_active or 0)
+            penalty += 1.05 ** (100 * (stats.cpu_system_load or 0.0)) * 10 - 10
+        frames = getattr(node, "frame_stats", None)
+        if frames:
+            deficit = max(0, frames.get("deficit") or 0)
+            nulled = max(0, frames.get("nulled") or 0)
+            penalty += 1.03 ** (500 * deficit / 3000) * 600 - 600
+            penalty += (1.03 ** (500 * nulled / 3000) * 300 - 300) * 2
+        node_region = getattr(node, "region", None)
+        if region and node_region and not region.startswith(node_region.lower()):
+            penalty += self.NODE_REGION_PENALTY
+        return penalty + players
+
+    def _select_node(self, region=None, exclude=None):
+        if not self.pomice_pool:
+            return None
+        candidates = [
+            node for node in self.pomice_pool.nodes.values()
+            if node is not exclude and node._available and node.is_connected
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda node: self._node_penalty(node, region))
+
+    def node_load_report(self):
+        report = []
+        if not self.pomice_pool:
+            return report
+        for identifier, node in self.pomice_pool.nodes.items():
+            stats = getattr(node, "stats", None)
+            frames = getattr(node, "frame_stats", None) or {}
+            health = self.node_health.get(identifier) or NodeHealth()
+            recent = list(health.latency)[-10:]
+            report.append({
+                "node": identifier,
+                "region": getattr(node, "region", None),
+                "available": bool(node._available and node.is_connected),
+                "players": node.player_count,
+                "cpu": stats.cpu_system_load if stats is not None else None,
+                "frame_deficit": frames.get("deficit"),
+                "penalty": round(self._node_penalty(node), 1),
+                "healthy": health.healthy,
+                "failures": health.failures,
+                "last_error": health.last_error,
+                "rest_ms": sum(sample[1] for sample in recent) / len(recent) if recent else None,
+                "ws_ms": sum(sample[2] for sample in recent) / len(recent) if recent else None,
+            })
+        return report
+
+    async def _migrate_player(self, player, target):
+        paused = player.is_paused
+        if player.current:
+            # Re-sends the current track with the player's position to the new node.
+            await player._swap_node(new_node=target)
+        else:
+            player.node.players.pop(player.guild.id, None)
+            player._node = target
+            target.players[player.guild.id] = player
+            await player._refresh_endpoint_uri(target._session_id)
+            await player._dispatch_voice_update()
+        if paused:
+            await player.set_pause(True)
+
+    async def _failover_node(self, node):
+        players = list(node.players.values())
+        if not players:
+            return
+        started = time.perf_counter()
+        moved = 0
+        for player in players:
+            target = self._select_node(self._voice_region(player.channel), exclude=node)
+            if target is None:
+                self.logger.warning("No healthy Lavalink node to move guild %s to.", player.guild.id)
+                break
+            try:
+                await self._migrate_player(player, target)
+                moved += 1
+            except Exception as exc:
+                self.logger.warning("Could not move guild %s off node %s: %s", player.guild.id, node._identifier, exc)
+        elapsed = time.perf_counter() - started
+        self.node_migrations.append({
+            "node": node._identifier,
+            "players": len(players),
+            "moved": moved,
+            "seconds": elapsed,
+            "at": time.time(),
+        })
+        self.metrics.dirty = True
+        self.logger.info(
+            "Moved %s/%s player(s) off Lavalink node %s in %.0f ms.",
+            moved,
+            len(players),
+            node._identifier,
+            elapsed * 1000,
+        )
 
     def _should_use_pomice(self):
-        return bool(pomice and self.pomice_pool and self.pomice_nodes and self._pomice_nodes_ready)
+        if not (pomice and self.pomice_pool and self.pomice_nodes and self._pomice_nodes_ready):
+            return False
+        return any(node._available for node in self.pomice_pool.nodes.values())
 
     def _vc_is_playing(self, voice_client):
         if not voice_client:
@@ -358,23 +1603,50 @@ class Music(commands.Cog):
             return None
         state = self.guild_states.get(guild.id)
         if state is None:
-            state = GuildPlaybackState()
+            state = GuildPlaybackState(guild.id)
             self.guild_states[guild.id] = state
+        state.last_active = time.time()
         return state
 
     def _should_leave_voice(self, voice_client):
         if voice_client is None or voice_client.channel is None:
             return False
-        members = [
-            member for member in voice_client.channel.members
-            if member.id != voice_client.user.id and not member.bot
-        ]
-        return len(members) == 0
+        return self._channel_listener_count(voice_client.channel) == 0
 
     def _voice_listener_count(self, voice_client):
         if voice_client is None or voice_client.channel is None:
             return 0
-        return sum(1 for member in voice_client.channel.members if not member.bot)
+        return self._channel_listener_count(voice_client.channel)
+
+    def _channel_listeners(self, channel):
+        """Ids of the human members in ``channel``.
+
+        Seeded from ``channel.members`` on first use, then kept current by
+        ``_move_listener``; an empty channel keeps its empty set, so checking
+        it again does not rescan its members. Sets make a replayed join or
+        leave harmless, since the event may land after a read that already
+        saw it in the cache.
+        """
+        listeners = self._listeners.get(channel.id)
+        if listeners is None:
+            listeners = {member.id for member in channel.members if not member.bot}
+            self._listeners[channel.id] = listeners
+        return listeners
+
+    def _channel_listener_count(self, channel):
+        if channel is None:
+            return 0
+        return len(self._channel_listeners(channel))
+
+    def _move_listener(self, member_id, before_channel, after_channel):
+        if before_channel is not None:
+            listeners = self._listeners.get(before_channel.id)
+            if listeners is not None:
+                listeners.discard(member_id)
+        if after_channel is not None:
+            listeners = self._listeners.get(after_channel.id)
+            if listeners is not None:
+                listeners.add(member_id)
 
     def _skip_votes_required(self, listener_count):
         return max(1, (listener_count // 2) + 1)
@@ -460,25 +1732,28 @@ class Music(commands.Cog):
         state.idle_disconnect_task = asyncio.create_task(_task())
 
     async def _stop_playback_due_to_empty(self, guild, state):
+        """Actor handler: drop the queue and leave an empty voice channel."""
         if not guild or not state:
             return
-        async with state.lock:
-            pending_entries = list(state.queue)
-            state.queue.clear()
-            current_entry = state.current_entry
-            state.current_entry = None
-            state.is_playing = False
+        state.queue.clear()
+        current_entry = state.current_entry
+        state.current_entry = None
+        state.is_playing = False
+        self._queue_changed(state)
         if current_entry:
-            current_entry['stopped_due_to_empty_vc'] = True
+            current_entry.stopped_due_to_empty_vc = True
             self._cancel_now_playing_timestamp_updates(current_entry)
         voice_client = guild.voice_client
         if voice_client:
-            if self._vc_is_playing(voice_client):
-                voice_client.stop()
-            try:
-                await voice_client.disconnect()
-            except (discord.HTTPException, discord.Forbidden):
-                pass
+            self._post_voice_io(state, self._leave_empty_voice, voice_client)
+
+    async def _leave_empty_voice(self, voice_client):
+        if self._vc_is_playing(voice_client):
+            voice_client.stop()
+        try:
+            await voice_client.disconnect()
+        except (discord.HTTPException, discord.Forbidden):
+            pass
 
     def _schedule_empty_voice_shutdown(self, guild, state):
         if not guild or not state:
@@ -494,7 +1769,7 @@ class Music(commands.Cog):
                     return
                 if not self._should_leave_voice(voice_client):
                     return
-                await self._stop_playback_due_to_empty(guild, state)
+                state.actor.post(self._stop_playback_due_to_empty, guild, state)
             except asyncio.CancelledError:
                 return
             except (discord.HTTPException, discord.Forbidden):
@@ -536,33 +1811,70 @@ class Music(commands.Cog):
     async def _delete_loading_message(self, entry):
         if not entry:
             return
-        msg = entry.pop('loading_message', None)
+        msg = entry.loading_message
+        entry.loading_message = None
         await self._safe_delete_message(msg)
 
     def _build_queue_added_embed(self, entry, position):
-        title = entry.get('title') or entry['url']
-        metadata = entry.get('metadata') or {}
+        title = entry.title or entry.url
         embed = discord.Embed(
             title="Track queued",
             description=title,
             color=discord.Color.green()
         )
         embed.add_field(name="Position", value=f"#{position}", inline=True)
-        duration = metadata.get('duration')
+        state = entry.state
+        if state and state.current_entry is not None:
+            eta = self._queue_eta(state, position - 1)
+            embed.add_field(name="Plays in", value=f"~{self._format_duration(eta)}", inline=True)
+        duration = entry.duration
         if duration:
             embed.add_field(name="Duration", value=self._format_duration(duration), inline=True)
-        requester = entry.get('requester')
+        requester = entry.requester
         if requester:
             embed.add_field(name="Requested by", value=requester.display_name, inline=True)
-        uploader = metadata.get('uploader')
+        uploader = entry.info("author")
         if uploader:
             embed.add_field(name="Uploader", value=uploader, inline=True)
-        thumbnail = metadata.get('thumbnail')
+        thumbnail = entry.info("thumbnail")
         if thumbnail:
             embed.set_thumbnail(url=thumbnail)
-        embed.set_footer(text="Added to queue")
+        embed.set_footer(text="Looking up track..." if entry.pending else "Added to queue")
         return embed
 
+    def _build_playlist_embed(self, name, entries, position, requester, skipped=0):
+        embed = discord.Embed(
+            title="Playlist queued",
+            description=discord.utils.escape_markdown(name or "Unknown playlist"),
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Tracks", value=str(len(entries)), inline=True)
+        if position is not None:
+            embed.add_field(name="Positions", value=f"#{position}-#{position + len(entries) - 1}", inline=True)
+        total = sum(_entry_duration(entry) for entry in entries)
+        if total:
+            embed.add_field(name="Duration", value=self._format_duration(total), inline=True)
+        if requester:
+            embed.add_field(name="Requested by", value=requester.display_name, inline=True)
+        footer = "Added to queue"
+        if skipped:
+            footer += f", {skipped} track(s) over the {self.playlist_limit}-track limit were skipped"
+        embed.set_footer(text=footer)
+        return embed
+
+    def _current_remaining(self, state):
+        entry = state.current_entry if state else None
+        if not entry:
+            return 0
+        duration = entry.duration
+        if not duration:
+            return 0
+        return max(0, duration - (self._get_elapsed_time(entry) or 0))
+
+    def _queue_eta(self, state, index):
+        """Seconds until the entry at 0-based ``index`` starts, from known durations."""
+        return self._current_remaining(state) + state.queue.prefix_weight(index)
+
     def _build_status_embed(self, title, description=None, *, color=None, footer=None):
         embed = discord.Embed(
             title=title,
@@ -573,7 +1885,7 @@ class Music(commands.Cog):
         return embed
 
     def _get_elapsed_time(self, entry):
-        start_time = entry.get('start_time')
+        start_time = entry.start_time
         if not start_time:
             return None
         elapsed = time.time() - start_time
@@ -591,8 +1903,7 @@ class Music(commands.Cog):
         return "▰" * filled + "▱" * empty
 
     def _build_progress_value(self, entry):
-        metadata = entry.get('metadata') or {}
-        duration = metadata.get('duration')
+        duration = entry.duration
         elapsed = self._get_elapsed_time(entry)
         if duration:
             elapsed = elapsed or 0.0
@@ -607,22 +1918,21 @@ class Music(commands.Cog):
         return "Waiting to start"
 
     def _build_now_playing_embed(self, entry, queue_length, loop_mode):
-        title = entry.get('title') or entry['url']
-        metadata = entry.get('metadata') or {}
-        link = metadata.get('webpage_url') or entry.get('url')
+        title = entry.title or entry.url
+        link = entry.link
         embed = discord.Embed(
             title=title,
             url=link,
             description="Now playing",
             color=discord.Color.blurple()
         )
-        requester_display = entry['requester'].display_name
+        requester = entry.requester
         avatar_url = None
         try:
-            avatar_url = entry['requester'].display_avatar.url
+            avatar_url = requester.display_avatar.url
         except AttributeError:
             avatar_url = None
-        embed.set_author(name=requester_display, icon_url=avatar_url)
+        embed.set_author(name=entry.requester_name, icon_url=avatar_url)
         upcoming = max(0, queue_length)
         embed.add_field(
             name="Queue length",
@@ -634,17 +1944,17 @@ class Music(commands.Cog):
             value=loop_mode.capitalize(),
             inline=True
         )
-        thumbnail = metadata.get('thumbnail')
+        thumbnail = entry.info("thumbnail")
         if thumbnail:
             embed.set_thumbnail(url=thumbnail)
-        duration = metadata.get('duration')
+        duration = entry.duration
         if duration:
             embed.add_field(
                 name="Duration",
                 value=self._format_duration(duration),
                 inline=True
             )
-        uploader = metadata.get('uploader')
+        uploader = entry.info("author")
         if uploader:
             embed.add_field(
                 name="Uploader",
@@ -661,91 +1971,167 @@ class Music(commands.Cog):
         return embed
 
     def _format_queue_entry_title(self, entry):
-        metadata = entry.get('metadata') or {}
-        title = entry.get('title') or metadata.get('title') or entry.get('url') or "Unknown title"
-        link = metadata.get('webpage_url') or entry.get('url')
+        title = entry.title or entry.url or "Unknown title"
+        link = entry.link
         safe_title = discord.utils.escape_markdown(title)
         if link and (link.startswith("http://") or link.startswith("https://")):
             return f"[{safe_title}]({link})"
         return safe_title
 
     async def _refresh_now_playing_embed(self, entry, state):
+        """Edit the now-playing message if its rendered content changed.
+
+        Returns "edited", "unchanged", "backed_off" or "failed".
+        """
         if not state or state.current_entry is not entry:
-            return
-        message = entry.get('now_playing_message')
+            return "unchanged"
+        message = entry.now_playing_message
         if not message:
-            return
+            return "unchanged"
+        channel_id = getattr(message.channel, "id", None)
+        backoff = self._np_channel_backoff.get(channel_id)
+        if backoff and time.monotonic() < backoff[0]:
+            return "backed_off"
         embed = self._build_now_playing_embed(entry, len(state.queue), state.loop_mode)
-        view = entry.get('now_playing_view')
+        view = entry.now_playing_view
         if view:
-            guild = entry.get('guild')
+            guild = entry.guild
             voice_client = guild.voice_client if guild else None
             view.sync_play_pause(voice_client)
+        signature = hash((
+            json.dumps(embed.to_dict(), sort_keys=True),
+            view.play_pause_button.label if view else None,
+        ))
+        if signature == entry.now_playing_signature:
+            return "unchanged"
+        started = time.monotonic()
         try:
             await message.edit(embed=embed, view=view)
-            entry['last_embed_edit'] = time.time()
-        except discord.HTTPException:
-            pass
+        except discord.HTTPException as exc:
+            if exc.status == 429:
+                self._back_off_channel(channel_id)
+            return "failed"
+        entry.last_embed_edit = time.time()
+        entry.now_playing_signature = signature
+        # discord.py waits out rate limits inside edit(); a slow edit means this channel is saturated.
+        if time.monotonic() - started > self.now_playing_interval / 2:
+            self._back_off_channel(channel_id)
+        else:
+            self._np_channel_backoff.pop(channel_id, None)
+        return "edited"
 
-    async def _timestamp_update_loop(self, entry, state):
-        try:
-            while True:
-                await asyncio.sleep(10)
-                if not state or state.current_entry is not entry:
-                    break
-                await self._refresh_now_playing_embed(entry, state)
-        except asyncio.CancelledError:
-            pass
-        finally:
-            entry.pop('timestamp_task', None)
+    def _back_off_channel(self, channel_id):
+        previous = self._np_channel_backoff.get(channel_id)
+        delay = min(120, previous[1] * 2) if previous else self.now_playing_interval
+        self._np_channel_backoff[channel_id] = (time.monotonic() + delay, delay)
 
     def _start_now_playing_timestamp_updates(self, entry, state):
-        if not entry:
-            return
-        task = entry.get('timestamp_task')
-        if task and not task.done():
+        if not entry or entry.np_token is not None:
             return
-        entry['timestamp_task'] = asyncio.create_task(self._timestamp_update_loop(entry, state))
+        token = next(self._np_sequence)
+        entry.np_token = token
+        # A random first slot spreads guilds across the interval instead of bursting together.
+        due = time.monotonic() + random.uniform(0, self.now_playing_interval)
+        heapq.heappush(self._np_schedule, (due, token, entry, state))
+        self._np_wakeup.set()
+        if self._np_task is None or self._np_task.done():
+            self._np_task = asyncio.create_task(self._now_playing_scheduler())
 
     def _cancel_now_playing_timestamp_updates(self, entry):
         if not entry:
             return
-        task = entry.pop('timestamp_task', None)
-        if task and not task.done():
-            task.cancel()
+        # The scheduler drops heap items whose token no longer matches.
+        entry.np_token = None
+
+    async def _now_playing_scheduler(self):
+        """The one task that refreshes every now-playing message."""
+        while True:
+            if not self._np_schedule:
+                self._np_wakeup.clear()
+                await self._np_wakeup.wait()
+                continue
+            delay = self._np_schedule[0][0] - time.monotonic()
+            if delay > 0:
+                self._np_wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._np_wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            due, token, entry, state = heapq.heappop(self._np_schedule)
+            if entry.np_token != token:
+                continue
+            if state.current_entry is not entry:
+                entry.np_token = None
+                continue
+            heapq.heappush(self._np_schedule, (due + self.now_playing_interval, token, entry, state))
+            if entry.np_refreshing:
+                continue
+            entry.np_refreshing = True
+            await self._np_edit_slots.acquire()
+            asyncio.create_task(self._scheduled_refresh(entry, state))
+
+    async def _scheduled_refresh(self, entry, state):
+        try:
+            outcome = await self._refresh_now_playing_embed(entry, state)
+        except Exception:
+            self.logger.exception("Now-playing refresh failed.")
+            outcome = "failed"
+        finally:
+            entry.np_refreshing = False
+            self._np_edit_slots.release()
+        self.now_playing_counts[outcome] += 1
+        now = time.monotonic()
+        if outcome == "edited":
+            self._np_edit_times.append(now)
+        edits = self.now_playing_edits_per_minute()
+        if now - self._np_reported_at >= 60:
+            self._np_reported_at = now
+            self.logger.info(
+                "Now-playing refreshes: %s edits/min (totals: %s).",
+                edits,
+                ", ".join(f"{key} {value}" for key, value in self.now_playing_counts.items()),
+            )
+
+    def now_playing_edits_per_minute(self):
+        cutoff = time.monotonic() - 60
+        while self._np_edit_times and self._np_edit_times[0] < cutoff:
+            self._np_edit_times.popleft()
+        return len(self._np_edit_times)
 
     async def _send_now_playing_embed(self, text_channel, entry, state, embed, view, replace=False):
-        existing = entry.get('now_playing_message')
+        existing = entry.now_playing_message
         if replace and existing:
             try:
                 await existing.delete()
             except discord.HTTPException:
                 pass
-            entry.pop('now_playing_message', None)
+            entry.now_playing_message = None
             existing = None
         now = time.time()
-        last_edit = entry.get('last_embed_edit', 0)
-        force_refresh = entry.pop('force_embed_refresh', False)
+        last_edit = entry.last_embed_edit
+        force_refresh = entry.force_embed_refresh
+        entry.force_embed_refresh = False
         if existing:
             if not force_refresh and now - last_edit < 5:
                 return existing
         if existing:
             try:
-                entry['now_playing_view'] = view
+                entry.now_playing_view = view
                 await existing.edit(embed=embed, view=view)
-                entry['last_embed_edit'] = now
+                entry.last_embed_edit = now
                 self._start_now_playing_timestamp_updates(entry, state)
                 return existing
             except discord.HTTPException:
                 pass
         msg = await text_channel.send(embed=embed, view=view)
-        entry['now_playing_message'] = msg
-        entry['last_embed_edit'] = now
-        entry['now_playing_view'] = view
+        entry.now_playing_message = msg
+        entry.last_embed_edit = now
+        entry.now_playing_view = view
         self._start_now_playing_timestamp_updates(entry, state)
         return msg
 
-    def _build_queue_embed(self, state):
+    def _build_queue_embed(self, state, page=1):
         embed = discord.Embed(title="Queue", color=discord.Color.green())
         if not state:
             embed.description = "Nothing is playing right now."
@@ -753,7 +2139,7 @@ class Music(commands.Cog):
 
         current = state.current_entry
         if current:
-            now_requester = current['requester'].display_name
+            now_requester = current.requester_name
             now_title = self._format_queue_entry_title(current)
             embed.add_field(
                 name="Now playing",
@@ -764,11 +2150,15 @@ class Music(commands.Cog):
             embed.description = "Nothing is playing right now."
 
         queue_lines = []
-        for idx, entry in enumerate(list(state.queue)[:10], start=1):
-            title = entry.get('title') or entry['url']
-            requester = entry['requester'].display_name
+        pages = max(1, -(-len(state.queue) // self.QUEUE_PAGE_SIZE))
+        page = min(max(1, page), pages)
+        start = (page - 1) * self.QUEUE_PAGE_SIZE
+        for idx, entry in enumerate(state.queue[start:start + self.QUEUE_PAGE_SIZE], start=start + 1):
+            title = entry.title or entry.url
+            requester = entry.requester_name
             queue_title = self._format_queue_entry_title(entry)
-            queue_lines.append(f"{idx}. {queue_title} ({requester})")
+            eta = self._format_duration(self._queue_eta(state, idx - 1))
+            queue_lines.append(f"{idx}. {queue_title} ({requester}), plays in ~{eta}")
         if queue_lines:
             embed.add_field(
                 name="Upcoming",
@@ -782,7 +2172,13 @@ class Music(commands.Cog):
                 inline=False,
             )
 
-        embed.set_footer(text=f"Loop mode: {state.loop_mode.capitalize()}, total {len(state.queue)} tracks waiting")
+        embed.set_footer(
+            text=(
+                f"Loop mode: {state.loop_mode.capitalize()}, total {len(state.queue)} tracks waiting"
+                f" (~{self._format_duration(state.queue.total_weight())})"
+                f" | Page {page}/{pages}"
+            )
+        )
         return embed
 
     def _build_usage_embed(self, usage, example=None):
@@ -799,6 +2195,7 @@ class Music(commands.Cog):
 
     @commands.command(aliases=["p"])
     async def play(self, ctx, *, url):
+        ack_started = time.perf_counter()
         self.logger.info(f"Play command invoked by {ctx.author} in {ctx.guild.name}")
         if not pomice:
             await ctx.send("Lavalink is not available. Pomice is not installed.")
@@ -815,36 +2212,31 @@ class Music(commands.Cog):
         if not url or not url.strip():
             await ctx.send("Please provide a URL to play.")
             return
-        await self._safe_delete_message(ctx.message)
-
-        entry = {
-            'url': url,
-            'requester': ctx.author,
-            'guild': ctx.guild,
-            'voice_channel': voice_channel,
-            'text_channel': ctx.channel,
-            'title': None,
-            'metadata': None,
-            'loading_message': None,
-            'state': None,
-        }
-        pomice_track = await self._resolve_pomice_track(entry, ctx)
-        if pomice_track:
-            entry['pomice_track'] = pomice_track
 
         state = self._get_state(ctx.guild)
-        entry['state'] = state
-        state.manual_disconnect = False
-        async with state.lock:
-            queue_position = len(state.queue) + 1
-            state.queue.append(entry)
-            should_ack_queue = len(state.queue) > 1 or state.is_playing
+        entry = QueueEntry(
+            self.bot,
+            url,
+            guild_id=ctx.guild.id,
+            requester_id=ctx.author.id,
+            voice_channel_id=voice_channel.id,
+            text_channel_id=ctx.channel.id,
+            state=state,
+            pending=True,
+        )
+        entry.requested_at = ack_started
+        # Queue before resolving so the queue follows command order, not lookup order.
+        queue_position, should_ack_queue = await state.actor.ask(self._enqueue, state, entry)
+        entry.resolve_task = asyncio.create_task(self._resolve_pending_entry(entry, state, ctx))
+        if should_ack_queue:
+            # Time spent waiting behind other tracks is not command-to-audio latency.
+            entry.requested_at = None
 
         if not should_ack_queue:
-            track_line = entry['url'] if not entry.get('title') else self._format_queue_entry_title(entry)
+            track_line = entry.url if not entry.title else self._format_queue_entry_title(entry)
             description = (
                 f"{track_line}\n"
-                f"Requested by {entry['requester'].display_name}"
+                f"Requested by {entry.requester_name}"
             )
             embed = self._build_status_embed(
                 "Loading track...",
@@ -852,12 +2244,179 @@ class Music(commands.Cog):
                 color=discord.Color.orange(),
                 footer="Preparing your playback"
             )
-            entry['loading_message'] = await ctx.send(embed=embed)
+            entry.loading_message = await ctx.send(embed=embed)
         else:
             embed = self._build_queue_added_embed(entry, queue_position)
-            await ctx.send(embed=embed)
+            entry.queued_message = await ctx.send(embed=embed)
+        self._record_play_ack(ctx.guild.id, time.perf_counter() - ack_started)
+        await self._safe_delete_message(ctx.message)
+
+        state.actor.post(self._start_next_in_queue, state, ctx.guild)
+
+    async def _enqueue(self, state, entry):
+        """Actor handler: append ``entry``; returns its position and whether something is ahead of it."""
+        state.manual_disconnect = False
+        state.queue.append(entry)
+        self._queue_changed(state)
+        return len(state.queue), len(state.queue) > 1 or state.is_playing
+
+    def _record_play_ack(self, guild_id, elapsed):
+        self.metrics.record("ack", elapsed, guild_id=guild_id)
+        histogram = self.metrics.overall["ack"]
+        self.logger.debug(
+            "Acked ?play in %.1f ms (p50 <= %.0f ms, p95 <= %.0f ms over %s).",
+            elapsed * 1000,
+            histogram.percentile(0.5),
+            histogram.percentile(0.95),
+            histogram.total,
+        )
+
+    def _record_track_gap(self, state, node, elapsed, readiness):
+        self.prefetch_counts[readiness] += 1
+        self.metrics.record("gap", elapsed, guild_id=state.guild_id, node=node)
+        histogram = self.metrics.overall["gap"]
+        self.logger.debug(
+            "Track gap %.1f ms with a %s entry (p50 <= %.0f ms, p95 <= %.0f ms over %s).",
+            elapsed * 1000,
+            readiness,
+            histogram.percentile(0.5),
+            histogram.percentile(0.95),
+            histogram.total,
+        )
+
+    def _format_stage_latencies(self, histograms):
+        lines = []
+        for stage in PlaybackMetrics.STAGES:
+            histogram = histograms.get(stage)
+            if not histogram:
+                continue
+            lines.append(
+                f"`{stage:<16}` {histogram.percentile(0.5):.0f} / {histogram.percentile(0.95):.0f}"
+                f" / {histogram.max_ms:.0f} ({histogram.total})"
+            )
+        return "\n".join(lines) or "No samples yet."
+
+    def _queue_position(self, state, entry):
+        try:
+            return state.queue.index(entry) + 1
+        except ValueError:
+            return None
+
+    async def _resolve_pending_entry(self, entry, state, ctx=None, refresh=False):
+        announced = bool(entry.title)
+        playlist = None
+        try:
+            result = await self._resolve_pomice_track(entry, ctx, refresh=refresh)
+            track = self._extract_pomice_track(result)
+            if track:
+                entry.resolved_at = time.monotonic()
+                entry.resolve_failures = 0
+                self._queue_changed(state)
+                if pomice and isinstance(result, pomice.Playlist):
+                    playlist = result
+                    # Each playlist track links back to the whole playlist; drop that so a
+                    # queued entry does not keep every other track alive.
+                    track.playlist = None
+                    # Re-resolving this entry later should give back its own track, not the playlist.
+                    entry.url = track.uri or entry.url
+            else:
+                entry.resolve_failures = entry.resolve_failures + 1
+        finally:
+            entry.pending = False
+        if playlist is not None:
+            # Ingesting waits on the guild's actor, which may itself be waiting on this lookup.
+            task = asyncio.create_task(self._ingest_playlist(entry, state, playlist))
+            self._playlist_tasks.add(task)
+            task.add_done_callback(self._playlist_tasks.discard)
+            return
+        message = entry.queued_message
+        if announced or not message or not entry.title:
+            return
+        position = self._queue_position(state, entry)
+        if position is None:
+            return
+        try:
+            await message.edit(embed=self._build_queue_added_embed(entry, position))
+        except discord.HTTPException:
+            pass
 
-        await self._start_next_in_queue(state, ctx.guild)
+    def _playlist_entry(self, parent, track):
+        record = self._track_record(track)
+        if record is None:
+            return parent.copy_for(track.uri or parent.url, track.title)
+        return parent.copy_for(track.uri or parent.url, track.title, record[0], self._compact_track_info(track))
+
+    async def _ingest_playlist(self, entry, state, playlist):
+        """Queue the rest of ``playlist`` right after ``entry``, one chunk per lock hold.
+
+        Playlist entries keep only the encoded track and its info tuple; the
+        ``pomice.Track`` is built by ``_entry_track`` when the entry plays.
+        """
+        tracks = playlist.tracks
+        name = playlist.name
+        skipped = max(0, len(tracks) - self.playlist_limit)
+        first_position = self._queue_position(state, entry)
+        queued = [entry]
+        anchor = entry
+        for start in range(1, min(len(tracks), self.playlist_limit), self.PLAYLIST_CHUNK):
+            chunk = [
+                self._playlist_entry(entry, track)
+                for track in tracks[start:min(start + self.PLAYLIST_CHUNK, self.playlist_limit)]
+            ]
+            if not await state.actor.ask(self._insert_after, state, anchor, chunk):
+                break
+            queued.extend(chunk)
+            anchor = chunk[-1]
+            await asyncio.sleep(0)
+        self._queue_changed(state)
+        self._prefetch_upcoming(state)
+        embed = self._build_playlist_embed(name, queued, first_position, entry.requester, skipped)
+        message = entry.queued_message
+        try:
+            if message:
+                await message.edit(embed=embed)
+            else:
+                await entry.text_channel.send(embed=embed)
+        except (discord.HTTPException, discord.Forbidden):
+            pass
+
+    def _prefetch_upcoming(self, state):
+        """Keep the next few queued entries resolved so a transition is only ``player.play``."""
+        if not state or self.prefetch_depth <= 0:
+            return
+        now = time.monotonic()
+        for entry in itertools.islice(state.queue, self.prefetch_depth):
+            task = entry.resolve_task
+            if task and not task.done():
+                continue
+            if entry.resolve_failures >= self.PREFETCH_MAX_FAILURES:
+                continue
+            resolved = entry.resolved
+            expired = resolved and now - (entry.resolved_at or now) > self.prefetch_max_age
+            if resolved and not expired:
+                continue
+            entry.resolve_task = asyncio.create_task(self._resolve_pending_entry(entry, state, refresh=expired))
+
+    async def _insert_after(self, state, anchor, entries):
+        """Actor handler: insert ``entries`` right after ``anchor``; False if it left the queue."""
+        if state.current_entry is anchor:
+            index = 0
+        else:
+            index = self._queue_position(state, anchor)
+            if index is None:
+                return False
+        for offset, item in enumerate(entries):
+            state.queue.insert(index + offset, item)
+        return True
+
+    async def _wait_for_resolution(self, entry):
+        task = entry.resolve_task
+        if not task or task.done():
+            return
+        try:
+            await asyncio.shield(task)
+        except Exception:
+            pass
 
     @play.error
     async def play_error(self, ctx, error):
@@ -874,23 +2433,7 @@ class Music(commands.Cog):
         if not state:
             await ctx.send("Nothing is queued right now.")
             return
-        self._cancel_idle_disconnect(state)
-        self._cancel_empty_voice_shutdown(state)
-        async with state.lock:
-            pending_entries = list(state.queue)
-            state.queue.clear()
-            state.is_playing = False
-
-        current_entry = state.current_entry
-        self._cancel_now_playing_timestamp_updates(current_entry)
-        state.current_entry = None
-        if ctx.voice_client:
-            if self._vc_is_playing(ctx.voice_client) or self._vc_is_paused(ctx.voice_client):
-                self.logger.info("Stopping playback.")
-                if self._is_pomice_player(ctx.voice_client):
-                    await ctx.voice_client.stop()
-                else:
-                    ctx.voice_client.stop()
+        await state.actor.ask(self._clear_queue, state, ctx.voice_client)
         embed = self._build_status_embed(
             "Queue cleared",
             "Stopped playback and cleared the queue.",
@@ -899,6 +2442,25 @@ class Music(commands.Cog):
         )
         await ctx.send(embed=embed)
 
+    async def _clear_queue(self, state, voice_client):
+        """Actor handler: empty the queue and stop the current track."""
+        self._cancel_idle_disconnect(state)
+        self._cancel_empty_voice_shutdown(state)
+        state.queue.clear()
+        state.is_playing = False
+        self._cancel_now_playing_timestamp_updates(state.current_entry)
+        state.current_entry = None
+        self._queue_changed(state)
+        if voice_client:
+            self._post_voice_io(state, self._stop_player, voice_client)
+
+    async def _stop_player(self, voice_client):
+        if self._vc_is_playing(voice_client) or self._vc_is_paused(voice_client):
+            self.logger.info("Stopping playback.")
+            if self._is_pomice_player(voice_client):
+                await voice_client.stop()
+            else:
+                voice_client.stop()
 
     @commands.command()
     async def leave(self, ctx):
@@ -907,23 +2469,9 @@ class Music(commands.Cog):
         if not state:
             await ctx.send("Nothing is queued right now.")
             return
-        self._cancel_idle_disconnect(state)
-        self._cancel_empty_voice_shutdown(state)
-        async with state.lock:
-            pending_entries = list(state.queue)
-            state.queue.clear()
-            state.is_playing = False
-            state.manual_disconnect = True
-
-        if ctx.voice_client:
-            self.logger.info("Disconnecting from voice channel.")
-            await ctx.voice_client.disconnect()
-        else:
+        if not await state.actor.ask(self._leave_voice, state, ctx.voice_client):
             self.logger.warning("Not in a voice channel.")
             await ctx.send("I am not in a voice channel.")
-        current_entry = state.current_entry
-        self._cancel_now_playing_timestamp_updates(current_entry)
-        state.current_entry = None
         embed = self._build_status_embed(
             "Disconnected",
             "Left voice channel and cleared the queue.",
@@ -932,11 +2480,27 @@ class Music(commands.Cog):
         )
         await ctx.send(embed=embed)
 
+    async def _leave_voice(self, state, voice_client):
+        """Actor handler: empty the queue and disconnect; False when not in voice."""
+        self._cancel_idle_disconnect(state)
+        self._cancel_empty_voice_shutdown(state)
+        state.queue.clear()
+        state.is_playing = False
+        state.manual_disconnect = True
+        self._cancel_now_playing_timestamp_updates(state.current_entry)
+        state.current_entry = None
+        self._queue_changed(state)
+        if not voice_client:
+            return False
+        self.logger.info("Disconnecting from voice channel.")
+        self._post_voice_io(state, voice_client.disconnect)
+        return True
+
     @commands.command(name="queue")
-    async def queue_list(self, ctx):
-        """List the currently playing track plus upcoming songs."""
+    async def queue_list(self, ctx, page: int = 1):
+        """List the currently playing track plus upcoming songs, ten per page."""
         state = self._get_state(ctx.guild)
-        embed = self._build_queue_embed(state)
+        embed = self._build_queue_embed(state, page)
         await ctx.send(embed=embed)
 
     @commands.command(name="remove")
@@ -946,25 +2510,30 @@ class Music(commands.Cog):
         if not state:
             await ctx.send("Nothing is queued right now.")
             return
-        async with state.lock:
-            if not state.queue:
-                await ctx.send("Queue is empty.")
-                return
-            if pos < 1 or pos > len(state.queue):
-                await ctx.send(f"Position must be between 1 and {len(state.queue)}.")
-                return
-            queue_list = list(state.queue)
-            removed = queue_list.pop(pos - 1)
-            state.queue = deque(queue_list)
-        title = removed.get('title') or removed.get('url')
+        removed, error = await state.actor.ask(self._remove_at, state, pos)
+        if error:
+            await ctx.send(error)
+            return
+        title = removed.title or removed.url
         embed = self._build_status_embed(
             "Removed from queue",
-            f"{title}\nRequested by {removed['requester'].display_name}",
+            f"{title}\nRequested by {removed.requester_name}",
             color=discord.Color.orange(),
             footer=f"Removed position #{pos}"
         )
         await ctx.send(embed=embed)
 
+    async def _remove_at(self, state, pos):
+        """Actor handler: pop the 1-based ``pos``; returns ``(entry, error)``."""
+        if not state.queue:
+            return None, "Queue is empty."
+        if pos < 1 or pos > len(state.queue):
+            return None, f"Position must be between 1 and {len(state.queue)}."
+        removed = state.queue.pop(pos - 1)
+        self._queue_changed(state)
+        self._prefetch_upcoming(state)
+        return removed, None
+
     @remove_from_queue.error
     async def remove_from_queue_error(self, ctx, error):
         if isinstance(error, commands.MissingRequiredArgument):
@@ -973,6 +2542,45 @@ class Music(commands.Cog):
             return
         raise error
 
+    @commands.command(name="move")
+    async def move_in_queue(self, ctx, source: int, destination: int):
+        """Move a queued track to another position (1-based)."""
+        state = self._get_state(ctx.guild)
+        if not state:
+            await ctx.send("Nothing is queued right now.")
+            return
+        moved, error = await state.actor.ask(self._move_entry, state, source, destination)
+        if error:
+            await ctx.send(error)
+            return
+        embed = self._build_status_embed(
+            "Moved in queue",
+            self._format_queue_entry_title(moved),
+            color=discord.Color.green(),
+            footer=f"#{source} -> #{destination}"
+        )
+        await ctx.send(embed=embed)
+
+    async def _move_entry(self, state, source, destination):
+        """Actor handler: move between 1-based positions; returns ``(entry, error)``."""
+        length = len(state.queue)
+        if not length:
+            return None, "Queue is empty."
+        if not (1 <= source <= length and 1 <= destination <= length):
+            return None, f"Positions must be between 1 and {length}."
+        moved = state.queue.move(source - 1, destination - 1)
+        self._queue_changed(state)
+        self._prefetch_upcoming(state)
+        return moved, None
+
+    @move_in_queue.error
+    async def move_in_queue_error(self, ctx, error):
+        if isinstance(error, commands.MissingRequiredArgument):
+            embed = self._build_usage_embed("?move <from> <to>", "?move 5 1")
+            await ctx.send(embed=embed)
+            return
+        raise error
+
     @commands.command(name="np")
     async def now_playing_command(self, ctx):
         """Re-send the now-playing embed with controls."""
@@ -988,32 +2596,156 @@ class Music(commands.Cog):
         view.sync_play_pause(ctx.guild.voice_client if ctx.guild else None)
         await self._send_now_playing_embed(ctx.channel, entry, state, embed, view, replace=True)
 
+    @commands.command(name="musicstats")
+    async def music_stats(self, ctx, guild_id: int = None):
+        """Latency per playback stage (overall, per Lavalink node and for one guild), track cache and node load (owner only)."""
+        if ctx.author.id != 255365914898333707:
+            await ctx.send("You can't use this command.")
+            return
+        if guild_id is None and ctx.guild:
+            guild_id = ctx.guild.id
+        embed = self._build_status_embed(
+            "Music latency",
+            "p50 / p95 / max in ms (samples). Percentiles are bucket upper bounds.",
+            footer=f"Written every {self.metrics_interval} s to {self.metrics.path}",
+        )
+        embed.add_field(name="All guilds", value=self._format_stage_latencies(self.metrics.overall), inline=False)
+        guild_stages = self.metrics.guilds.get(guild_id)
+        if guild_stages:
+            embed.add_field(name=f"Guild {guild_id}", value=self._format_stage_latencies(guild_stages), inline=False)
+        for node_id, stages in sorted(self.metrics.nodes.items())[:10]:
+            embed.add_field(name=f"Node {node_id}", value=self._format_stage_latencies(stages), inline=False)
+        embed.add_field(name="Track cache", value=self._format_cache_stats(self.track_cache.stats()), inline=False)
+        embed.add_field(name="Lavalink nodes", value=self._format_node_load(self.node_load_report()), inline=False)
+        if self.node_migrations:
+            embed.add_field(name="Recent failovers", value=self._format_node_migrations(self.node_migrations), inline=False)
+        await ctx.send(embed=embed)
+
+    def _format_node_load(self, report):
+        lines = []
+        for node in report[:10]:
+            status = "up" if node["available"] and node["healthy"] else f"down ({node['failures']} failures)"
+            cpu = f"{node['cpu']:.0%}" if node["cpu"] is not None else "?"
+            rest = f"{node['rest_ms']:.0f} ms" if node["rest_ms"] is not None else "?"
+            lines.append(
+                f"`{node['node']:<16}` {status}, {node['players']} players, cpu {cpu},"
+                f" REST {rest}, penalty {node['penalty']}"
+            )
+        return "\n".join(lines) or "No nodes configured."
+
+    def _format_node_migrations(self, migrations):
+        lines = []
+        for migration in list(migrations)[-5:]:
+            lines.append(
+                f"<t:{int(migration['at'])}:R> `{migration['node']}`: moved {migration['moved']}/{migration['players']}"
+                f" in {migration['seconds'] * 1000:.0f} ms"
+            )
+        return "\n".join(lines)
+
+    def _format_cache_stats(self, stats):
+        if not stats["lookups"]:
+            return "No lookups yet."
+        lines = [f"Hit rate {stats['hit_rate']:.0%} of {stats['lookups']} lookups, {stats['memory_entries']} in memory"]
+        for tier in ("memory", "disk", "miss"):
+            lines.append(f"`{tier:<16}` {stats[f'{tier}_avg_ms']:.1f} ms avg ({stats[f'{tier}_count']})")
+        return "\n".join(lines)
+
     async def _start_next_in_queue(self, state, guild):
-        async with state.lock:
-            if state.manual_disconnect:
-                return
-            if state.is_playing or not state.queue:
-                return
-            entry = state.queue.popleft()
-            state.is_playing = True
-            state.current_entry = entry
-            state.skip_votes.clear()
-            state.skip_message = None
+        """Actor handler: make the next queued entry current and start it.
+
+        If the entry's lookup is still running, a follow-up handler starts it
+        when the lookup finishes, so other commands are not held behind it.
+        """
+        if state.manual_disconnect:
+            return
+        if not state.queue:
+            state.track_ended_at = None
+            return
+        if state.is_playing:
+            return
+        entry = state.queue.popleft()
+        state.is_playing = True
+        state.current_entry = entry
+        state.skip_votes.clear()
+        state.skip_message = None
 
         self._cancel_idle_disconnect(state)
+        self._queue_changed(state)
+        self._prefetch_upcoming(state)
 
-        voice_channel = entry['voice_channel']
-        text_channel = entry['text_channel']
+        readiness = "ready" if entry.resolved else "cold"
+        task = entry.resolve_task
+        if not entry.resolved and (task is None or task.done()) and not entry.resolve_failures:
+            task = entry.resolve_task = asyncio.create_task(self._resolve_pending_entry(entry, state))
+        if task and not task.done():
+            if readiness == "ready":
+                readiness = "waited"
+            task.add_done_callback(
+                lambda _: state.actor.post(self._play_current, state, guild, entry, readiness)
+            )
+            return
+        await self._play_current(state, guild, entry, readiness)
 
+    async def _play_current(self, state, guild, entry, readiness):
+        """Actor handler: queue the voice I/O that starts ``entry`` if it is still current."""
+        if state.current_entry is not entry:
+            return
+        self._post_voice_io(state, self._start_playback, state, guild, entry, readiness)
+
+    def _post_voice_io(self, state, handler, *args):
+        """Run ``handler(*args)`` outside the actor, after the guild's earlier voice I/O.
+
+        Handlers decide on connects, plays, stops and disconnects; the calls
+        themselves go through here, so Lavalink sees them in the order they
+        were decided without commands waiting behind the network.
+        """
+        task = asyncio.create_task(self._run_voice_io(state.voice_io, handler, args))
+        state.voice_io = task
+        self._follow_up_tasks.add(task)
+        task.add_done_callback(self._follow_up_tasks.discard)
+        return task
+
+    async def _run_voice_io(self, previous, handler, args):
+        if previous is not None and not previous.done():
+            await asyncio.wait((previous,))
         try:
-            await self._play_entry_with_pomice(entry, state, guild, voice_channel, text_channel)
+            await handler(*args)
+        except Exception:
+            self.logger.exception("Voice I/O %s failed.", getattr(handler, "__name__", handler))
+
+    def _post_follow_up(self, coro):
+        """Run a Discord send (or other side effect) outside the actor."""
+        task = asyncio.create_task(coro)
+        self._follow_up_tasks.add(task)
+        task.add_done_callback(self._follow_up_tasks.discard)
+        return task
+
+    async def _start_playback(self, state, guild, entry, readiness):
+        """Voice I/O: connect and play ``entry``, then announce it."""
+        if state.current_entry is not entry:
+            return
+        try:
+            track = await self._play_entry_with_pomice(entry, state, guild, entry.voice_channel, readiness)
         except Exception as e:
             self.logger.error(f"An error occurred while handling the queue: {e}", exc_info=True)
-            await self._delete_loading_message(entry)
-            try:
-                await text_channel.send(f"Playback failed: {e}")
-            except (discord.HTTPException, discord.Forbidden):
-                pass
+            self._post_follow_up(self._report_playback_failure(entry, e))
+            state.actor.post(self._playback_failed, state, entry)
+            return
+        if track is not None:
+            self._post_follow_up(self._announce_now_playing(state, guild, entry, track))
+
+    async def _report_playback_failure(self, entry, error):
+        await self._delete_loading_message(entry)
+        text_channel = entry.text_channel
+        try:
+            if text_channel:
+                await text_channel.send(f"Playback failed: {error}")
+        except (discord.HTTPException, discord.Forbidden):
+            pass
+
+    async def _playback_failed(self, state, entry):
+        """Actor handler: settle ``entry`` after it could not be started."""
+        if state.current_entry is entry:
             await self._complete_entry(state, entry)
 
     def _is_pomice_player(self, voice_client):
@@ -1032,7 +2764,12 @@ class Music(commands.Cog):
                 pass
             player = None
         if player is None:
-            player = await voice_channel.connect(cls=pomice.Player)
+            node = self._select_node(self._voice_region(voice_channel))
+            if node is None:
+                raise RuntimeError("No Lavalink nodes are available.")
+            started = time.perf_counter()
+            player = await voice_channel.connect(cls=pomice.Player(self.bot, voice_channel, node=node))
+            self.metrics.record("connect", time.perf_counter() - started, guild_id=guild.id, node=node)
         elif player.channel != voice_channel:
             await player.move_to(voice_channel)
         return player
@@ -1046,60 +2783,82 @@ class Music(commands.Cog):
             return results[0] if results else None
         return results
 
-    async def _play_entry_with_pomice(self, entry, state, guild, voice_channel, text_channel):
+    async def _play_entry_with_pomice(self, entry, state, guild, voice_channel, readiness="cold"):
+        """Connect and play ``entry``; returns the track, or None if it stopped being current."""
         if not pomice:
             raise RuntimeError("Pomice is not available.")
         player = await self._ensure_pomice_player_connection(guild, voice_channel)
         if player is None:
             raise RuntimeError("Unable to connect to Pomice player.")
-        track = entry.get('pomice_track')
+        await self._wait_for_resolution(entry)
+        track = self._entry_track(entry)
         if not track:
-            results = await player.get_tracks(query=entry['url'])
-            track = self._extract_pomice_track(results)
+            track = self._extract_pomice_track(await self._get_track(player.node, entry.url, guild_id=guild.id))
             if track is None:
                 raise RuntimeError("No tracks found for that query.")
-            self._apply_pomice_track_metadata(entry, track)
-        await player.play(track=track)
-        entry['pomice_track'] = track
-        entry['start_time'] = time.time()
+            self._store_track(entry, track)
+        if state.current_entry is not entry:
+            return None
+        resume_ms = int(entry.resume_position or 0)
+        entry.resume_position = 0
+        # Set before the request: the track-start event can arrive before play() returns.
+        sent_at = state.play_sent_at = time.perf_counter()
+        await player.play(track=track, start=resume_ms)
+        played_at = time.perf_counter()
+        self.metrics.record("play", played_at - sent_at, guild_id=guild.id, node=player.node)
+        ended_at = state.track_ended_at
+        state.track_ended_at = None
+        if ended_at is not None:
+            self._record_track_gap(state, player.node, played_at - ended_at, readiness)
+        entry.pomice_track = track
+        entry.start_time = time.time() - resume_ms / 1000
+        return track
+
+    async def _announce_now_playing(self, state, guild, entry, track):
         await self._delete_loading_message(entry)
+        text_channel = entry.text_channel
         embed = self._build_now_playing_embed(entry, len(state.queue), state.loop_mode)
         view = TransportControls(self, state)
         view.sync_play_pause(guild.voice_client if guild else None)
-        entry['force_embed_refresh'] = bool(entry.get('now_playing_message'))
+        entry.force_embed_refresh = bool(entry.now_playing_message)
         await self._send_now_playing_embed(text_channel, entry, state, embed, view)
-        title = track.title if hasattr(track, "title") else entry.get('title')
+        title = track.title if hasattr(track, "title") else entry.title
         self.logger.info(f"Sent now playing embed for {title}")
 
-    def _apply_pomice_track_metadata(self, entry, track):
+    def _store_track(self, entry, track):
+        """Keep ``track`` on ``entry`` as its encoded string and info tuple.
+
+        Only tracks without an encoded form (Spotify/Apple Music, searched at
+        play time) are kept as ``pomice.Track`` objects.
+        """
         if not track:
             return
-        title = getattr(track, "title", None)
-        uri = getattr(track, "uri", None)
-        author = getattr(track, "author", None)
-        length = getattr(track, "length", None)
-        thumbnail = getattr(track, "thumbnail", None)
-        entry['title'] = title or entry.get('title')
-        entry['metadata'] = {
-            'title': title,
-            'webpage_url': uri or entry.get('url'),
-            'url': uri or entry.get('url'),
-            'duration': int(length / 1000) if isinstance(length, (int, float)) and length > 0 else None,
-            'uploader': author,
-            'thumbnail': thumbnail,
-            'id': getattr(track, "identifier", None),
-        }
+        record = self._track_record(track)
+        entry.encoded = record[0] if record else None
+        entry.pomice_track = None if record else track
+        entry.track_info = self._compact_track_info(track)
+        entry.title = getattr(track, "title", None) or entry.title
+        state = entry.state
+        if state:
+            state.queue.reweigh(entry)
+
+    def _compact_track_info(self, track):
+        info = dict(track.info)
+        # pomice derives YouTube thumbnails from the identifier rather than the info dict.
+        info["thumbnail"] = getattr(track, "thumbnail", None) or info.get("thumbnail")
+        return (*(info.get(key) for key in TRACK_INFO_KEYS), track.track_type.value)
+
+    def _entry_track(self, entry, ctx=None):
+        """The ``pomice.Track`` for ``entry``, built from its encoded form when needed."""
+        if entry.pomice_track is not None:
+            return entry.pomice_track
+        if entry.encoded is None or entry.track_info is None:
+            return None
+        info = {key: value for key, value in zip(TRACK_INFO_KEYS, entry.track_info) if value is not None}
+        return self._track_from_record((entry.encoded, info, entry.track_info[-1]), ctx)
 
     def _reward_track_key(self, entry):
-        metadata = entry.get('metadata') or {}
-        key = (
-            metadata.get('id')
-            or metadata.get('webpage_url')
-            or metadata.get('url')
-            or entry.get('url')
-            or entry.get('title')
-            or ""
-        )
+        key = entry.info("identifier") or entry.link or entry.title or ""
         return key.strip().lower()
 
     def _get_currency_manager(self):
@@ -1111,16 +2870,16 @@ class Music(commands.Cog):
     async def _maybe_award_play_reward(self, entry, elapsed=None):
         if self.play_reward <= 0:
             return
-        if self.disable_loop_rewards and entry.get("state") and entry["state"].loop_mode != "off":
+        if self.disable_loop_rewards and entry.state and entry.state.loop_mode != "off":
             return
-        requester = entry.get('requester')
+        requester = entry.requester
         if not requester:
             return
-        metadata = entry.get('metadata') or {}
-        duration = metadata.get('duration')
+        duration = entry.duration
         if not duration or duration < self.play_reward_min_duration:
             return
-        force_reward = bool(entry.pop('force_reward', False))
+        force_reward = entry.force_reward
+        entry.force_reward = False
         if not force_reward and (elapsed is None or elapsed + 2 < duration):
             return
         track_key = self._reward_track_key(entry)
@@ -1143,7 +2902,7 @@ class Music(commands.Cog):
                 multiplier = new_count // self.play_reward_batch_size
                 bonus = self.play_reward_batch_amount * multiplier
                 new_balance = currency.adjust(requester.id, bonus)
-                text_channel = entry.get('text_channel')
+                text_channel = entry.text_channel
                 if text_channel:
                     try:
                         embed = discord.Embed(
@@ -1173,100 +2932,176 @@ class Music(commands.Cog):
             new_balance,
         )
 
-    async def _resolve_pomice_track(self, entry, ctx=None):
+    async def _resolve_pomice_track(self, entry, ctx=None, refresh=False):
         if not pomice or not self._should_use_pomice():
             return None
-        try:
-            node = pomice.NodePool.get_node()
-        except Exception:
+        node = self._select_node(self._voice_region(entry.voice_channel))
+        if node is None:
             return None
         try:
-            results = await node.get_tracks(query=entry['url'], ctx=ctx)
-            track = self._extract_pomice_track(results)
+            result = await self._get_track(node, entry.url, ctx, refresh=refresh, guild_id=entry.guild_id)
+            track = self._extract_pomice_track(result)
             if track:
-                self._apply_pomice_track_metadata(entry, track)
-            return track
+                self._store_track(entry, track)
+            return result
         except Exception as exc:
             self.logger.warning("Pomice track lookup failed for queue metadata: %s", exc)
             return None
 
+    async def _get_track(self, node, query, ctx=None, refresh=False, guild_id=None):
+        """Resolve ``query`` to one track, trying the memory and disk caches before the node.
+
+        A playlist result is returned whole and left out of the cache, so the
+        same URL queues the full playlist next time.
+        """
+        cache = self.track_cache
+        key = cache.normalize(query)
+        started = time.perf_counter()
+        record = None if refresh else cache.get_memory(key)
+        tier = "memory"
+        if record is None and not refresh:
+            record = await asyncio.to_thread(cache.get_disk, key)
+            tier = "disk"
+            if record is not None:
+                cache.put_memory(key, record)
+        if record is not None:
+            track = self._track_from_record(record, ctx)
+            if track is not None:
+                cache.record(tier, time.perf_counter() - started)
+                return track
+        lookup_started = time.perf_counter()
+        async with self._resolve_semaphore(node):
+            results = await node.get_tracks(query=query, ctx=ctx)
+        finished = time.perf_counter()
+        self.metrics.record("resolve", finished - lookup_started, guild_id=guild_id, node=node)
+        cache.record("miss", finished - started)
+        if isinstance(results, pomice.Playlist):
+            return results
+        track = self._extract_pomice_track(results)
+        record = self._track_record(track)
+        if record is not None:
+            cache.put_memory(key, record)
+            await asyncio.to_thread(cache.put_disk, key, record)
+        return track
+
+    def _track_record(self, track):
+        if not pomice or not isinstance(track, pomice.Track):
+            return None
+        # Spotify/Apple Music tracks are only searched on Lavalink at play time,
+        # so there is no encoded track to keep for them.
+        if track.original is not track or not track.track_id:
+            return None
+        info = {key: track.info[key] for key in TRACK_INFO_KEYS if track.info.get(key) is not None}
+        return track.track_id, info, track.track_type.value
+
+    def _track_from_record(self, record, ctx=None):
+        encoded, info, track_type = record
+        try:
+            return pomice.Track(track_id=encoded, info=info, track_type=pomice.TrackType(track_type), ctx=ctx)
+        except (TypeError, ValueError):
+            return None
+
+    def _resolve_semaphore(self, node):
+        key = node._identifier
+        semaphore = self._resolve_semaphores.get(key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.resolve_concurrency)
+            self._resolve_semaphores[key] = semaphore
+        return semaphore
+
     async def _complete_entry(self, state, entry):
-        if entry and entry.get('stopped_due_to_empty_vc'):
-            entry.pop('stopped_due_to_empty_vc', None)
+        """Actor handler: settle a finished entry, requeue it when looping and start the next one."""
+        if entry and entry.stopped_due_to_empty_vc:
+            entry.stopped_due_to_empty_vc = False
             return
+        state.track_ended_at = time.perf_counter()
         elapsed = None
         if entry:
-            start_time = entry.get('start_time')
+            start_time = entry.start_time
             if start_time:
                 elapsed = max(0, time.time() - start_time)
         if entry and elapsed is not None:
-            await self._maybe_award_play_reward(entry, elapsed=elapsed)
+            self._post_follow_up(self._maybe_award_play_reward(entry, elapsed=elapsed))
         self._cancel_now_playing_timestamp_updates(entry)
         requeue_front = state.loop_mode == "single"
         requeue_back = state.loop_mode == "all"
         should_requeue = requeue_front or requeue_back
         reused = False
         if should_requeue:
-            if entry.get('pomice_track') or entry.get('url'):
-                async with state.lock:
-                    if requeue_front:
-                        state.queue.appendleft(entry)
-                    else:
-                        state.queue.append(entry)
+            if entry.resolved or entry.url:
+                if entry.encoded is not None:
+                    # Rebuilt from the encoded string when it comes round again.
+                    entry.pomice_track = None
+                if requeue_front:
+                    state.queue.appendleft(entry)
+                else:
+                    state.queue.append(entry)
                 reused = True
 
-        async with state.lock:
-            state.is_playing = False
-            state.current_entry = None
+        state.is_playing = False
+        state.current_entry = None
+        self._queue_changed(state)
 
-        await self._start_next_in_queue(state, entry['guild'])
+        await self._start_next_in_queue(state, entry.guild)
 
-        async with state.lock:
-            queue_empty = not state.queue and not state.is_playing
-            loop_active = state.loop_mode != "off"
-        if queue_empty and entry and entry.get('text_channel') and not loop_active:
-            try:
-                description = self._format_queue_entry_title(entry)
-                embed = self._build_status_embed(
-                    "Playback finished",
-                    description,
-                    color=discord.Color.green(),
-                    footer="Queue is empty"
-                )
-                await entry['text_channel'].send(embed=embed)
-            except (discord.HTTPException, discord.Forbidden):
-                pass
+        queue_empty = not state.queue and not state.is_playing
+        loop_active = state.loop_mode != "off"
+        if queue_empty and entry and entry.text_channel and not loop_active:
+            self._post_follow_up(self._announce_playback_finished(entry))
         if queue_empty and not loop_active:
-            self._schedule_idle_disconnect(entry['guild'], state)
+            self._schedule_idle_disconnect(entry.guild, state)
+
+    async def _announce_playback_finished(self, entry):
+        try:
+            description = self._format_queue_entry_title(entry)
+            embed = self._build_status_embed(
+                "Playback finished",
+                description,
+                color=discord.Color.green(),
+                footer="Queue is empty"
+            )
+            await entry.text_channel.send(embed=embed)
+        except (discord.HTTPException, discord.Forbidden):
+            pass
 
     async def _on_track_end(self, state, entry, error):
         if error:
             self.logger.error(f"Player error: {error}", exc_info=True)
-            await entry['text_channel'].send(f"Player error: {error}")
+            text_channel = entry.text_channel
+            if text_channel:
+                await text_channel.send(f"Player error: {error}")
         await self._complete_entry(state, entry)
 
+    async def _voice_disconnected(self, state):
+        """Actor handler: the bot left voice, so nothing is playing any more."""
+        state.manual_disconnect = True
+        self._cancel_idle_disconnect(state)
+        self._cancel_empty_voice_shutdown(state)
+        self._cancel_now_playing_timestamp_updates(state.current_entry)
+        state.is_playing = False
+        state.current_entry = None
+
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
         if self.bot.user and member.id == self.bot.user.id:
+            if before.channel is not None and before.channel != after.channel:
+                # Only channels the bot is in are worth keeping counts for.
+                self._listeners.pop(before.channel.id, None)
             if before.channel is not None and after.channel is None:
                 state = self._get_state(member.guild)
-                state.manual_disconnect = True
-                self._cancel_idle_disconnect(state)
-                self._cancel_empty_voice_shutdown(state)
-                current_entry = state.current_entry
-                self._cancel_now_playing_timestamp_updates(current_entry)
-                async with state.lock:
-                    state.is_playing = False
-                    state.current_entry = None
+                state.actor.post(self._voice_disconnected, state)
                 return
         if member.bot:
             return
         if before.channel == after.channel:
             return
+        self._move_listener(member.id, before.channel, after.channel)
         guild = member.guild
         voice_client = guild.voice_client
         if not voice_client or voice_client.channel is None:
             return
+        if voice_client.channel not in (before.channel, after.channel):
+            return
         state = self._get_state(guild)
         if not self._should_leave_voice(voice_client):
             self._cancel_idle_disconnect(state)
@@ -1277,9 +3112,272 @@ class Music(commands.Cog):
             return
         self._schedule_idle_disconnect(guild, state)
 
+    def _queue_changed(self, state, queue=True):
+        """Mark ``state`` for the next debounced snapshot; ``queue=False`` for header-only changes."""
+        if not state or state.guild_id is None:
+            return
+        state.last_active = time.time()
+        self._snapshot_dirty[state.guild_id] = self._snapshot_dirty.get(state.guild_id, False) or queue
+        if self._snapshot_task is None or self._snapshot_task.done():
+            self._snapshot_task = asyncio.create_task(self._flush_snapshots_later())
+
+    async def _flush_snapshots_later(self):
+        await asyncio.sleep(self.queue_snapshot_delay)
+        writes = self._take_snapshots()
+        if writes:
+            await asyncio.to_thread(self._write_snapshots, writes)
+
+    def _take_snapshots(self):
+        dirty, self._snapshot_dirty = self._snapshot_dirty, {}
+        writes = []
+        for guild_id, queue_changed in dirty.items():
+            state = self.guild_states.get(guild_id)
+            if state is None or state.manual_disconnect or not (state.current_entry or state.queue):
+                writes.append((guild_id, None, None))
+                continue
+            entries = [self._entry_snapshot(entry) for entry in state.queue] if queue_changed else None
+            writes.append((guild_id, self._snapshot_header(state), entries))
+        return writes
+
+    def _write_snapshots(self, writes):
+        for guild_id, header, entries in writes:
+            if header is None:
+                self.queue_store.discard(guild_id)
+            else:
+                self.queue_store.save(guild_id, header, entries)
+
+    def _entry_snapshot(self, entry):
+        track_info = list(entry.track_info) if entry.encoded is not None else None
+        return [entry.url, entry.requester_id, entry.text_channel_id, entry.encoded, track_info]
+
+    def _snapshot_header(self, state):
+        current = state.current_entry
+        anchor = current or state.queue[0]
+        position_ms = 0
+        if current and current.start_time:
+            position_ms = int((time.time() - current.start_time) * 1000)
+        return {
+            "guild_id": state.guild_id,
+            "voice_channel_id": anchor.voice_channel_id,
+            "loop_mode": state.loop_mode,
+            "last_active": state.last_active,
+            "current": self._entry_snapshot(current) if current else None,
+            "position_ms": position_ms,
+        }
+
+    async def _snapshot_positions_loop(self):
+        while True:
+            await asyncio.sleep(self.queue_position_interval)
+            for state in list(self.guild_states.values()):
+                if state.is_playing and state.current_entry:
+                    state.last_active = time.time()
+                    self._snapshot_dirty.setdefault(state.guild_id, False)
+            if self._snapshot_dirty and (self._snapshot_task is None or self._snapshot_task.done()):
+                self._snapshot_task = asyncio.create_task(self._flush_snapshots_later())
+
+    def _evict_idle_states(self):
+        """Drop playback state for guilds that have been idle longer than ``state_idle_ttl``."""
+        cutoff = time.time() - self.state_idle_ttl
+        evicted = 0
+        for guild_id, state in list(self.guild_states.items()):
+            if (
+                state.last_active > cutoff
+                or state.is_playing
+                or state.current_entry
+                or state.queue
+                or state.actor.busy
+                or guild_id in self._snapshot_dirty
+            ):
+                continue
+            if any(task and not task.done() for task in (state.idle_disconnect_task, state.empty_voice_task)):
+                continue
+            guild = self.bot.get_guild(guild_id)
+            if guild is not None and guild.voice_client is not None:
+                continue
+            del self.guild_states[guild_id]
+            self.metrics.forget_guild(guild_id)
+            evicted += 1
+        now = time.monotonic()
+        for channel_id, (until, _) in list(self._np_channel_backoff.items()):
+            if until < now:
+                del self._np_channel_backoff[channel_id]
+        return evicted
+
+    async def _sweep_idle_states_loop(self):
+        while True:
+            await asyncio.sleep(min(300, self.state_idle_ttl))
+            evicted = self._evict_idle_states()
+            if evicted:
+                self.logger.debug("Evicted %s idle guild playback state(s).", evicted)
+
+    async def _write_metrics_loop(self):
+        while True:
+            await asyncio.sleep(self.metrics_interval)
+            if self.metrics.dirty:
+                await asyncio.to_thread(self.metrics.write, self._metrics_snapshot())
+
+    def _metrics_snapshot(self):
+        return self.metrics.snapshot(
+            track_cache=self.track_cache.stats(),
+            lavalink_nodes=self.node_load_report(),
+            node_migrations=list(self.node_migrations),
+        )
+
+    async def _restore_guild_queues(self):
+        """Rejoin voice and resume saved queues, most recently active guilds first."""
+        snapshots = await asyncio.to_thread(self.queue_store.load_all)
+        if not snapshots:
+            return
+        started = time.perf_counter()
+        cutoff = time.time() - self.queue_restore_max_age
+        snapshots.sort(key=lambda snapshot: snapshot[0].get("last_active") or 0, reverse=True)
+        slots = asyncio.Semaphore(self.queue_restore_concurrency)
+
+        async def _restore(header, entries):
+            # Semaphore waiters are served in order, so recent guilds resume first.
+            async with slots:
+                try:
+                    return await self._restore_guild_queue(header, entries)
+                except Exception:
+                    self.logger.exception("Could not restore the queue for guild %s.", header.get("guild_id"))
+                    return False
+
+        fresh = []
+        for header, entries in snapshots:
+            if (header.get("last_active") or 0) < cutoff:
+                await asyncio.to_thread(self.queue_store.discard, header.get("guild_id"))
+            else:
+                fresh.append(_restore(header, entries))
+        results = await asyncio.gather(*fresh)
+        self.logger.info(
+            "Restored %s of %s saved queue(s) in %.1f s.",
+            sum(1 for result in results if result),
+            len(snapshots),
+            time.perf_counter() - started,
+        )
+
+    async def _restore_guild_queue(self, header, entries):
+        guild_id = header.get("guild_id")
+        guild = self.bot.get_guild(int(guild_id)) if guild_id else None
+        voice_channel = guild.get_channel(header.get("voice_channel_id") or 0) if guild else None
+        if voice_channel is None or not self._channel_listener_count(voice_channel):
+            await asyncio.to_thread(self.queue_store.discard, guild_id)
+            return False
+        records = ([header["current"]] if header.get("current") else []) + list(entries)
+        members = {}
+        for requester_id in {record[1] for record in records if record[1]}:
+            member = guild.get_member(requester_id)
+            if member is None:
+                try:
+                    member = await guild.fetch_member(requester_id)
+                except (discord.NotFound, discord.HTTPException):
+                    member = None
+            members[requester_id] = member
+        state = self._get_state(guild)
+        restored = []
+        for record in records:
+            url, requester_id, text_channel_id, encoded, track_info = record
+            requester = members.get(requester_id)
+            text_channel = guild.get_channel(text_channel_id or 0)
+            if requester is None or text_channel is None or not url:
+                continue
+            restored.append(QueueEntry(
+                self.bot,
+                url,
+                guild_id=guild.id,
+                requester_id=requester.id,
+                voice_channel_id=voice_channel.id,
+                text_channel_id=text_channel.id,
+                state=state,
+                title=track_info[_TRACK_INFO_INDEX["title"]] if track_info else None,
+                encoded=encoded,
+                track_info=tuple(track_info) if track_info else None,
+            ))
+        if not restored:
+            await asyncio.to_thread(self.queue_store.discard, guild_id)
+            return False
+        if header.get("current") and restored[0].url == header["current"][0]:
+            restored[0].resume_position = max(0, int(header.get("position_ms") or 0))
+        if not await state.actor.ask(self._load_restored, state, header.get("loop_mode") or "off", restored):
+            return False
+        await state.actor.ask(self._start_next_in_queue, state, guild)
+        return True
+
+    async def _load_restored(self, state, loop_mode, entries):
+        """Actor handler: queue restored entries unless the guild started playing meanwhile."""
+        if state.current_entry or state.queue:
+            return False
+        state.loop_mode = loop_mode
+        state.manual_disconnect = False
+        for entry in entries:
+            state.queue.append(entry)
+        return True
+
+    def cog_unload(self):
+        if self._node_monitor_task:
+            self._node_monitor_task.cancel()
+        if self._restore_task:
+            self._restore_task.cancel()
+        if self._np_task:
+            self._np_task.cancel()
+        if self._position_task:
+            self._position_task.cancel()
+        if self._state_sweep_task:
+            self._state_sweep_task.cancel()
+        if self._metrics_task:
+            self._metrics_task.cancel()
+        if self._snapshot_task:
+            self._snapshot_task.cancel()
+        for task in self._playlist_tasks:
+            task.cancel()
+        for task in self._follow_up_tasks:
+            task.cancel()
+        for state in self.guild_states.values():
+            state.actor.cancel()
+        # Final synchronous flush so a deploy keeps the latest queues and positions.
+        for state in self.guild_states.values():
+            if state.current_entry or state.queue:
+                self._snapshot_dirty.setdefault(state.guild_id, False)
+        self._write_snapshots(self._take_snapshots())
+        if self.metrics.dirty:
+            self.metrics.write(self._metrics_snapshot())
+        self.track_cache.close()
+
     @commands.Cog.listener()
     async def on_ready(self):
+        # The member cache was rebuilt, so recount listeners from it.
+        self._listeners.clear()
         await self.start_pomice_nodes()
+        if self._position_task is None:
+            self._position_task = asyncio.create_task(self._snapshot_positions_loop())
+        if self._state_sweep_task is None:
+            self._state_sweep_task = asyncio.create_task(self._sweep_idle_states_loop())
+        if self._metrics_task is None:
+            self._metrics_task = asyncio.create_task(self._write_metrics_loop())
+        await self._restore_guild_queues_once()
+
+    async def _restore_guild_queues_once(self):
+        """Resume saved queues the first time a Lavalink node is usable after startup."""
+        try:
+            if self._queues_restored or not self._should_use_pomice():
+                return
+            self._queues_restored = True
+            await self._restore_guild_queues()
+        finally:
+            self._restore_task = None
+
+    @commands.Cog.listener()
+    async def on_pomice_track_start(self, player, track):
+        state = self.guild_states.get(player.guild.id)
+        if state is None or state.play_sent_at is None:
+            return
+        now = time.perf_counter()
+        self.metrics.record("first_audio", now - state.play_sent_at, guild_id=state.guild_id, node=player.node)
+        state.play_sent_at = None
+        entry = state.current_entry
+        if entry and entry.requested_at is not None:
+            self.metrics.record("command_to_audio", now - entry.requested_at, guild_id=state.guild_id, node=player.node)
+            entry.requested_at = None
 
     @commands.Cog.listener()
     async def on_pomice_track_end(self, player, track, reason):
@@ -1289,10 +3387,13 @@ class Music(commands.Cog):
         state = self._get_state(guild)
         if not state:
             return
+        state.actor.post(self._track_ended, state)
+
+    async def _track_ended(self, state):
+        """Actor handler for Lavalink's track-end event."""
         entry = state.current_entry
-        if not entry:
-            return
-        await self._complete_entry(state, entry)
+        if entry:
+            await self._complete_entry(state, entry)
 
 
 async def setup(bot):
@@ -0,0 +1,218 @@
+"""Benchmark the guild playback actor against the per-step locking it replaced.
+
+Fires bursts of button clicks (skip, shuffle and enqueue) at many guilds at
+once. Each skip that stops a track is followed by a track-end event, as
+Lavalink sends one. Each command does the
+same work and the same simulated Discord/Lavalink round trips in both
+models. The "lock" model takes ``asyncio.Lock`` once per step, as the cog
+did. The "actor" model runs each command's state change as one
+``GuildActor`` handler and sends its I/O afterwards, in order, on the
+guild's voice I/O chain, as the cog does. Run from the repository root:
+
+    python -m scripts.music_actor_bench --guilds 200 --burst 20 --io-ms 2
+
+A skip only stops the player when a track is playing, as in the cog, so
+later clicks in a burst are cheap. "Interleaved" counts commands that saw
+another command change the guild between their own steps: a queue edit in
+the middle of a track change, or two skips stopping the same track.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from cogs.music import GuildActor
+
+
+class Guild:
+    def __init__(self, size):
+        self.queue = list(range(size))
+        self.current = 0
+        self.playing = True
+        self.votes = set()
+        self.lock = asyncio.Lock()
+        self.actor = GuildActor()
+        self.voice_io = None
+        self.interleaved = 0
+
+
+async def _io(delay):
+    await asyncio.sleep(delay)
+
+
+class LockModel:
+    """Each command takes the guild lock once per step and releases it around I/O."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.events = set()
+
+    async def skip(self, guild, user_id):
+        async with guild.lock:
+            if not guild.playing:
+                return
+            guild.votes.add(user_id)
+            current = guild.current
+        await _io(self.delay)  # stop the Lavalink player
+        async with guild.lock:
+            if guild.current != current or not guild.playing:
+                guild.interleaved += 1
+            guild.playing = False
+            guild.votes.clear()
+        event = asyncio.create_task(self.track_end(guild))
+        self.events.add(event)
+        event.add_done_callback(self.events.discard)
+
+    async def drain(self, guilds):
+        while self.events:
+            await asyncio.gather(*self.events)
+
+    async def shuffle(self, guild):
+        async with guild.lock:
+            random.shuffle(guild.queue)
+
+    async def enqueue(self, guild, item):
+        async with guild.lock:
+            guild.queue.append(item)
+
+    async def track_end(self, guild):
+        await _io(self.delay)  # reward / currency write
+        async with guild.lock:
+            guild.current = None
+        async with guild.lock:
+            seen = len(guild.queue)
+            guild.current = guild.queue.pop(0) if guild.queue else None
+        await _io(self.delay)  # player.play
+        async with guild.lock:
+            guild.playing = guild.current is not None
+            if len(guild.queue) != seen - (guild.current is not None):
+                guild.interleaved += 1
+
+
+class ActorModel:
+    """Each command is one handler on the guild's actor; its I/O runs after it."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.tasks = set()
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def _post_voice_io(self, guild, step, *args):
+        guild.voice_io = self._spawn(self._run_voice_io(guild.voice_io, step, args))
+
+    async def _run_voice_io(self, previous, step, args):
+        if previous is not None and not previous.done():
+            await asyncio.wait((previous,))
+        await step(*args)
+
+    async def skip(self, guild, user_id):
+        await guild.actor.ask(self._skip, guild, user_id)
+
+    async def drain(self, guilds):
+        while self.tasks or any(guild.actor.busy for guild in guilds):
+            await asyncio.sleep(0.001)
+
+    async def _skip(self, guild, user_id):
+        if not guild.playing:
+            return
+        guild.votes.add(user_id)
+        guild.playing = False
+        guild.votes.clear()
+        self._post_voice_io(guild, self._stop, guild, guild.current)
+
+    async def _stop(self, guild, current):
+        await _io(self.delay)  # stop the Lavalink player
+        if guild.current != current:
+            guild.interleaved += 1
+        guild.actor.post(self._track_end, guild)
+
+    async def shuffle(self, guild):
+        await guild.actor.ask(self._shuffle, guild)
+
+    async def _shuffle(self, guild):
+        random.shuffle(guild.queue)
+
+    async def enqueue(self, guild, item):
+        await guild.actor.ask(self._enqueue, guild, item)
+
+    async def _enqueue(self, guild, item):
+        guild.queue.append(item)
+
+    async def _track_end(self, guild):
+        self._spawn(_io(self.delay))  # reward / currency write
+        guild.current = guild.queue.pop(0) if guild.queue else None
+        guild.playing = guild.current is not None
+        if guild.playing:
+            self._post_voice_io(guild, _io, self.delay)  # player.play
+
+
+async def run(model, guilds, burst, rng):
+    latencies = []
+
+    async def click(guild, kind, index):
+        started = time.perf_counter()
+        if kind == "skip":
+            await model.skip(guild, index)
+        elif kind == "shuffle":
+            await model.shuffle(guild)
+        else:
+            await model.enqueue(guild, index)
+        latencies.append(time.perf_counter() - started)
+
+    kinds = ("skip", "skip", "shuffle", "enqueue")
+    clicks = [
+        click(guild, rng.choice(kinds), index)
+        for guild in guilds
+        for index in range(burst)
+    ]
+    rng.shuffle(clicks)
+    started = time.perf_counter()
+    await asyncio.gather(*clicks)
+    await model.drain(guilds)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "commands": len(latencies),
+        "per_second": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "interleaved": sum(guild.interleaved for guild in guilds),
+    }
+
+
+async def main_async(args):
+    results = []
+    for name, factory in (("lock", LockModel), ("actor", ActorModel)):
+        rng = random.Random(args.seed)
+        guilds = [Guild(args.queue) for _ in range(args.guilds)]
+        results.append((name, await run(factory(args.io_ms / 1000), guilds, args.burst, rng)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=200, help="guilds clicked at once (default 200)")
+    parser.add_argument("--burst", type=int, default=20, help="clicks per guild in the burst (default 20)")
+    parser.add_argument("--queue", type=int, default=100, help="entries queued per guild (default 100)")
+    parser.add_argument("--io-ms", type=float, default=2.0, help="simulated round trip per I/O step")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    print(f"{args.guilds} guilds x {args.burst} clicks, {args.io_ms:g} ms per I/O step")
+    print(f"{'model':<8}{'commands/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'interleaved':>13}")
+    for name, stats in results:
+        print(
+            f"{name:<8}{stats['per_second']:>12.0f}{stats['p50_ms']:>10.1f}"
+            f"{stats['p95_ms']:>10.1f}{stats['interleaved']:>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
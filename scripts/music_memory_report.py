@@ -0,0 +1,183 @@
+"""Report the memory held by music queue entries and guild playback state.
+
+Builds the same guilds and queues twice under tracemalloc. The first build uses the
+dict entries the cog used to keep, each holding a ``pomice.Track`` and a metadata
+dict, with plain guild-state objects. The second uses ``QueueEntry``, which keeps
+the encoded track and an info tuple, and the slotted ``GuildPlaybackState``. Run
+from the repository root:
+
+    python -m scripts.music_memory_report --guilds 200 --entries 50
+
+The old entries pinned ``discord.Message`` objects, which are stood in for
+here by a small object. The "dict" figures therefore understate what a live
+bot held.
+"""
+
+import argparse
+import asyncio
+import gc
+import tracemalloc
+
+import pomice
+
+from cogs.music import TRACK_INFO_KEYS, GuildPlaybackState, IndexedQueue, QueueEntry
+
+
+class _Client:
+    def get_guild(self, guild_id):
+        return None
+
+    def get_channel(self, channel_id):
+        return None
+
+
+class _Message:
+    def __init__(self, message_id, channel):
+        self.id = message_id
+        self.channel = channel
+        self.embeds = []
+
+
+class _Channel:
+    def __init__(self, channel_id):
+        self.id = channel_id
+
+
+class DictGuildState:
+    """GuildPlaybackState as it was before __slots__."""
+
+    def __init__(self, guild_id):
+        self.guild_id = guild_id
+        self.last_active = 0.0
+        self.queue = IndexedQueue(weight=lambda entry: (entry.get('metadata') or {}).get('duration') or 0)
+        self.lock = asyncio.Lock()
+        self.is_playing = False
+        self.current_entry = None
+        self.loop_mode = "off"
+        self.idle_disconnect_task = None
+        self.empty_voice_task = None
+        self.manual_disconnect = False
+        self.skip_votes = set()
+        self.skip_message = None
+        self.track_ended_at = None
+
+
+def _lavalink_track(index):
+    """An encoded track string and info dict shaped like a Lavalink v4 search result."""
+    identifier = f"{index:011d}"
+    info = {
+        "identifier": identifier,
+        "isSeekable": True,
+        "author": f"Channel {index % 50}",
+        "length": (180 + index % 120) * 1000,
+        "isStream": False,
+        "position": 0,
+        "title": f"Track {index}",
+        "uri": f"https://www.youtube.com/watch?v={identifier}",
+        "artworkUrl": f"https://i.ytimg.com/vi/{identifier}/hqdefault.jpg",
+        "isrc": None,
+        "sourceName": "youtube",
+    }
+    # Encoded YouTube tracks are a little over 200 base64 characters.
+    encoded = ("QAAA" + identifier * 20)[:216]
+    return encoded, info
+
+
+def _dict_entry(guild, channel, voice_channel, member, state, index):
+    encoded, info = _lavalink_track(index)
+    track = pomice.Track(track_id=encoded, info=info, track_type=pomice.TrackType.YOUTUBE)
+    return {
+        'url': track.uri,
+        'requester': member,
+        'guild': guild,
+        'voice_channel': voice_channel,
+        'text_channel': channel,
+        'title': track.title,
+        'metadata': {
+            'title': track.title,
+            'webpage_url': track.uri,
+            'url': track.uri,
+            'duration': int(track.length / 1000),
+            'uploader': track.author,
+            'thumbnail': track.thumbnail,
+            'id': track.identifier,
+        },
+        'pomice_track': track,
+        'loading_message': None,
+        'queued_message': _Message(10_000_000 + index, channel),
+        'state': state,
+        'pending': False,
+    }
+
+
+def _slotted_entry(client, guild, channel, voice_channel, member, state, index):
+    encoded, info = _lavalink_track(index)
+    entry = QueueEntry(
+        client,
+        info["uri"],
+        guild_id=guild.id,
+        requester_id=member.id,
+        voice_channel_id=voice_channel.id,
+        text_channel_id=channel.id,
+        state=state,
+        title=info["title"],
+        encoded=encoded,
+        track_info=(*(info.get(key) for key in TRACK_INFO_KEYS), "youtube"),
+    )
+    entry.queued_message = _Message(10_000_000 + index, channel)
+    return entry
+
+
+def build(kind, guilds, entries):
+    client = _Client()
+    states = []
+    for guild_index in range(guilds):
+        guild = _Channel(guild_index)
+        channel = _Channel(1_000_000 + guild_index)
+        voice_channel = _Channel(2_000_000 + guild_index)
+        member = _Channel(3_000_000 + guild_index)
+        if kind == "dict":
+            state = DictGuildState(guild.id)
+        else:
+            state = GuildPlaybackState(guild.id)
+        for index in range(entries):
+            number = guild_index * entries + index
+            if kind == "dict":
+                entry = _dict_entry(guild, channel, voice_channel, member, state, number)
+            else:
+                entry = _slotted_entry(client, guild, channel, voice_channel, member, state, number)
+            state.queue.append(entry)
+        states.append(state)
+    return states
+
+
+def measure(kind, guilds, entries):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    states = build(kind, guilds, entries)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del states
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guilds", type=int, default=200, help="guilds to build (default 200)")
+    parser.add_argument("--entries", type=int, default=50, help="queued entries per guild (default 50)")
+    args = parser.parse_args()
+
+    print(f"{args.guilds} guilds x {args.entries} entries, bytes")
+    print(f"{'layout':<10}{'total':>14}{'per guild':>12}{'per entry':>12}")
+    for kind in ("dict", "slotted"):
+        empty = measure(kind, args.guilds, 0)
+        full = measure(kind, args.guilds, args.entries)
+        per_guild = empty / max(1, args.guilds)
+        per_entry = (full - empty) / max(1, args.guilds * args.entries)
+        print(f"{kind:<10}{full:>14,}{per_guild:>12,.0f}{per_entry:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark the music queue against the deque it replaced.
+
+Times the operations the music cog performs on a guild queue (positional
+remove, insert, move, index lookup, a ?queue page slice and a shuffle) for
+``IndexedQueue`` and for the old ``deque``/list-rebuild approach. Run from
+the repository root:
+
+    python -m scripts.music_queue_bench --size 10000
+"""
+
+import argparse
+import random
+import time
+from collections import deque
+
+from cogs.music import IndexedQueue
+
+
+class DequeQueue:
+    """How the cog handled these operations before IndexedQueue."""
+
+    def __init__(self, items):
+        self.queue = deque(items)
+
+    def remove_at(self, index):
+        items = list(self.queue)
+        removed = items.pop(index)
+        self.queue = deque(items)
+        return removed
+
+    def insert(self, index, item):
+        self.queue.insert(index, item)
+
+    def move(self, source, destination):
+        items = list(self.queue)
+        items.insert(destination, items.pop(source))
+        self.queue = deque(items)
+
+    def index(self, item):
+        for position, queued in enumerate(self.queue):
+            if queued is item:
+                return position
+        raise ValueError
+
+    def page(self, start, size):
+        return list(self.queue)[start:start + size]
+
+    def shuffle(self):
+        items = list(self.queue)
+        random.shuffle(items)
+        self.queue = deque(items)
+
+
+class TreapQueue:
+    def __init__(self, items):
+        self.queue = IndexedQueue(items)
+
+    def remove_at(self, index):
+        return self.queue.pop(index)
+
+    def insert(self, index, item):
+        self.queue.insert(index, item)
+
+    def move(self, source, destination):
+        self.queue.move(source, destination)
+
+    def index(self, item):
+        return self.queue.index(item)
+
+    def page(self, start, size):
+        return self.queue[start:start + size]
+
+    def shuffle(self):
+        self.queue.shuffle()
+
+
+def _time(label, func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return label, (time.perf_counter() - started) / repeat * 1e6
+
+
+def bench(factory, size, repeat, seed):
+    rng = random.Random(seed)
+    entries = [{"url": f"track-{index}"} for index in range(size)]
+    queue = factory(entries)
+    results = []
+
+    def remove_and_reinsert():
+        index = rng.randrange(size)
+        queue.insert(index, queue.remove_at(index))
+
+    def move():
+        queue.move(rng.randrange(size), rng.randrange(size))
+
+    def index_lookup():
+        queue.index(entries[rng.randrange(size)])
+
+    def page():
+        queue.page(rng.randrange(max(1, size - 10)), 10)
+
+    results.append(_time("remove+insert", remove_and_reinsert, repeat))
+    results.append(_time("move", move, repeat))
+    results.append(_time("index", index_lookup, repeat))
+    results.append(_time("page of 10", page, repeat))
+    results.append(_time("shuffle", queue.shuffle, max(1, repeat // 20)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=10000, help="entries in the queue (default 10000)")
+    parser.add_argument("--repeat", type=int, default=200, help="operations timed per benchmark")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    old = bench(DequeQueue, args.size, args.repeat, args.seed)
+    new = bench(TreapQueue, args.size, args.repeat, args.seed)
+    print(f"{args.size} entries, microseconds per operation")
+    print(f"{'operation':<16}{'deque':>12}{'IndexedQueue':>14}{'speedup':>10}")
+    for (label, before), (_, after) in zip(old, new):
+        print(f"{label:<16}{before:>12.1f}{after:>14.1f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
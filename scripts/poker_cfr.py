@@ -0,0 +1,208 @@
+"""Offline CFR solver for the poker bot's heads-up strategy table.
+
+Runs external-sampling Monte Carlo CFR over ``BettingAbstraction`` with hands
+grouped into strength buckets, spreading batches of iterations over every
+core and merging their regrets. Run from the repository root:
+
+    python -m scripts.poker_cfr --iterations 200000
+    python -m scripts.poker_cfr --export-only
+
+Progress is checkpointed after every batch, so an interrupted run resumes
+from the checkpoint when started again with the same settings. The bot loads
+the exported table from POKER_STRATEGY_PATH (default data/poker_strategy.bin).
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+from cogs.games import (
+    BettingAbstraction,
+    PokerStrategyTable,
+    combo_index,
+    score_hands,
+    strength_buckets,
+)
+
+_solver = None
+
+
+class Solver:
+    def __init__(self, buckets, raise_cap, max_bet):
+        self.tree = BettingAbstraction(raise_cap, max_bet)
+        self.buckets = buckets
+        self.legal = [self.tree.legal(node) for node in range(len(self.tree))]
+        self.preflop = strength_buckets([], buckets)
+        shape = (len(self.tree), buckets, 4)
+        self.regrets = np.zeros(shape)
+        self.regret_delta = np.zeros(shape)
+        self.strategy_delta = np.zeros(shape)
+
+    def run(self, regrets, iterations, seed):
+        self.regrets = regrets
+        self.regret_delta.fill(0.0)
+        self.strategy_delta.fill(0.0)
+        rng = np.random.default_rng(seed)
+        self.rng = random.Random(seed)
+        for _ in range(iterations):
+            cards = rng.choice(52, 9, replace=False)
+            holes = (cards[0:2], cards[2:4])
+            board = cards[4:]
+            combos = [combo_index(*hole) for hole in holes]
+            streets = [self.preflop] + [strength_buckets(board[:count], self.buckets) for count in (3, 4, 5)]
+            buckets = [[int(table[combo]) for table in streets] for combo in combos]
+            scores = score_hands(np.hstack([np.array(holes), np.broadcast_to(board, (2, 5))]))
+            winner = 0 if scores[0] > scores[1] else 1 if scores[1] > scores[0] else -1
+            for traverser in (0, 1):
+                self._traverse(0, traverser, buckets, winner)
+        return self.regret_delta.copy(), self.strategy_delta.copy()
+
+    def _strategy(self, node, bucket):
+        legal = self.legal[node]
+        regrets = self.regrets[node, bucket]
+        positive = [max(regrets[slot], 0.0) for slot in legal]
+        total = sum(positive)
+        if total <= 0:
+            return legal, [1.0 / len(legal)] * len(legal)
+        return legal, [value / total for value in positive]
+
+    def _value(self, child, traverser, buckets, winner):
+        if child >= 0:
+            return self._traverse(child, traverser, buckets, winner)
+        folder, chips0, chips1 = self.tree.terminals[~child]
+        chips = (chips0, chips1)
+        if folder == -1:
+            if winner == -1:
+                return 0.0
+            return chips[1 - traverser] if winner == traverser else -chips[traverser]
+        return -chips[traverser] if folder == traverser else chips[folder]
+
+    def _traverse(self, node, traverser, buckets, winner):
+        player = self.tree.players[node]
+        bucket = buckets[player][self.tree.streets[node]]
+        children = self.tree.children[node]
+        legal, strategy = self._strategy(node, bucket)
+        if player != traverser:
+            average = self.strategy_delta[node, bucket]
+            for slot, probability in zip(legal, strategy):
+                average[slot] += probability
+            slot = self.rng.choices(legal, weights=strategy, k=1)[0]
+            return self._value(children[slot], traverser, buckets, winner)
+        values = [self._value(children[slot], traverser, buckets, winner) for slot in legal]
+        node_value = sum(probability * value for probability, value in zip(strategy, values))
+        deltas = self.regret_delta[node, bucket]
+        for slot, value in zip(legal, values):
+            deltas[slot] += value - node_value
+        return node_value
+
+
+def _init_worker(buckets, raise_cap, max_bet):
+    global _solver
+    _solver = Solver(buckets, raise_cap, max_bet)
+
+
+def _run_batch(task):
+    regrets, iterations, seed = task
+    return _solver.run(regrets, iterations, seed)
+
+
+def _load_checkpoint(path, args, shape):
+    if not os.path.exists(path):
+        return np.zeros(shape), np.zeros(shape), 0
+    with np.load(path) as checkpoint:
+        settings = tuple(int(value) for value in checkpoint["settings"])
+        if settings != (args.buckets, args.raise_cap, args.max_bet):
+            raise SystemExit(
+                f"{path} was made with buckets/raise-cap/max-bet {settings}; "
+                "pass matching options or a different --checkpoint."
+            )
+        return checkpoint["regrets"], checkpoint["strategy_sum"], int(checkpoint["iterations"])
+
+
+def _save_checkpoint(path, args, regrets, strategy_sum, iterations):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        np.savez(
+            handle,
+            regrets=regrets,
+            strategy_sum=strategy_sum,
+            iterations=np.int64(iterations),
+            settings=np.array([args.buckets, args.raise_cap, args.max_bet], dtype=np.int64),
+        )
+    os.replace(tmp_path, path)
+
+
+def export_table(tree, strategy_sum, iterations, path):
+    buckets = strategy_sum.shape[1]
+    quantised = np.zeros(strategy_sum.shape, dtype=np.uint8)
+    for node in range(len(tree)):
+        legal = tree.legal(node)
+        sums = strategy_sum[node][:, legal]
+        totals = sums.sum(axis=1, keepdims=True)
+        probabilities = np.where(totals > 0, sums / np.where(totals > 0, totals, 1), 1.0 / len(legal))
+        quantised[node][:, legal] = np.rint(probabilities * 255).astype(np.uint8)
+    table = PokerStrategyTable(tree, buckets, quantised.tobytes(), iterations)
+    table.save(path)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100000, help="total iterations to reach (default 100000)")
+    parser.add_argument("--batch", type=int, default=2000, help="iterations per worker between merges")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--buckets", type=int, default=8, help="hand-strength buckets per street")
+    parser.add_argument("--raise-cap", type=int, default=3, help="raises per street in the abstraction")
+    parser.add_argument("--max-bet", type=int, default=10, help="per-street bet cap in big blinds")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--checkpoint", default="data/poker_cfr_checkpoint.npz")
+    parser.add_argument("--output", default=os.getenv("POKER_STRATEGY_PATH", "data/poker_strategy.bin"))
+    parser.add_argument("--export-only", action="store_true", help="write the table from the checkpoint and exit")
+    args = parser.parse_args()
+
+    tree = BettingAbstraction(args.raise_cap, args.max_bet)
+    shape = (len(tree), args.buckets, 4)
+    regrets, strategy_sum, done = _load_checkpoint(args.checkpoint, args, shape)
+    if args.export_only:
+        export_table(tree, strategy_sum, done, args.output)
+        print(f"Wrote {args.output} from {done} iterations.")
+        return
+    if done:
+        print(f"Resuming from {done} iterations in {args.checkpoint}.")
+    seed = args.seed if args.seed is not None else int(time.time())
+    with multiprocessing.Pool(
+        args.workers,
+        initializer=_init_worker,
+        initargs=(args.buckets, args.raise_cap, args.max_bet),
+    ) as pool:
+        try:
+            while done < args.iterations:
+                started = time.perf_counter()
+                remaining = args.iterations - done
+                sizes = [min(args.batch, remaining - index * args.batch) for index in range(args.workers)]
+                sizes = [size for size in sizes if size > 0]
+                tasks = [(regrets, size, seed + done + index) for index, size in enumerate(sizes)]
+                for regret_delta, strategy_delta in pool.imap_unordered(_run_batch, tasks):
+                    regrets += regret_delta
+                    strategy_sum += strategy_delta
+                # Regret-matching+: negative regrets are floored so actions recover quickly.
+                np.maximum(regrets, 0.0, out=regrets)
+                done += sum(sizes)
+                _save_checkpoint(args.checkpoint, args, regrets, strategy_sum, done)
+                rate = sum(sizes) / (time.perf_counter() - started)
+                print(f"{done}/{args.iterations} iterations ({rate:.0f}/s)", flush=True)
+        except KeyboardInterrupt:
+            print(f"Interrupted; checkpoint holds {done} iterations.")
+    export_table(tree, strategy_sum, done, args.output)
+    print(f"Wrote {args.output} ({len(tree)} nodes x {args.buckets} buckets).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Query and replay the binary poker hand-history log.
+
+Run from the repository root:
+
+    python -m scripts.poker_history stats <user_id> [--since TS] [--until TS]
+    python -m scripts.poker_history list <user_id> [--limit N]
+    python -m scripts.poker_history replay <segment:offset>
+"""
+
+import argparse
+import os
+import time
+from collections import deque
+
+from cogs.games import HandHistoryLog
+
+
+def _open_log(args):
+    return HandHistoryLog(args.directory)
+
+
+def _format_ts(ts):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+
+
+def cmd_stats(args):
+    log = _open_log(args)
+    stats = log.user_stats(args.user_id, since=args.since, until=args.until)
+    if not stats["hands"]:
+        print("No hands recorded for that user.")
+        return
+    decided = stats["won"] + stats["lost"]
+    win_rate = f"{stats['won'] / decided * 100:.1f}%" if decided else "N/A"
+    print(f"Hands:        {stats['hands']} ({stats['vs_bot']} vs bot, {stats['vs_players']} vs players)")
+    print(f"Won/Lost:     {stats['won']}/{stats['lost']} ({win_rate}), {stats['split']} split, {stats['refunded']} refunded")
+    print(f"Net:          RM {stats['net']} on RM {stats['wagered']} wagered")
+    print(f"Biggest pot:  RM {stats['biggest_pot']}")
+    print(f"Showdowns:    {stats['showdowns']}")
+    print(f"Folds:        {stats['folds']}")
+    print(f"All-ins:      {stats['allins']}")
+
+
+def cmd_list(args):
+    log = _open_log(args)
+    recent = deque(maxlen=args.limit)
+    for record in log.iter_hands(user_id=args.user_id, since=args.since, until=args.until):
+        recent.append(record)
+    if not recent:
+        print("No hands recorded for that user.")
+        return
+    for record in recent:
+        segment, offset = record.ref
+        opponent = record.opponent_id or "bot"
+        print(
+            f"{segment}:{offset}  {_format_ts(record.started_at)}  vs {opponent}  "
+            f"pot RM {record.pot}  winner {record.winner}  ({record.end_stage})"
+        )
+
+
+def cmd_replay(args):
+    log = _open_log(args)
+    try:
+        segment, offset = (int(part) for part in args.ref.split(":", 1))
+    except ValueError:
+        print("Hand reference must look like <segment>:<offset>.")
+        return
+    record = log.read(segment, offset)
+    if record is None:
+        print("No hand found at that reference.")
+        return
+    opponent = record.opponent_id or "bot"
+    print(f"Hand {args.ref}: {record.user_id} vs {opponent}, started {_format_ts(record.started_at)}")
+    print(f"Player cards: {' '.join(record.user_cards)}  Opponent cards: {' '.join(record.bot_cards)}")
+    for state in log.replay(record):
+        board = " ".join(state["community"]) or "-"
+        if state["action"]:
+            line = (
+                f"[{state['step']:>2}] +{state['elapsed_ms'] / 1000:6.1f}s {state['stage']:<8} "
+                f"{state['actor']:<4} {state['action']:<11} {state['amount']:>6}"
+            )
+        elif state["step"] == 0:
+            line = f"[{state['step']:>2}] {'deal':<38}"
+        else:
+            line = f"[{state['step']:>2}] {'end (' + state['stage'] + ')':<38}"
+        print(f"{line}  pot {state['pot']:>6}  board {board}")
+    print(f"Winner: {record.winner}, player net RM {record.user_net}, opponent net RM {record.opponent_net}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--directory",
+        default=os.getenv("POKER_HISTORY_DIR", "data/hand_history"),
+        help="hand-history directory (default: POKER_HISTORY_DIR or data/hand_history)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    stats_parser = subparsers.add_parser("stats", help="aggregate stats for one user")
+    stats_parser.add_argument("user_id", type=int)
+    stats_parser.add_argument("--since", type=int)
+    stats_parser.add_argument("--until", type=int)
+    stats_parser.set_defaults(func=cmd_stats)
+
+    list_parser = subparsers.add_parser("list", help="list a user's most recent hands")
+    list_parser.add_argument("user_id", type=int)
+    list_parser.add_argument("--limit", type=int, default=20)
+    list_parser.add_argument("--since", type=int)
+    list_parser.add_argument("--until", type=int)
+    list_parser.set_defaults(func=cmd_list)
+
+    replay_parser = subparsers.add_parser("replay", help="replay one hand step by step")
+    replay_parser.add_argument("ref", help="<segment>:<offset> as printed by `list`")
+    replay_parser.set_defaults(func=cmd_replay)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
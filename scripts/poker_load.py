@@ -0,0 +1,406 @@
+"""Offline load harness for the poker cog.
+
+Drives ``Games.poker``, ``PokerView`` button callbacks and
+``Games._handle_poker_action`` with fake Discord objects across many
+concurrent tables. Bot think time and every other poker pause run on a
+virtual clock, so a run measures handler cost rather than sleeps. The range
+bot's equity sampling is real work and still runs on worker threads.
+
+Run from the repository root:
+
+    python -m scripts.poker_load --tables 2000 --pvp-ratio 0.2
+
+``--tables-per-channel`` seats several tables in one channel; set
+``POKER_MAX_TABLES_PER_CHANNEL`` as well to exercise the per-channel cap.
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = 0
+
+    async def sleep(self, delay):
+        self.now += max(0.0, delay)
+        self.sleeps += 1
+        await asyncio.sleep(0)
+
+
+class Counters:
+    def __init__(self):
+        self.sends = 0
+        self.edits = 0
+        self.ephemeral = 0
+        self.webhook_posts = 0
+
+
+class FakeAvatar:
+    def __init__(self, url):
+        self.url = url
+
+
+class FakeMember:
+    def __init__(self, member_id, name, bot=False):
+        self.id = member_id
+        self.name = name
+        self.display_name = name
+        self.bot = bot
+        self.mention = f"<@{member_id}>"
+        self.display_avatar = FakeAvatar(f"https://cdn.example/avatars/{member_id}.png")
+
+
+class FakeMessage:
+    _ids = itertools.count(1)
+
+    def __init__(self, channel, embed=None, view=None, content=None):
+        self.id = next(self._ids)
+        self.channel = channel
+        self.embed = embed
+        self.view = view
+        self.content = content
+        self.mentions = []
+
+    async def edit(self, **kwargs):
+        self.channel.counters.edits += 1
+        self.embed = kwargs.get("embed", self.embed)
+        self.view = kwargs.get("view", self.view)
+        return self
+
+    async def delete(self):
+        return None
+
+
+class FakeWebhook:
+    def __init__(self, channel):
+        self.channel = channel
+
+    async def send(self, content=None, **kwargs):
+        self.channel.counters.webhook_posts += 1
+
+    async def delete(self):
+        return None
+
+
+class FakeChannel:
+    def __init__(self, channel_id, counters):
+        self.id = channel_id
+        self.counters = counters
+
+    async def send(self, content=None, *, embed=None, view=None, **kwargs):
+        self.counters.sends += 1
+        return FakeMessage(self, embed=embed, view=view, content=content)
+
+    async def create_webhook(self, name):
+        return FakeWebhook(self)
+
+
+class FakeGuild:
+    def __init__(self, guild_id, members):
+        self.id = guild_id
+        self.members = members
+
+    def get_member(self, member_id):
+        for member in self.members:
+            if member.id == member_id:
+                return member
+        return None
+
+
+class FakeContext:
+    def __init__(self, author, channel, guild, mentions=None):
+        self.author = author
+        self.channel = channel
+        self.guild = guild
+        self.message = FakeMessage(channel)
+        self.message.mentions = mentions or []
+
+    async def send(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
+
+
+class FakeResponse:
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self._done = False
+        self.modal = None
+
+    def is_done(self):
+        return self._done
+
+    async def send_message(self, content=None, *, ephemeral=False, **kwargs):
+        self._done = True
+        if ephemeral:
+            self.interaction.channel.counters.ephemeral += 1
+        else:
+            self.interaction.channel.counters.sends += 1
+
+    async def edit_message(self, **kwargs):
+        self._done = True
+        await self.interaction.message.edit(**kwargs)
+
+    async def send_modal(self, modal):
+        self._done = True
+        self.modal = modal
+
+
+class FakeFollowup:
+    def __init__(self, channel):
+        self.channel = channel
+
+    async def send(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
+
+
+class FakeInteraction:
+    def __init__(self, user, message):
+        self.user = user
+        self.message = message
+        self.channel = message.channel
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(message.channel)
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class LoadRun:
+    ACTION_WEIGHTS = {
+        "check": 50,
+        "bet": 20,
+        "allin": 4,
+        "fold": 8,
+        "show_cards": 10,
+    }
+
+    def __init__(self, cog, clock, args):
+        self.cog = cog
+        self.clock = clock
+        self.args = args
+        self.counters = Counters()
+        self.latencies = defaultdict(list)
+        self.loop_lag = []
+        self.hands_started = 0
+        self.stuck_tables = 0
+        self.member_ids = itertools.count(10_000)
+        self.channels = {}
+        shadow_members = [FakeMember(next(self.member_ids), f"regular{i}") for i in range(50)]
+        self.guild = FakeGuild(1, shadow_members)
+
+    def _new_member(self, prefix):
+        member_id = next(self.member_ids)
+        member = FakeMember(member_id, f"{prefix}{member_id}")
+        self.guild.members.append(member)
+        return member
+
+    async def start_table(self, table_no, pvp):
+        channel_id = 100_000 + table_no // self.args.tables_per_channel
+        channel = self.channels.get(channel_id)
+        if channel is None:
+            channel = self.channels[channel_id] = FakeChannel(channel_id, self.counters)
+        player = self._new_member("player")
+        opponent = self._new_member("rival") if pvp else None
+        mentions = [opponent] if opponent else []
+        ctx = FakeContext(player, channel, self.guild, mentions=mentions)
+        args = [str(self.args.stake)]
+        if opponent:
+            args.append(opponent.mention)
+        started = time.perf_counter()
+        await self.cog.poker.callback(self.cog, ctx, *args)
+        self.latencies["start"].append(time.perf_counter() - started)
+        if self.cog.poker_games.get(player.id):
+            self.hands_started += 1
+        return player, opponent
+
+    def _pick_action(self, rng):
+        actions = list(self.ACTION_WEIGHTS)
+        weights = list(self.ACTION_WEIGHTS.values())
+        return rng.choices(actions, weights, k=1)[0]
+
+    async def _press(self, view, name, interaction):
+        started = time.perf_counter()
+        if await view.interaction_check(interaction):
+            button = getattr(view, name)
+            await button.callback(interaction)
+            modal = interaction.response.modal
+            if modal is not None:
+                # Same call PokerBetModal.on_submit makes once the amount is typed in.
+                game = self.cog.poker_games.get(interaction.user.id)
+                actor = self.cog._player_key(game, interaction.user.id) if game else None
+                if actor:
+                    amount = self.cog._amount_to_call(game, actor) + game.get("min_bet", 1)
+                    submit = FakeInteraction(interaction.user, interaction.message)
+                    await self.cog._handle_poker_action(submit, modal.action, amount=amount)
+        self.latencies[name].append(time.perf_counter() - started)
+
+    async def play_table(self, player, opponent, rng):
+        for _ in range(self.args.max_actions):
+            game = self.cog.poker_games.get(player.id)
+            if not game:
+                return
+            if game.get("locked"):
+                await asyncio.sleep(0)
+                continue
+            turn = game.get("turn")
+            if turn == "user":
+                actor = player
+            elif opponent is not None:
+                actor = opponent
+            else:
+                await asyncio.sleep(0)
+                continue
+            view = game.get("view")
+            message = game.get("message")
+            if view is None or message is None:
+                await asyncio.sleep(0)
+                continue
+            name = self._pick_action(rng)
+            await self._press(view, name, FakeInteraction(actor, message))
+            await asyncio.sleep(0)
+        self.stuck_tables += 1
+
+    async def monitor_loop(self, stop_event):
+        interval = self.args.lag_interval
+        while not stop_event.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.loop_lag.append(max(0.0, time.perf_counter() - started - interval))
+
+    async def run(self):
+        rng = random.Random(self.args.seed)
+        stop_event = asyncio.Event()
+        monitor = asyncio.create_task(self.monitor_loop(stop_event))
+
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        wall_started = time.perf_counter()
+        seats = []
+        for table_no in range(self.args.tables):
+            pvp = rng.random() < self.args.pvp_ratio
+            seats.append(self.start_table(table_no, pvp))
+        tables = await asyncio.gather(*seats)
+        live_games = len({id(game) for game in self._live_games(tables)})
+        current, _ = tracemalloc.get_traced_memory()
+        per_table = (current - baseline) / live_games if live_games else 0.0
+
+        play_started = time.perf_counter()
+        await asyncio.gather(*(
+            self.play_table(player, opponent, random.Random(rng.random()))
+            for player, opponent in tables
+        ))
+        play_elapsed = time.perf_counter() - play_started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stop_event.set()
+        await monitor
+        self.report(
+            live_games=live_games,
+            per_table=per_table,
+            peak=peak - baseline,
+            wall=time.perf_counter() - wall_started,
+            play_elapsed=play_elapsed,
+        )
+
+    def _live_games(self, tables):
+        for player, _ in tables:
+            game = self.cog.poker_games.get(player.id)
+            if game:
+                yield game
+
+    def report(self, *, live_games, per_table, peak, wall, play_elapsed):
+        total_actions = sum(len(samples) for name, samples in self.latencies.items() if name != "start")
+        print(f"Tables:            {self.args.tables} ({live_games} live after dealing)")
+        cap = self.cog.poker_games.max_tables_per_channel
+        print(f"Channels:          {len(self.channels)} ({self.args.tables_per_channel} tables each, cap {cap or 'none'})")
+        print(f"Hands started:     {self.hands_started}")
+        print(f"Button presses:    {total_actions} ({total_actions / play_elapsed:.0f}/s wall)")
+        print(f"Stuck tables:      {self.stuck_tables}")
+        print(f"Wall time:         {wall:.2f}s, virtual time slept {self.clock.now:.0f}s over {self.clock.sleeps} pauses")
+        print(f"Discord calls:     {self.counters.sends} sends, {self.counters.edits} edits, "
+              f"{self.counters.ephemeral} ephemeral, {self.counters.webhook_posts} webhook posts")
+        print(f"Memory per table:  {per_table / 1024:.1f} KiB (peak {peak / 1024 / 1024:.1f} MiB traced)")
+        print()
+        print(f"{'handler':<12}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for name in sorted(self.latencies):
+            samples = self.latencies[name]
+            print(
+                f"{name:<12}{len(samples):>8}"
+                f"{_percentile(samples, 50) * 1000:>10.2f}"
+                f"{_percentile(samples, 90) * 1000:>10.2f}"
+                f"{_percentile(samples, 99) * 1000:>10.2f}"
+                f"{max(samples) * 1000:>10.2f}"
+            )
+        print()
+        if self.loop_lag:
+            print(
+                f"Event-loop lag:    p50 {_percentile(self.loop_lag, 50) * 1000:.2f} ms, "
+                f"p99 {_percentile(self.loop_lag, 99) * 1000:.2f} ms, "
+                f"max {max(self.loop_lag) * 1000:.2f} ms, mean {statistics.fmean(self.loop_lag) * 1000:.2f} ms"
+            )
+
+
+def _isolate_data_files(directory):
+    os.environ["GAMES_DATAFILE"] = os.path.join(directory, "currency.json")
+    os.environ["GAMES_DAILY_DATAFILE"] = os.path.join(directory, "daily.json")
+    os.environ["GAMES_POKER_STARTER_DATAFILE"] = os.path.join(directory, "starters.json")
+    os.environ["POKER_PROFILE_PATH"] = os.path.join(directory, "profiles.json")
+    os.environ["POKER_HISTORY_DIR"] = os.path.join(directory, "hand_history")
+    os.environ["POKER_CHECKPOINT_DIR"] = os.path.join(directory, "checkpoints")
+    # No strategy table in the temporary directory, so runs don't depend on an exported one.
+    os.environ["POKER_STRATEGY_PATH"] = os.path.join(directory, "poker_strategy.bin")
+
+
+async def _main(args):
+    from cogs.games import Games
+
+    cog = Games(bot=None)
+    clock = VirtualClock()
+    cog._sleep = clock.sleep
+    await LoadRun(cog, clock, args).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=1000, help="concurrent tables to simulate")
+    parser.add_argument("--pvp-ratio", type=float, default=0.2, help="share of tables that are player vs player")
+    parser.add_argument("--tables-per-channel", type=int, default=1, help="tables seated in each channel (default 1)")
+    parser.add_argument("--stake", type=int, default=10, help="big blind for every table")
+    parser.add_argument("--max-actions", type=int, default=400, help="button presses before a table counts as stuck")
+    parser.add_argument("--lag-interval", type=float, default=0.01, help="event-loop lag probe interval in seconds")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--keep-data", action="store_true", help="leave the temporary data directory in place")
+    args = parser.parse_args()
+    args.tables_per_channel = max(1, args.tables_per_channel)
+
+    workdir = tempfile.mkdtemp(prefix="poker-load-")
+    _isolate_data_files(workdir)
+    try:
+        asyncio.run(_main(args))
+    finally:
+        if args.keep_data:
+            print(f"Data left in {workdir}", file=sys.stderr)
+        else:
+            import shutil
+
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()